@@ -0,0 +1,41 @@
+import re
+
+# 모든 화면에 적용하는 CSS 스타일 정의 (final.py에서 사용)
+_PAGE_CSS = """
+<style>
+body {
+    background-color: #ffe0b3 !important;
+}
+.center-button button {
+    display: block;
+    margin: 4rem auto;
+    font-size: 2.5rem !important;
+    padding: 2rem 4rem !important;
+    background-color: #ff944d !important;
+    color: white !important;
+    border: none !important;
+    border-radius: 15px !important;
+    cursor: pointer;
+    font-weight: bold !important;
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2) !important;
+}
+.center-button button:hover {
+    background-color: #e07b39 !important;
+    transform: scale(1.1) !important;
+}
+h1.title {
+    text-align: center;
+    font-size: 4em !important;
+    color: #ff6600 !important;
+}
+.progress-text {
+    text-align: center;
+    font-size: 1.2em !important;
+    color: #333 !important;
+}
+</style>
+"""
+
+# 공백을 줄인 <style> 블록. 모듈은 프로세스당 한 번만 import 되므로
+# Streamlit이 화면마다 스크립트를 다시 실행해도 문자열을 새로 만들지 않음.
+PAGE_STYLE = re.sub(r"\s*([{};:,])\s*", r"\1", re.sub(r"\s+", " ", _PAGE_CSS)).strip()
@@ -0,0 +1,77 @@
+"""
+벤치마크용 가상 유권자 생성기 (시드 고정, numpy만 사용):
+- impartial: 모든 순위가 같은 확률 (후보 간 선호가 서로 독립), 점수는 순위와 무관한 균등 0~10점.
+- mallows: 기준 순위(후보 순서 그대로)에서 멀어질수록 확률이 phi배씩 줄어드는 Mallows 모형, 점수는 순위와 상관.
+- correlated: 무작위 순위에 맞춰 점수를 매기고 정규 잡음을 더한 0~10점 (순위와 점수가 함께 움직이는 투표).
+- 반환값은 BallotStore와 같은 V×C 순위/점수 행렬. 큰 선거도 GENERATE_CHUNK_ELEMENTS 단위로 만들어 임시 메모리를 제한.
+"""
+import numpy as np
+
+from voting_tally.ballot_store import MAX_SCORE, MIN_SCORE, rank_dtype_for
+
+CULTURES = ("impartial", "mallows", "correlated")
+# 한 번에 만드는 원소 수 (float 임시 배열 크기를 제한)
+GENERATE_CHUNK_ELEMENTS = 1 << 22
+# Mallows 표본은 V×C²에 비례해 계산하므로, 이 원소 수를 넘으면 일부만 생성해 복원 추출
+MALLOWS_POOL_ELEMENTS = 1 << 26
+MALLOWS_PHI = 0.7
+SCORE_NOISE = 1.5
+
+
+def impartial_ranks(n_voters, n_candidates, rng):
+    """무작위 순열 순위 행렬 (1이 가장 선호)."""
+    return np.argsort(rng.random((n_voters, n_candidates)), axis=1) + 1
+
+
+def mallows_ranks(n_voters, n_candidates, rng, phi=MALLOWS_PHI):
+    """
+    Mallows 모형 순위 행렬 (phi가 0에 가까울수록 모두 기준 순위에 가깝고, 1이면 impartial):
+    - 반복 삽입: i번째 후보를 앞에서 j번째 자리에 phi^(i-j)에 비례한 확률로 끼워 넣음.
+    """
+    positions = np.zeros((n_voters, n_candidates), dtype=np.int32)
+    for i in range(1, n_candidates):
+        cumulative = np.cumsum(phi ** np.arange(i, -1, -1, dtype=float))
+        insert_at = np.searchsorted(cumulative / cumulative[-1], rng.random(n_voters), side="right")
+        insert_at = np.minimum(insert_at, i)[:, None]
+        placed = positions[:, :i]
+        placed += placed >= insert_at
+        positions[:, i] = insert_at[:, 0]
+    return positions + 1
+
+
+def correlated_scores(ranks, rng, noise=SCORE_NOISE):
+    """순위를 0~10점으로 선형 변환한 점수에 정규 잡음(표준편차 noise)을 더해 반올림."""
+    n_candidates = ranks.shape[1]
+    spread = (ranks.astype(float) - 1) / max(n_candidates - 1, 1)
+    scores = np.rint(MAX_SCORE * (1 - spread) + rng.normal(0, noise, ranks.shape))
+    return np.clip(scores, MIN_SCORE, MAX_SCORE)
+
+
+def generate(culture, n_voters, n_candidates, seed=0):
+    """culture 이름으로 (순위, 점수) 행렬을 시드 고정으로 생성."""
+    if culture not in CULTURES:
+        raise ValueError(f"알 수 없는 유권자 모형입니다: {culture}")
+    rng = np.random.default_rng(seed)
+    ranks = np.empty((n_voters, n_candidates), dtype=rank_dtype_for(n_candidates))
+    scores = np.empty((n_voters, n_candidates), dtype=np.uint8)
+
+    pool = None
+    if culture == "mallows":
+        pool_rows = max(1, min(n_voters, MALLOWS_POOL_ELEMENTS // (n_candidates * n_candidates)))
+        pool = mallows_ranks(pool_rows, n_candidates, rng)
+
+    chunk_rows = max(1, GENERATE_CHUNK_ELEMENTS // n_candidates)
+    for start in range(0, n_voters, chunk_rows):
+        stop = min(start + chunk_rows, n_voters)
+        if pool is None:
+            chunk = impartial_ranks(stop - start, n_candidates, rng)
+        elif len(pool) == n_voters:
+            chunk = pool[start:stop]
+        else:
+            chunk = pool[rng.integers(0, len(pool), stop - start)]
+        ranks[start:stop] = chunk
+        if culture == "impartial":
+            scores[start:stop] = rng.integers(MIN_SCORE, MAX_SCORE + 1, chunk.shape)
+        else:
+            scores[start:stop] = correlated_scores(chunk, rng)
+    return ranks, scores
@@ -0,0 +1,106 @@
+"""
+시작 시간(import) 예산 점검:
+
+    python benchmarks/import_budget.py
+    python -m pytest tests/test_import_budget.py   # 같은 측정을 테스트로 실행
+
+- voting_tally / CLI 를 import 할 때 numpy, pandas, streamlit 이 따라 올라오지 않는지,
+  final.py 첫 화면(home)을 그릴 때 pandas, numpy 를 import 하지 않는지 확인.
+- `python -X importtime` 으로 잰 모듈별 누적 import 시간이 예산(ms)을 넘으면 실패 (종료 코드 1).
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 모듈별 누적 import 시간 예산 (ms)
+IMPORT_BUDGET_MS = {
+    "voting_tally": 20,
+    "voting_tally.cli": 40,
+    "app_style": 20,
+    "result_cache": 20,
+    "perf_metrics": 20,
+}
+# 해당 모듈만 import 했을 때 올라오면 안 되는 무거운 모듈
+FORBIDDEN_ON_IMPORT = {
+    "voting_tally": ["numpy", "pandas", "streamlit"],
+    "voting_tally.cli": ["numpy", "pandas", "streamlit"],
+}
+# final.py 첫 화면을 그릴 때 올라오면 안 되는 모듈 / 첫 실행 시간 예산 (ms, streamlit 자체 import 제외)
+FORBIDDEN_ON_HOME = ["pandas", "numpy", "pyarrow"]
+HOME_RUN_BUDGET_MS = 1500
+
+_HOME_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file({path!r}, default_timeout=60).run()
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "exception": bool(at.exception), "modules": sorted(sys.modules)}}))
+"""
+
+
+def _python(args, code=None):
+    cmd = [sys.executable] + args + (["-c", code] if code is not None else [])
+    return subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+
+
+def cumulative_import_ms(module):
+    """`-X importtime` 출력에서 module 의 누적 import 시간(ms)을 읽음."""
+    result = _python(["-X", "importtime"], f"import {module}")
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s*\d+ \|\s*(\d+) \|\s*(\S+)$", line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"{module} 의 import 시간을 찾지 못했습니다.")
+
+
+def loaded_modules(module):
+    """module 만 import 했을 때 sys.modules 에 올라온 모듈 이름 목록."""
+    result = _python([], f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))")
+    return set(json.loads(result.stdout))
+
+
+def home_screen_probe():
+    """final.py 첫 화면을 새 프로세스에서 실행해 {"ms", "exception", "modules"}를 반환."""
+    probe = _python([], _HOME_PROBE.format(path=os.path.join(REPO_ROOT, "final.py")))
+    return json.loads(probe.stdout.strip().splitlines()[-1])
+
+
+def main():
+    failures = []
+    for module, budget in IMPORT_BUDGET_MS.items():
+        # 디스크 캐시 등의 잡음을 줄이려고 세 번 재서 가장 빠른 값을 사용
+        elapsed = min(cumulative_import_ms(module) for _ in range(3))
+        status = "ok" if elapsed <= budget else "FAIL"
+        print(f"[{status}] import {module}: {elapsed:.1f}ms (예산 {budget}ms)")
+        if elapsed > budget:
+            failures.append(f"import {module} 이 예산을 넘었습니다.")
+
+    for module, forbidden in FORBIDDEN_ON_IMPORT.items():
+        leaked = sorted(set(forbidden) & loaded_modules(module))
+        print(f"[{'FAIL' if leaked else 'ok'}] import {module} 시 무거운 모듈 없음 {leaked or ''}")
+        if leaked:
+            failures.append(f"import {module} 이 {', '.join(leaked)} 을(를) 불러옵니다.")
+
+    home = home_screen_probe()
+    leaked = sorted(set(FORBIDDEN_ON_HOME) & set(home["modules"]))
+    print(f"[{'FAIL' if leaked or home['exception'] else 'ok'}] final.py 첫 화면: {home['ms']:.0f}ms "
+          f"(예산 {HOME_RUN_BUDGET_MS}ms) {leaked or ''}")
+    if home["exception"]:
+        failures.append("final.py 첫 화면 실행 중 예외가 발생했습니다.")
+    if leaked:
+        failures.append(f"final.py 첫 화면이 {', '.join(leaked)} 을(를) 불러옵니다.")
+    if home["ms"] > HOME_RUN_BUDGET_MS:
+        failures.append("final.py 첫 화면 실행 시간이 예산을 넘었습니다.")
+
+    for failure in failures:
+        print(f"실패: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
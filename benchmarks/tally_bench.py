@@ -0,0 +1,225 @@
+"""
+집계 함수 벤치마크:
+
+    python benchmarks/tally_bench.py                  # quick 격자, 기준값과 비교
+    python benchmarks/tally_bench.py --profile full   # 투표자 10²~10⁶ × 후보 2~500
+    python benchmarks/tally_bench.py --update-baseline
+
+- final.py(Colab 방식)와 voting_app.py의 모든 계산 함수(voting_tally.methods.METHODS)와
+  누적 집계 생성(RunningTally.from_store), 같은 투표 묶음 생성(BallotPatterns.from_store), 전체 방식 비교를 가상 유권자(electorates.py) 격자에서 측정.
+- 입력은 앱이 실제로 넘기는 BallotStore. 작은 선거는 예전 딕셔너리 입력도 함께 측정.
+- 실행 시간은 여러 번 재서 가장 빠른 값, 메모리는 tracemalloc으로 잰 한 번 실행의 최대 할당량.
+- 기준값(tally_baseline.json)보다 TOLERANCE 이상 느려지거나 메모리를 더 쓰면 실패 (종료 코드 1).
+  기준값은 측정한 컴퓨터에 따라 다르므로 비교할 컴퓨터에서 --update-baseline으로 다시 만들어 사용.
+- 공유 컴퓨터의 일시적인 느려짐을 거르기 위해, 회귀로 보인 항목만 RETRIES번까지 다시 재서 가장 좋은 값으로 판단.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from electorates import CULTURES, generate  # noqa: E402
+from voting_tally import BallotPatterns, BallotStore, RunningTally, compare_all_methods  # noqa: E402
+from voting_tally.methods import METHODS, calculate_nash_colab_style  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tally_baseline.json")
+
+# 측정 격자 (투표자 수 × 후보 수 × 유권자 모형)
+PROFILES = {
+    "quick": {"voters": [100, 1_000, 10_000], "candidates": [2, 5, 20], "cultures": ["impartial", "mallows"]},
+    "full": {
+        "voters": [100, 1_000, 10_000, 100_000, 1_000_000],
+        "candidates": [2, 5, 20, 100, 500],
+        "cultures": list(CULTURES),
+    },
+}
+# 이보다 큰 선거(V×C)는 건너뜀 (uint16 순위 기준 약 150MB)
+MAX_CELLS = 50_000_000
+# 쌍대 행렬을 만드는 함수(V×C²)는 이 작업량을 넘으면 건너뜀
+MAX_PAIRWISE_WORK = 2_000_000_000
+# 딕셔너리 입력(파이썬 반복문)은 이 크기까지만 측정
+MAX_DICT_CELLS = 200_000
+
+# 최소 MIN_REPEATS 번, 합계가 MIN_TIME_S가 될 때까지 최대 MAX_REPEATS 번 반복해 가장 빠른 값을 사용
+MIN_REPEATS = 3
+MIN_TIME_S = 0.3
+MAX_REPEATS = 9
+# 기준값 대비 허용 비율과, 잡음으로 보고 무시할 절대 차이
+TOLERANCE = 0.5
+MIN_REGRESSION_S = 0.002
+MIN_REGRESSION_BYTES = 1 << 20
+# 회귀로 보인 항목을 다시 재는 횟수
+RETRIES = 2
+
+
+def _nash_exact(votes, candidates):
+    return calculate_nash_colab_style(votes, candidates, mode="exact")
+
+
+def _running_tally(votes, candidates):
+    return RunningTally.from_store(votes)
+
+
+def _ballot_patterns(votes, candidates):
+    return BallotPatterns.from_store(votes)
+
+
+# 이름 → (함수, 쌍대 행렬 사용 여부, 딕셔너리 입력 지원 여부)
+BENCHMARKS = {name: (func, name in ("condorcet_pairwise", "condorcet", "schulze", "ranked_pairs"), True) for name, func in METHODS.items()}
+BENCHMARKS["nash_colab_exact"] = (_nash_exact, False, True)
+BENCHMARKS["running_tally"] = (_running_tally, True, False)
+BENCHMARKS["ballot_patterns"] = (_ballot_patterns, False, False)
+BENCHMARKS["compare_all"] = (compare_all_methods, True, True)
+
+
+def time_call(func):
+    """func()의 가장 빠른 실행 시간(초, timeit처럼 측정 중에는 GC를 끔)."""
+    best = float("inf")
+    total = 0.0
+    gc.collect()
+    gc.disable()
+    try:
+        for repeat in range(1, MAX_REPEATS + 1):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            total += elapsed
+            if repeat >= MIN_REPEATS and total >= MIN_TIME_S:
+                break
+    finally:
+        gc.enable()
+    return best
+
+
+def peak_bytes(func):
+    """func() 한 번 실행 중 tracemalloc으로 잰 최대 할당량(바이트, numpy 배열 포함)."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def iter_cases(profile):
+    """(선거 키, 유권자 모형, 투표자 수, 후보 수) 격자 (MAX_CELLS를 넘는 선거 제외)."""
+    grid = PROFILES[profile]
+    for culture in grid["cultures"]:
+        for n_candidates in grid["candidates"]:
+            for n_voters in grid["voters"]:
+                if n_voters * n_candidates <= MAX_CELLS:
+                    yield f"{culture}/V={n_voters}/C={n_candidates}", culture, n_voters, n_candidates
+
+
+def run(profile, name_filter=None, only_keys=None, out=sys.stdout):
+    """
+    격자 전체를 측정해 {"선거 키|입력|함수": {"seconds", "peak_bytes"}}를 반환.
+    - only_keys를 주면 그 항목들만 다시 측정.
+    """
+    results = {}
+    for case, culture, n_voters, n_candidates in iter_cases(profile):
+        if only_keys is not None and not any(key.startswith(case + "|") for key in only_keys):
+            continue
+        ranks, scores = generate(culture, n_voters, n_candidates)
+        candidates = [f"후보{i}" for i in range(n_candidates)]
+        store = BallotStore(candidates)
+        store.append_ballots([f"투표자{i}" for i in range(n_voters)], ranks, scores)
+        inputs = {"store": store}
+        if n_voters * n_candidates <= MAX_DICT_CELLS:
+            inputs["dict"] = {voter: store[voter] for voter in store.voters}
+
+        for input_name, votes in inputs.items():
+            for name, (func, pairwise, accepts_dict) in BENCHMARKS.items():
+                if name_filter and name_filter not in name:
+                    continue
+                if pairwise and n_voters * n_candidates * n_candidates > MAX_PAIRWISE_WORK:
+                    continue
+                if input_name == "dict" and not accepts_dict:
+                    continue
+                call = lambda: func(votes, candidates)  # noqa: E731
+                key = f"{case}|{input_name}|{name}"
+                if only_keys is not None and key not in only_keys:
+                    continue
+                results[key] = {"seconds": time_call(call), "peak_bytes": peak_bytes(call)}
+                print(f"{key:<52} {results[key]['seconds'] * 1000:10.2f}ms "
+                      f"{results[key]['peak_bytes'] / 2**20:9.2f}MB", file=out)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """기준값보다 느려지거나 메모리를 더 쓴 항목의 {키: 설명}."""
+    regressions = {}
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        seconds, base_seconds = result["seconds"], base["seconds"]
+        if seconds > base_seconds * (1 + tolerance) and seconds - base_seconds > MIN_REGRESSION_S:
+            regressions[key] = f"{key}: {base_seconds * 1000:.2f}ms → {seconds * 1000:.2f}ms"
+        peak, base_peak = result["peak_bytes"], base["peak_bytes"]
+        if peak > base_peak * (1 + tolerance) and peak - base_peak > MIN_REGRESSION_BYTES:
+            regressions[key] = f"{key}: {base_peak / 2**20:.2f}MB → {peak / 2**20:.2f}MB"
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="집계 함수 벤치마크 (기준값 대비 회귀 확인)")
+    parser.add_argument("--profile", default="quick", choices=sorted(PROFILES))
+    parser.add_argument("--filter", default=None, help="이름에 이 문자열이 들어간 함수만 측정")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 JSON 파일")
+    parser.add_argument("--update-baseline", action="store_true", help="측정값을 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help=f"허용 비율 (기본값 {TOLERANCE})")
+    parser.add_argument("--retries", type=int, default=RETRIES, help=f"회귀 항목을 다시 재는 횟수 (기본값 {RETRIES})")
+    parser.add_argument("--json", default=None, help="측정값을 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    results = run(args.profile, args.filter)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+    if args.update_baseline:
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=1)
+        baselines.setdefault(args.profile, {}).update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"기준값을 저장했습니다: {args.baseline}")
+        return 0
+
+    baseline = baselines.get(args.profile)
+    if not baseline:
+        print(f"'{args.profile}' 기준값이 없습니다. --update-baseline으로 먼저 만들어주세요.", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for retry in range(args.retries):
+        if not regressions:
+            break
+        print(f"회귀 {len(regressions)}개 항목을 다시 측정합니다 ({retry + 1}/{args.retries})", file=sys.stderr)
+        for key, result in run(args.profile, args.filter, only_keys=set(regressions)).items():
+            results[key] = {
+                "seconds": min(results[key]["seconds"], result["seconds"]),
+                "peak_bytes": min(results[key]["peak_bytes"], result["peak_bytes"]),
+            }
+        regressions = compare(results, baseline, args.tolerance)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+    for regression in regressions.values():
+        print(f"회귀: {regression}", file=sys.stderr)
+    print(f"{len(results)}개 항목 중 회귀 {len(regressions)}개")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
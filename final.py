@@ -1,251 +1,265 @@
 import streamlit as st
-from collections import defaultdict, Counter # Counter 추가
-import pandas as pd # pandas 추가
+import os
 import random # 동률 처리 시 무작위 선택을 위해 추가
+from app_style import PAGE_STYLE
+from perf_metrics import METRICS
+from result_cache import CachedResult, ResultCache
+# pandas와 voting_tally(numpy)는 무거우므로 필요한 단계에서만 import (첫 화면 로딩을 가볍게)
 
-# CSS 스타일 정의 (기존과 동일)
-page_bg = """
-<style>
-body {
-    background-color: #ffe0b3 !important;
-}
-.center-button button {
-    display: block;
-    margin: 4rem auto;
-    font-size: 2.5rem !important;
-    padding: 2rem 4rem !important;
-    background-color: #ff944d !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 15px !important;
-    cursor: pointer;
-    font-weight: bold !important;
-    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2) !important;
-}
-.center-button button:hover {
-    background-color: #e07b39 !important;
-    transform: scale(1.1) !important;
-}
-h1.title {
-    text-align: center;
-    font-size: 4em !important;
-    color: #ff6600 !important;
-}
-.progress-text {
-    text-align: center;
-    font-size: 1.2em !important;
-    color: #333 !important;
-}
-</style>
-"""
-st.markdown(page_bg, unsafe_allow_html=True)
+# CSS 스타일 (app_style 모듈에서 한 번만 만들어 재사용, Streamlit은 매 실행마다 다시 그려야 적용됨)
+st.markdown(PAGE_STYLE, unsafe_allow_html=True)
 
-# --- Colab 방식 투표 계산 함수들 ---
+# 투표 방식별 계산 함수는 voting_tally 패키지(voting_tally/methods.py)에 있음
 
-def calculate_borda_colab_style(votes, candidates):
-    """
-    Colab 방식 보르다 계산:
-    - 각 투표자의 순위 값을 그대로 사용 (1순위=1점, 2순위=2점...).
-    - 각 후보의 순위 값 합계가 가장 *작은* 후보가 승자.
-    - Streamlit의 votes 구조: votes[voter]['rank'] = {후보명: 순위값}
-    """
-    option_ranking_sum = {c: 0 for c in candidates}
-
-    if not votes or not candidates:
-        return {}, []
-
-    for voter_data in votes.values():
-        # voter_data['rank']는 {후보: 순위} 형태
-        for candidate_name, rank_value in voter_data['rank'].items():
-            if candidate_name in option_ranking_sum:
-                try: # rank_value가 숫자인지 확인
-                    option_ranking_sum[candidate_name] += int(rank_value) # 순위 값 자체를 더함
-                except (ValueError, TypeError):
-                    # 숫자가 아닌 경우 오류를 로깅하거나 기본값 처리 (예: 건너뛰기)
-                    # st.warning(f"경고: {voter_data}의 {candidate_name} 순위({rank_value})가 숫자가 아닙니다.")
-                    pass # 또는 특정 값으로 처리
+# --- 실행 시간 측정 ---
 
+# 설정하면 측정값을 이 경로에 Prometheus 텍스트 파일로 주기적으로 저장 (node_exporter textfile 수집기용)
+METRICS_PATH = os.environ.get("VOTING_METRICS_PATH")
+# 1이면 주소에 ?debug=1 이 없어도 항상 성능 패널을 표시
+DEBUG_PANEL = os.environ.get("VOTING_DEBUG_PANEL") == "1"
 
-    if not option_ranking_sum:
-        return {}, []
 
-    valid_scores = [s for s in option_ranking_sum.values() if isinstance(s, (int, float))]
-    if not valid_scores: # 모든 점수가 유효하지 않으면
-         # 모든 후보의 점수가 0이거나 유효하지 않은 경우, 동점 처리 또는 빈 결과 반환
-        if all(s == 0 for s in option_ranking_sum.values()):
-            return option_ranking_sum, list(candidates) # 모든 후보를 동점자로 반환
-        return {}, []
+def finish_stage():
+    """현재 단계의 실행 시간을 기록 (한 번만 기록됨)하고, METRICS_PATH가 있으면 내보냄."""
+    stage_timer.stop()
+    if METRICS_PATH:
+        METRICS.export(METRICS_PATH)
 
 
-    try:
-        min_sum_rank = min(valid_scores) # 유효한 점수 중에서 최소값 찾기
-        winners = [c for c, s in option_ranking_sum.items() if s == min_sum_rank and isinstance(s, (int, float))]
-    except ValueError: # valid_scores가 비어있을 때 발생 가능
-        return {}, []
+def rerun():
+    """단계 시간을 기록한 뒤 다시 실행 (st.rerun은 예외로 스크립트를 끝내므로 끝에서 기록할 수 없음)."""
+    finish_stage()
+    st.rerun()
 
-    return option_ranking_sum, winners
 
+def stop():
+    """단계 시간을 기록한 뒤 실행을 멈춤."""
+    finish_stage()
+    st.stop()
 
-def calculate_bentham_colab_style(votes, candidates):
-    """
-    Colab 방식 벤담 계산 (Streamlit의 기존 벤담과 유사):
-    - 각 투표자가 후보에게 부여한 'score' (선호도 점수)를 합산.
-    - 총점이 가장 *높은* 후보가 승자.
-    - Streamlit의 votes 구조: votes[voter]['score'] = {후보명: 점수값}
-    """
-    option_scores = {c: 0 for c in candidates}
-
-    if not votes or not candidates:
-        return {}, []
 
-    for voter_data in votes.values():
-        for candidate_name, score_value in voter_data['score'].items():
-            if candidate_name in option_scores:
-                try:
-                    option_scores[candidate_name] += float(score_value)
-                except (ValueError, TypeError):
-                    # st.warning(f"경고: {voter_data}의 {candidate_name} 점수({score_value})가 숫자가 아닙니다.")
-                    pass
+def show_debug_panel():
+    """주소에 ?debug=1 이 있거나 VOTING_DEBUG_PANEL=1 일 때 사이드바에 단계/계산별 지연 시간(최근 측정값 기준)과 Prometheus 내보내기를 표시."""
+    def ms(seconds):
+        return "-" if seconds is None else f"{seconds * 1000:.1f}ms"
 
+    with st.sidebar.expander("⏱️ 성능 (디버그)", expanded=True):
+        rows = ["| 지표 | 구분 | 횟수 | p50 | p95 | 최대 |", "|---|---|---:|---:|---:|---:|"]
+        for name, labels, summary in METRICS.summaries():
+            label_text = ", ".join(str(v) for v in labels.values())
+            rows.append(
+                f"| {name.replace('voting_', '').replace('_seconds', '')} | {label_text} | {summary['count']} "
+                f"| {ms(summary['p50'])} | {ms(summary['p95'])} | {ms(summary['max'])} |"
+            )
+        st.markdown("\n".join(rows))
+        st.download_button(
+            "Prometheus 텍스트 내려받기", METRICS.prometheus_text(),
+            file_name="voting_metrics.prom", mime="text/plain", key="download_metrics"
+        )
 
-    if not option_scores:
-        return {}, []
-    
-    valid_scores = [s for s in option_scores.values() if isinstance(s, (int, float))]
-    if not valid_scores:
-        if all(s == 0 for s in option_scores.values()):
-            return option_scores, list(candidates)
-        return {}, []
-
-
-    try:
-        max_total_score = max(valid_scores)
-        winners = [c for c, s in option_scores.items() if s == max_total_score and isinstance(s, (int, float))]
-    except ValueError: # valid_scores가 비어있을 때
-        return {}, []
-        
-    return option_scores, winners
 
+# --- 공유 선거 / 투표 제출·수정 ---
 
-def calculate_nash_colab_style(votes, candidates):
+@st.cache_resource
+def get_election_hub():
     """
-    Colab 방식 내쉬 계산:
-    - 각 후보에 대해, 모든 투표자가 부여한 'score'를 *곱함*.
-    - 곱한 값이 가장 *높은* 후보가 승자.
-    - 주의: 점수 중 0이 있으면 전체 곱이 0이 됨. Colab 코드에는 이 처리 없음.
-           여기서는 0점일 경우 매우 작은 값(0.00001)으로 대체.
+    프로세스 전체에서 공유하는 선거 목록:
+    - 같은 투표 ID로 접속한 세션들이 같은 선거(SharedElection)를 사용하므로 각자 자기 기기에서 투표할 수 있음.
+    - 선거와 투표는 SQLite 저장소에도 기록되어 새로고침/재시작 후에도 유지.
     """
-    option_multiplication_score = {c: 1.0 for c in candidates} # 곱셈이므로 1.0으로 초기화
+    from voting_tally.election_store import ElectionStore
+    from voting_tally.shared_election import ElectionHub
+    return ElectionHub(ElectionStore())
 
-    if not votes or not candidates:
-        return {}, []
 
-    for voter_data in votes.values():
-        for candidate_name, score_value in voter_data['score'].items():
-            if candidate_name in option_multiplication_score:
-                try:
-                    current_score = float(score_value) # 명시적 float 변환
-                    if current_score == 0:
-                        option_multiplication_score[candidate_name] *= 0.00001 
-                    else:
-                        option_multiplication_score[candidate_name] *= current_score
-                except (ValueError, TypeError):
-                    # st.warning(f"경고: {voter_data}의 {candidate_name} 점수({score_value})가 숫자가 아닙니다. 곱셈에서 제외합니다.")
-                    # 곱셈에 영향을 주지 않도록 1을 곱하거나, 해당 투표자의 이 후보 점수는 무시
-                    pass # option_multiplication_score[candidate_name] *= 1 
-    
-    if not option_multiplication_score:
-        return {}, []
-
-    valid_scores = [s for s in option_multiplication_score.values() if isinstance(s, (int, float))]
-    if not valid_scores:
-        # 모든 후보의 점수가 1.0 (초기값)이거나 유효하지 않은 경우
-        if all(abs(s - 1.0) < 1e-9 for s in option_multiplication_score.values()): # 초기값 그대로인 경우
-            return option_multiplication_score, list(candidates) # 모든 후보 동점 처리
-        return {}, []
+def use_election(election):
+    """공유 선거를 이 세션에 연결하고 주소(?election=ID)에 선거 ID를 남김."""
+    st.session_state.election = election
+    st.session_state.election_id = election.election_id
+    st.session_state.title = election.title
+    st.session_state.candidates = election.candidates
+    st.session_state.voters = election.voters
+    st.session_state.votes = election.store # 제출된 투표만 기록됨 (다른 세션의 제출도 바로 보임)
+    st.session_state.result_cache = ResultCache() # (방식, 투표 버전)별 결과 캐시
+    st.query_params["election"] = election.election_id
 
-    try:
-        max_multiplied_score = max(valid_scores)
-        winners = [c for c, s in option_multiplication_score.items() if isinstance(s, (int, float)) and abs(s - max_multiplied_score) < 1e-9]
-    except ValueError:
-        return {}, []
 
-    return option_multiplication_score, winners
+def start_election(title, store, completed, tally=None):
+    """새 선거를 만들어 이 세션에 연결 (completed: 이미 제출된 투표 표시 bool 배열)."""
+    use_election(get_election_hub().create(title, store, completed, tally))
 
 
-def calculate_condorcet_colab_style(votes, candidates):
+def relink_election():
+    """
+    매 실행마다 허브에서 이 세션의 선거를 다시 찾아 연결:
+    - 찾을 때마다 사용 시각이 갱신되므로 진행 중인 선거는 허브가 오래 쓰지 않은 선거를 내릴 때 남음.
+    - 자리를 비운 사이 내려갔다면 다시 불러온 공유 선거로 바꿔 연결 (내려간 사본에 따로 쓰지 않도록).
+    """
+    election = get_election_hub().get(st.session_state.election_id)
+    if election is not None and election is not st.session_state.election:
+        st.session_state.election = election
+        st.session_state.votes = election.store
+        st.session_state.result_cache = ResultCache()
+
+
+def restore_election(election_id):
+    """저장된(또는 다른 세션이 진행 중인) 선거에 연결. 선거가 없으면 False."""
+    election = get_election_hub().get(election_id)
+    if election is None:
+        return False
+    use_election(election)
+    if election.method in METHOD_DISPLAY_NAMES: # 마지막으로 선택한 방식을 기본값으로
+        st.session_state.method_internal = election.method
+        st.session_state.method_display_name = METHOD_DISPLAY_NAMES[election.method]
+    st.session_state.stage = "vote_select"
+    return True
+
+
+def open_archive(uploaded_file):
     """
-    Colab 방식 콩도르세 계산:
-    - 모든 후보 쌍에 대해 (A, B) 대결.
-    - 각 대결에서 투표자의 *1순위 선택*만을 기준으로 승자 결정.
-      (A를 1순위로 뽑은 사람 수 vs B를 1순위로 뽑은 사람 수)
-    - 각 pairwise 대결의 승자들을 모아, 가장 많이 등장한(이긴) 후보가 최종 승자.
-    - Streamlit의 votes 구조: votes[voter]['rank'] = {후보명: 순위값}
+    보관 파일(.vote)의 선거를 새 투표 ID로 다시 열어 이 세션에 연결 (형식이 잘못되었으면 ValueError):
+    - 순위/점수 행렬은 파일 버퍼 위에 그대로 올리므로 투표별 변환 없이 열리고, 다른 방식으로 다시 집계할 수 있음.
+    - 저장소에는 투표자 행 없이 스냅샷 하나로 기록하고, 즉석 결선용 투표 묶음은 처음 필요할 때 만듦.
     """
-    if len(candidates) < 2 or not votes:
-        return {c: 0 for c in candidates}, []
+    from voting_tally.election_archive import read_archive
+    archive = read_archive(uploaded_file)
+    start_election(archive.title, archive.store, archive.completed)
+    if archive.method in METHOD_DISPLAY_NAMES: # 보관할 때 선택했던 방식을 기본값으로
+        st.session_state.election.set_method(archive.method)
+        st.session_state.method_internal = archive.method
+        st.session_state.method_display_name = METHOD_DISPLAY_NAMES[archive.method]
+    st.session_state.stage = "vote_select"
 
-    pairwise_matchups = []
-    for i in range(len(candidates)):
-        for j in range(len(candidates)): 
-            if i == j:
-                continue
-            pairwise_matchups.append((candidates[i], candidates[j]))
 
-    colab_style_pairwise_winners_list = []
+def begin_ballot(voter):
+    """
+    투표자 ID의 작성 중인 투표를 마지막 제출 투표(없으면 기본 투표)로 시작:
+    - draft_ranks / draft_scores는 후보 ID(후보 순서) 위치의 소형 정수 배열이라 후보 이름을 반복해 담지 않음.
+    """
+    st.session_state.current_voter = voter
+    st.session_state.draft_ranks, st.session_state.draft_scores = st.session_state.election.ballot(voter)
 
-    for c1, c2 in pairwise_matchups: 
-        c1_as_first_choice_count = 0
-        c2_as_first_choice_count = 0
 
-        for voter_name, voter_data in votes.items(): # voter_name 추가 (디버깅용)
-            ranks = voter_data.get('rank', {}) 
-            if not ranks: continue 
+def commit_ballot(voter):
+    """
+    작성 중인 투표를 공유 선거에 제출:
+    - 선거별 잠금 안에서 투표 저장소·누적 집계·SQLite가 함께 갱신되므로 여러 세션이 동시에 제출해도 유실되지 않음.
+    - 이미 제출한 투표자가 다시 제출하면 기존 투표를 대체.
+    """
+    st.session_state.election.submit(voter, st.session_state.draft_ranks, st.session_state.draft_scores)
 
-            current_voter_first_choices = []
-            # rank 값이 숫자인지 확인 후 처리
-            valid_ranks = {cand: r_val for cand, r_val in ranks.items() if isinstance(r_val, (int, float))}
-            if not valid_ranks: continue
 
-            min_rank_val = min(valid_ranks.values()) # 유효한 순위 중 최소값
+def withdraw_ballot(voter):
+    """제출한 투표를 다시 고치기 위해 누적 집계에서 되돌리고 미완료로 표시."""
+    st.session_state.election.withdraw(voter)
 
-            for candidate, rank_val in valid_ranks.items():
-                if rank_val == min_rank_val and rank_val == 1 : # 1순위인 후보들
-                    current_voter_first_choices.append(candidate)
-            
-            if len(current_voter_first_choices) == 1:
-                first_choice_candidate = current_voter_first_choices[0]
-                if first_choice_candidate == c1:
-                    c1_as_first_choice_count += 1
-                elif first_choice_candidate == c2:
-                    c2_as_first_choice_count += 1
-        
-        if c1_as_first_choice_count > c2_as_first_choice_count:
-            colab_style_pairwise_winners_list.append(c1)
-        elif c2_as_first_choice_count > c1_as_first_choice_count:
-            colab_style_pairwise_winners_list.append(c2)
 
-    if not colab_style_pairwise_winners_list:
-        return {c: 0 for c in candidates}, []
+def pick_voter(label, completed, key):
+    """
+    이름 검색과 페이지 넘김으로 투표자 한 명을 골라 ID를 반환 (검색 결과가 없으면 None):
+    - 한 번에 한 페이지(ROSTER_PAGE_SIZE명)만 selectbox에 넣으므로 투표자가 많아도 화면을 그리는 비용이 일정함.
+    - 제출 여부별 목록과 개수는 선거의 명단 색인(VoterRoster)에서 바로 얻음.
+    """
+    from voting_tally.voter_roster import ROSTER_PAGE_SIZE
+
+    roster = st.session_state.election.roster
+    query = st.text_input("이름으로 찾기", key=f"{key}_search", placeholder="이름의 일부를 입력하세요")
+    n_matches = roster.count(completed, query)
+    n_pages = max(1, -(-n_matches // ROSTER_PAGE_SIZE))
+    page = 0
+    if st.session_state.get(f"{key}_query") == query: # 검색어가 바뀌면 첫 페이지부터
+        page = min(st.session_state.get(f"{key}_page", 0), n_pages - 1)
+    if n_pages > 1:
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ 이전", key=f"{key}_prev", disabled=page == 0):
+                page -= 1
+        with col_next:
+            if st.button("다음 ▶", key=f"{key}_next", disabled=page == n_pages - 1):
+                page += 1
+        with col_info:
+            st.caption(f"{page + 1}/{n_pages}쪽 (모두 {n_matches}명)")
+    st.session_state[f"{key}_query"] = query
+    st.session_state[f"{key}_page"] = page
+
+    voters_page = roster.page(completed, query, page)
+    if not voters_page:
+        st.info("찾는 이름이 없습니다.")
+        return None
+    return st.selectbox(label, voters_page, format_func=st.session_state.voters.__getitem__, key=key)
+
+
+# --- 결과 계산 ---
+
+RESULT_COLUMN_NAMES = {
+    "borda_colab": "보르다 순위합 (작을수록 좋음)",
+    "bentham_colab": "벤담 총점 (클수록 좋음)",
+    "nash_colab": "내쉬 곱셈점수 로그값 (클수록 좋음)",
+    "condorcet_colab": "콩도르세 Pairwise 승수 (1순위 기반)",
+    "schulze": "슐체 승수 (가장 강한 경로로 이긴 후보 수)",
+    "ranked_pairs": "랭크드 페어 승수 (잠근 대결로 이긴 후보 수)",
+    "instant_runoff": "즉석 결선 득표 (마지막으로 남은 라운드)",
+}
 
-    winner_counts = Counter(colab_style_pairwise_winners_list)
-    
-    if not winner_counts: 
-        return {c: 0 for c in candidates}, []
+# 저장된 방식(method_internal)으로 방식 선택 화면의 기본값을 되살릴 때 사용
+METHOD_DISPLAY_NAMES = {
+    "borda_colab": "보르다 (Colab)",
+    "bentham_colab": "벤담 (Colab)",
+    "nash_colab": "내쉬 (Colab)",
+    "condorcet_colab": "콩도르세 (Colab)",
+    "schulze": "슐체 (Schulze)",
+    "ranked_pairs": "랭크드 페어 (Ranked Pairs)",
+    "instant_runoff": "즉석 결선 (IRV)",
+    "compare_all": "전체 방식 비교",
+}
 
-    max_wins = 0
-    if winner_counts: # Counter가 비어있지 않다면
-        try:
-            max_wins = winner_counts.most_common(1)[0][1] 
-        except IndexError: # most_common(1)이 비어있는 리스트를 반환할 경우 (이론상 발생 안 함)
-            return {c:0 for c in candidates}, []
 
+def compute_result(method_internal, votes_data, candidates_list, nash_mode="log"):
+    """
+    선택한 방식의 결과를 계산해 CachedResult(점수, 승자, 정렬된 결과표)로 반환:
+    - 결과표는 후보를 인덱스로 한 DataFrame (보르다만 오름차순). 점수가 없으면 None.
+    - 즉석 결선은 라운드별 득표 열을 결과표에 붙이고, 라운드 진행(IRVResult)을 details로 함께 반환.
+    """
+    import pandas as pd
+    from voting_tally import (
+        calculate_bentham_colab_style, calculate_borda_colab_style,
+        calculate_condorcet_colab_style, calculate_nash_colab_style, calculate_ranked_pairs, calculate_schulze,
+        instant_runoff_rounds,
+    )
+    from voting_tally.instant_runoff import last_round_counts
+
+    details = None
+
+    with METRICS.timer("voting_tally_seconds", method=method_internal):
+        if method_internal == "borda_colab":
+            scores_output, winners_list = calculate_borda_colab_style(votes_data, candidates_list)
+        elif method_internal == "bentham_colab":
+            scores_output, winners_list = calculate_bentham_colab_style(votes_data, candidates_list)
+        elif method_internal == "nash_colab":
+            scores_output, winners_list = calculate_nash_colab_style(votes_data, candidates_list, mode=nash_mode)
+        elif method_internal == "condorcet_colab":
+            scores_output, winners_list = calculate_condorcet_colab_style(votes_data, candidates_list)
+        elif method_internal == "schulze":
+            scores_output, winners_list = calculate_schulze(votes_data, candidates_list)
+        elif method_internal == "ranked_pairs":
+            scores_output, winners_list = calculate_ranked_pairs(votes_data, candidates_list)
+        elif method_internal == "instant_runoff":
+            details = instant_runoff_rounds(votes_data, candidates_list)
+            scores_output, winners_list = last_round_counts(details, candidates_list), details.winners
+        else:
+            raise ValueError(f"알 수 없는 투표 방식입니다: {method_internal}")
 
-    final_winners = [cand for cand, count in winner_counts.items() if count == max_wins]
-    
-    display_scores = {c: winner_counts.get(c, 0) for c in candidates}
-    
-    return display_scores, final_winners
+    result_table = None
+    if scores_output:
+        with METRICS.timer("voting_dataframe_seconds", method=method_internal):
+            df_column_name = RESULT_COLUMN_NAMES[method_internal]
+            df = pd.DataFrame({"후보": list(scores_output), df_column_name: list(scores_output.values())})
+            if details is not None: # 라운드별 득표 (탈락한 뒤의 라운드는 빈칸)
+                for k, irv_round in enumerate(details.rounds, 1):
+                    df[f"{k}라운드"] = [irv_round.counts.get(c) for c in scores_output]
+            ascending_sort = (method_internal == "borda_colab")
+            result_table = df.sort_values(by=df_column_name, ascending=ascending_sort).set_index("후보")
+    return CachedResult(scores_output, winners_list, result_table, details)
 
 
 # --- 메인 애플리케이션 로직 ---
@@ -257,10 +271,22 @@ if 'stage' not in st.session_state:
     st.session_state.candidates = []
     st.session_state.voters = []
     st.session_state.votes = {}
-    st.session_state.completed = {}
-    st.session_state.current_voter = None
+    st.session_state.election = None
+    st.session_state.current_voter = None # 투표 중인 투표자 ID (명단 순서)
     st.session_state.method_display_name = None
     st.session_state.method_internal = None
+    st.session_state.election_id = None
+
+    # 주소에 선거 ID가 있으면 (새로고침/재접속) 저장된 선거를 이어서 진행
+    if "election" in st.query_params and not restore_election(st.query_params["election"]):
+        st.warning("주소의 투표를 찾을 수 없어 처음 화면으로 이동합니다.")
+        del st.query_params["election"]
+
+if st.session_state.get("election") is not None:
+    relink_election()
+
+# 이번 실행의 단계 시간 측정 시작 (스크립트 끝이나 rerun()/stop()에서 기록)
+stage_timer = METRICS.timer("voting_stage_seconds", stage=st.session_state.stage).start()
 
 
 # 홈 화면
@@ -269,8 +295,28 @@ if st.session_state.stage == "home":
     st.markdown("<div class='center-button'>", unsafe_allow_html=True)
     if st.button("Start", key="start_button_main", help="투표를 시작하려면 클릭하세요"):
         st.session_state.stage = "setup"
-        st.rerun()
+        rerun()
     st.markdown("</div>", unsafe_allow_html=True) # 이 라인까지는 Start 버튼 관련
+
+    with st.expander("🔗 투표 ID로 이어하기"):
+        resume_id = st.text_input("투표 ID", key="resume_election_id", placeholder="예: 3f9c2a7b1d4e")
+        if st.button("저장된 투표 불러오기", key="resume_election_button") and resume_id.strip():
+            if restore_election(resume_id.strip()):
+                st.query_params["election"] = resume_id.strip()
+                rerun()
+            else:
+                st.error("해당 ID의 투표를 찾을 수 없습니다.")
+
+    with st.expander("📦 보관한 투표 파일 열기"):
+        archive_file = st.file_uploader("투표 보관 파일 (.vote)", type=["vote"], key="archive_file_upload")
+        if archive_file is not None and st.button("보관한 투표 열기", key="open_archive_button"):
+            try:
+                with st.spinner("보관 파일을 여는 중입니다..."):
+                    open_archive(archive_file)
+            except ValueError as e:
+                st.error(f"보관 파일을 열 수 없습니다: {e}")
+            else:
+                rerun()
     
     # --- 여기부터 들여쓰기 수정 ---
     st.markdown("---") # 이 라인의 들여쓰기가 if 문과 같은 레벨이거나, div 밖으로 나와야 함.
@@ -294,7 +340,7 @@ if st.session_state.stage == "home":
 &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;동률 발생 시, 제공되는 타이브레이킹 옵션을 사용하거나<br>
 &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;다른 투표 방식의 결과를 참고할 수 있습니다.
 
-## 4가지 투표 방법을 소개할게요
+## 7가지 투표 방법을 소개할게요
 
 #### 🏆 보르다 방식  
 **"순위 숫자의 합이 가장 작은 후보가 승리!"**<br>
@@ -306,7 +352,7 @@ if st.session_state.stage == "home":
 #### ⚖️ 내쉬 방식  
 **"모든 투표자의 선호도 점수를 곱해서 최대화!"**<br>
 각 후보에 대해 모든 투표자가 부여한 선호도 점수(0~10점)를 곱합니다.<br>
-이 곱한 값이 가장 **큰** 후보가 선택됩니다. (0점은 계산 시 0.00001로 처리)<br>
+이 곱한 값이 가장 **큰** 후보가 선택됩니다. (0점은 계산 시 0.00001로 처리, 결과표에는 곱의 로그값 표시)<br>
 - 장점: 만장일치에 가까운 강한 선호를 가진 후보에게 유리할 수 있습니다.<br>
 - 단점: 한 명이라도 0점에 가까운 점수를 주면 전체 곱이 매우 작아질 수 있습니다.
 
@@ -326,6 +372,27 @@ if st.session_state.stage == "home":
 - 장점: 선호도의 강도를 직접적으로 반영합니다.<br>
 - 단점: 소수의 강한 선호가 다수의 약한 선호를 압도할 수 있습니다.
 
+#### 🧭 슐체 방식  
+**"가장 강한 승리의 길로 모두를 이기는 후보!"**<br>
+모든 후보쌍을 전체 순위로 비교해, 이긴 대결을 화살표로 잇습니다.<br>
+A에서 B로 가는 길 중 가장 약한 대결이 가장 센 길의 세기를 비교해, 모든 후보를 이기거나 비기는 후보가 선택됩니다.<br>
+- 장점: 가위바위보 같은 순환이 있어도 항상 승자가 정해집니다.<br>
+- 단점: 계산 과정이 복잡해 결과를 직관적으로 설명하기 어렵습니다.
+
+#### 🔗 랭크드 페어 방식  
+**"큰 차이로 이긴 대결부터 차례로 확정!"**<br>
+모든 후보쌍의 대결 결과를 표 차이가 큰 순서로 확정해 나갑니다.<br>
+앞서 확정한 결과와 순환을 만드는 대결은 건너뛰고, 확정된 대결에서 한 번도 지지 않은 후보가 선택됩니다.<br>
+- 장점: 큰 차이의 승리를 우선 존중하며, 모든 대결을 이기는 후보가 있으면 그 후보가 선택됩니다.<br>
+- 단점: 표 차이가 같은 대결이 많으면 확정 순서에 따라 결과가 달라질 수 있습니다.
+
+#### 🔁 즉석 결선 방식  
+**"꼴찌부터 떨어뜨리며 과반 후보를 찾는다!"**<br>
+1순위 표를 세어 과반을 얻은 후보가 없으면 가장 적게 얻은 후보를 탈락시킵니다.<br>
+탈락한 후보의 표는 그 투표의 다음 선호 후보에게 옮겨지고, 과반 후보가 나올 때까지 반복합니다.<br>
+- 장점: 결선 투표를 다시 치르지 않아도 다수가 받아들일 수 있는 후보를 고를 수 있습니다.<br>
+- 단점: 일찍 탈락한 후보의 지지 구성에 따라 모두에게 두루 지지받는 후보가 먼저 떨어질 수 있습니다.
+
 ### ❓ 왜 이런 투표 시스템이 필요할까요 ❓  
 일반적인 "찬성/반대" 투표만으로는 복잡한 문제를 해결하기 어려워요.<br>
 모두의투표는 이런 점에서 도움이 됩니다:<br>
@@ -396,18 +463,43 @@ elif st.session_state.stage == "setup":
             for msg in error_messages:
                 st.error(msg)
         else:
-            st.session_state.title = current_title # 최종 확정된 값으로 세션 상태 업데이트
-            st.session_state.candidates = candidates
-            st.session_state.voters = voters
-            st.session_state.votes = {
-                voter: {
-                    'rank': {c: (idx + 1) for idx, c in enumerate(candidates)}, 
-                    'score': {c: 5 for c in candidates} 
-                } for voter in voters
-            }
-            st.session_state.completed = {voter: False for voter in voters}
+            import numpy as np
+            from voting_tally import BallotStore
+            # 기본 투표(순위 1..C, 점수 5)를 V×C 행렬로 보관하는 공유 선거를 만듦
+            start_election(current_title, BallotStore(candidates, voters), np.zeros(len(voters), dtype=bool))
             st.session_state.stage = "vote_select"
-            st.rerun()
+            rerun()
+
+    # 파일로 투표 한꺼번에 불러오기 (후보/투표자/투표를 파일에서 가져옴)
+    with st.expander("📂 파일로 투표 한꺼번에 불러오기 (CSV / Parquet)"):
+        st.markdown(
+            "`voter` 열과 후보마다 `rank_후보`(1이 가장 선호), `score_후보`(0~10) 열이 있는 파일을 올려주세요.<br>"
+            "후보와 투표자는 파일에서 가져오며, 투표 주제는 위에 입력한 값을 사용합니다.<br>"
+            "잘못된 행은 건너뛰고 목록으로 알려드립니다.",
+            unsafe_allow_html=True
+        )
+        ballot_file = st.file_uploader("투표 파일", type=["csv", "parquet"], key="ballot_file_upload")
+        if ballot_file is not None and st.button("파일의 투표 불러오기", key="import_ballots_button"):
+            if not st.session_state.title.strip():
+                st.error("투표 주제를 입력하세요.")
+            else:
+                import numpy as np
+                from voting_tally.ballot_import import detect_format, import_ballots
+                try:
+                    with st.spinner("투표 파일을 읽는 중입니다..."):
+                        store, tally, report = import_ballots(ballot_file, detect_format(ballot_file.name))
+                except ValueError as e:
+                    st.error(f"파일을 불러올 수 없습니다: {e}")
+                else:
+                    if not len(store):
+                        st.error("올바른 투표가 한 건도 없습니다.")
+                        for row_number, reason in report.errors[:20]:
+                            st.caption(f"{row_number}행: {reason}")
+                    else:
+                        start_election(st.session_state.title, store, np.ones(len(store), dtype=bool), tally)
+                        st.session_state.import_report = report # 투표자 선택 화면에서 한 번 보여줌
+                        st.session_state.stage = "vote_select"
+                        rerun()
 # 🔼🔼🔼 이 윗부분까지 수정합니다 🔼🔼🔼
 
 # 투표자 선택
@@ -417,139 +509,168 @@ elif st.session_state.stage == "vote_select":
     page_title = st.session_state.get('title',"").strip()
     if not page_title: page_title = "비밀 투표"
 
-
-    completed_count = sum(1 for v_name, v_status in st.session_state.completed.items() if v_status)
+    import_report = st.session_state.pop("import_report", None)
+    if import_report is not None:
+        import pandas as pd
+        st.success(f"파일에서 {import_report.n_rows}행을 읽어 {import_report.n_loaded}명의 투표를 불러왔습니다.")
+        if import_report.n_bad:
+            st.warning(f"잘못된 행 {import_report.n_bad}개는 건너뛰었습니다.")
+            st.dataframe(
+                pd.DataFrame(import_report.errors, columns=["행 번호", "사유"]).set_index("행 번호"),
+                use_container_width=True
+            )
+
+
+    election = st.session_state.election
+    election.refresh() # 투표 수집 API 등 다른 프로세스가 저장한 투표도 반영
+    completed_count = election.n_completed
     total_voters = len(st.session_state.voters)
     st.markdown(f"<p class='progress-text'>투표 진행: {completed_count}/{total_voters} 완료</p>", unsafe_allow_html=True)
+    if st.session_state.get("election_id"):
+        st.caption(
+            f"투표 ID: {st.session_state.election_id} — 이 페이지 주소를 공유하면 각자 자기 기기에서 투표할 수 있고, "
+            "새로고침하거나 나중에 이 ID로 이어서 진행할 수 있습니다."
+        )
+    if st.button("🔄 진행 상황 새로고침", key="refresh_progress"):
+        rerun()
     
-    remaining_voters = [v for v in st.session_state.voters if not st.session_state.completed.get(v, False)]
-    
-    if not remaining_voters and total_voters > 0 : # 투표자가 있고, 남은 투표자가 없을 때
+    if not election.roster.n_remaining and total_voters > 0 : # 투표자가 있고, 남은 투표자가 없을 때
         st.success("모든 투표자의 입력이 완료되었습니다!")
         if st.button("결과 산출 방식 선택으로 이동", key="go_to_method_select"):
             st.session_state.stage = "method_select"
-            st.rerun()
+            rerun()
     elif total_voters == 0:
         st.warning("설정된 투표자가 없습니다. 설정 화면으로 돌아가 투표자를 추가해주세요.")
     else:
-        voter = st.selectbox("투표할 사람을 선택하세요.", remaining_voters, key=f"voter_select_{st.session_state.stage}")
-        if st.button(f"{voter} (으)로 투표 시작하기", key=f"start_vote_for_{voter}"):
-            st.session_state.current_voter = voter
-            # 현재 투표자의 rank와 score가 없으면 기본값으로 초기화 (setup에서 이미 처리)
-            if voter not in st.session_state.votes:
-                 st.session_state.votes[voter] = {
-                    'rank': {c: (idx + 1) for idx, c in enumerate(st.session_state.candidates)}, 
-                    'score': {c: 5 for c in st.session_state.candidates} 
-                }
-            elif 'rank' not in st.session_state.votes[voter] or not st.session_state.votes[voter]['rank']:
-                st.session_state.votes[voter]['rank'] = {c: (idx + 1) for idx, c in enumerate(st.session_state.candidates)}
-            elif 'score' not in st.session_state.votes[voter] or not st.session_state.votes[voter]['score']:
-                 st.session_state.votes[voter]['score'] = {c: 5 for c in st.session_state.candidates}
-
+        voter = pick_voter("투표할 사람을 선택하세요.", False, key=f"voter_select_{st.session_state.stage}")
+        if voter is not None and st.button(f"{st.session_state.voters[voter]} (으)로 투표 시작하기", key=f"start_vote_for_{voter}"):
+            begin_ballot(voter) # 작성 중인 투표는 제출 전까지 이 세션에만 보관
             st.session_state.stage = "vote_input"
-            st.rerun()
+            rerun()
+
+    if election.n_completed:
+        with st.expander("제출한 투표 수정하기"):
+            voter_to_edit = pick_voter("수정할 투표자를 선택하세요.", True, key="voter_edit_select")
+            if voter_to_edit is not None and st.button(f"{st.session_state.voters[voter_to_edit]}님의 투표 다시 입력하기", key=f"edit_vote_for_{voter_to_edit}"):
+                withdraw_ballot(voter_to_edit) # 누적 집계에서 기존 투표를 되돌림
+                begin_ballot(voter_to_edit)
+                st.session_state.stage = "vote_input"
+                rerun()
 
     if st.button("투표 설정으로 돌아가기", key="back_to_setup_from_voter_select"):
         st.session_state.stage = "setup"
-        st.rerun()
+        rerun()
 
 # 순위 입력
 elif st.session_state.stage == "vote_input":
-    if not st.session_state.current_voter: # current_voter가 없으면 vote_select로 보냄
+    if st.session_state.current_voter is None: # current_voter가 없으면 vote_select로 보냄
         st.warning("투표자를 먼저 선택해주세요.")
         st.session_state.stage = "vote_select"
-        st.rerun() # rerun을 해야 st.warning이 제대로 표시되고 이동함
+        rerun() # rerun을 해야 st.warning이 제대로 표시되고 이동함
         
     voter = st.session_state.current_voter
-    st.title(f"🗳️ {voter}님, 투표를 진행해주세요.")
+    st.title(f"🗳️ {st.session_state.voters[voter]}님, 투표를 진행해주세요.")
     st.subheader(f"투표 주제: {st.session_state.get('title', '')}")
 
     st.markdown("#### 🔢 순위 입력 (Colab 보르다/콩도르세 방식에 사용)")
     st.markdown("각 후보에 대해 선호하는 순위를 입력해주세요 (1위가 가장 선호). **각 후보는 고유한 순위를 가져야 합니다.**")
     
-    ranks_data = st.session_state.votes[voter]['rank']
+    ranks_data = st.session_state.draft_ranks
     
-    current_ranks_input = {}
-    # 후보 목록이 변경되었을 수 있으므로 st.session_state.candidates 기준으로 루프
-    for candidate_name_loop in st.session_state.candidates:
-        current_ranks_input[candidate_name_loop] = st.number_input(
-            f"{candidate_name_loop}의 순위", 
-            min_value=1, 
-            max_value=len(st.session_state.candidates), 
-            value=int(ranks_data.get(candidate_name_loop, 1)), # int로 변환하여 오류 방지
-            step=1, 
-            key=f"rank_{candidate_name_loop}_{voter}"
-        )
-
-    if st.button("순위 입력 완료 → 점수 입력으로 이동", key="rank_to_score_button"):
-        rank_values = list(current_ranks_input.values())
+    # 폼 안의 입력은 제출 버튼을 누를 때 한 번에 전달되므로, 순위를 고칠 때마다 스크립트 전체가 다시 실행되지 않음
+    # (Enter 키로는 제출하지 않아 입력 도중 다음 단계로 넘어가지 않음)
+    with st.form(key=f"rank_form_{voter}", enter_to_submit=False):
+        current_ranks_input = []
+        # 위젯 키와 입력값은 후보 ID(후보 순서) 기준, 이름은 표시할 때만 사용
+        for candidate_id, candidate_name_loop in enumerate(st.session_state.candidates):
+            current_ranks_input.append(st.number_input(
+                f"{candidate_name_loop}의 순위", 
+                min_value=1, 
+                max_value=len(st.session_state.candidates), 
+                value=int(ranks_data[candidate_id]), # int로 변환하여 오류 방지
+                step=1, 
+                key=f"rank_{candidate_id}_{voter}"
+            ))
+        rank_submitted = st.form_submit_button("순위 입력 완료 → 점수 입력으로 이동", key="rank_to_score_button")
+
+    if rank_submitted:
+        rank_values = current_ranks_input
         if len(set(rank_values)) != len(st.session_state.candidates): # 모든 후보에 대해 순위가 매겨졌고, 중복 없는지
             st.error("각 후보는 고유한 순위를 가져야 하며, 모든 후보의 순위가 입력되어야 합니다. (1부터 후보자 수까지의 숫자가 모두 사용되어야 함)")
         elif len(rank_values) != len(st.session_state.candidates):
              st.error("모든 후보에 대한 순위를 입력해야 합니다.")
         else:
-            st.session_state.votes[voter]['rank'] = current_ranks_input
+            st.session_state.draft_ranks[:] = current_ranks_input
             st.session_state.stage = "score_input"
-            st.rerun()
+            rerun()
     
     if st.button("이전 단계 (투표자 선택)으로 돌아가기", key="back_to_voter_select_from_rank"):
         st.session_state.stage = "vote_select"
-        st.rerun()
+        rerun()
 
 # 점수 입력
 elif st.session_state.stage == "score_input":
-    if not st.session_state.current_voter:
+    if st.session_state.current_voter is None:
         st.warning("투표자를 먼저 선택해주세요.")
         st.session_state.stage = "vote_select"
-        st.rerun()
+        rerun()
 
     voter = st.session_state.current_voter
-    st.title(f"📊 {voter}님, 각 후보에 대한 선호 점수를 입력해주세요.")
+    voter_name = st.session_state.voters[voter]
+    st.title(f"📊 {voter_name}님, 각 후보에 대한 선호 점수를 입력해주세요.")
     st.subheader(f"투표 주제: {st.session_state.get('title', '')}")
 
     st.markdown("#### 💯 선호 점수 입력 (Colab 벤담/내쉬 방식에 사용)")
     st.markdown("각 후보에 대해 얼마나 선호하는지 점수를 매겨주세요 (0점 ~ 10점, 높을수록 선호). **점수는 중복될 수 있습니다.**")
     
-    scores_data = st.session_state.votes[voter]['score'] 
-
-    sorted_candidates_by_rank = sorted(
-        st.session_state.candidates, 
-        key=lambda c: st.session_state.votes[voter]['rank'].get(c, float('inf'))
-    )
-
-    current_scores_input = {}
-    for candidate_name_loop in sorted_candidates_by_rank:
-        rank_for_display = st.session_state.votes[voter]['rank'].get(candidate_name_loop, 'N/A')
-        current_scores_input[candidate_name_loop] = st.number_input(
-            f"{candidate_name_loop} (입력 순위: {rank_for_display}위)의 점수", 
-            min_value=0, 
-            max_value=10, 
-            value=int(scores_data.get(candidate_name_loop, 5)), # int로 변환
-            step=1, 
-            key=f"score_{candidate_name_loop}_{voter}" 
-        )
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("⬅️ 순위 다시 입력하기", key="score_to_rank_button"):
-            st.session_state.votes[voter]['score'] = current_scores_input # 현재까지 입력한 점수 임시 저장
-            st.session_state.stage = "vote_input"
-            st.rerun()
-    with col2:
-        if st.button(f"{voter}님의 투표 제출하기 ➡️", key="submit_vote_button"):
-            st.session_state.votes[voter]['score'] = current_scores_input
-            st.session_state.completed[voter] = True
-            st.success(f"{voter}님의 투표가 성공적으로 제출되었습니다!")
-            # import time; time.sleep(1) # UX를 위해 짧은 지연 후 이동 (선택적)
-            st.session_state.current_voter = None # 현재 투표자 초기화
-            st.session_state.stage = "vote_select"
-            st.rerun()
+    ranks_data = st.session_state.draft_ranks
+    scores_data = st.session_state.draft_scores
+
+    # 후보 ID를 입력한 순위 순서로 (순위가 같으면 후보 순서대로)
+    sorted_candidates_by_rank = sorted(range(len(st.session_state.candidates)), key=ranks_data.__getitem__)
+
+    # 순위 입력과 마찬가지로 점수도 폼으로 모아 두 버튼 중 하나를 누를 때 한 번에 전달
+    with st.form(key=f"score_form_{voter}", enter_to_submit=False):
+        current_scores_input = {}
+        for candidate_id in sorted_candidates_by_rank:
+            candidate_name_loop = st.session_state.candidates[candidate_id]
+            current_scores_input[candidate_id] = st.number_input(
+                f"{candidate_name_loop} (입력 순위: {ranks_data[candidate_id]}위)의 점수", 
+                min_value=0, 
+                max_value=10, 
+                value=int(scores_data[candidate_id]), # int로 변환
+                step=1, 
+                key=f"score_{candidate_id}_{voter}" 
+            )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            back_to_rank = st.form_submit_button("⬅️ 순위 다시 입력하기", key="score_to_rank_button")
+        with col2:
+            submit_vote = st.form_submit_button(f"{voter_name}님의 투표 제출하기 ➡️", key="submit_vote_button")
+
+    if back_to_rank or submit_vote:
+        for candidate_id, score in current_scores_input.items(): # 현재까지 입력한 점수 저장
+            scores_data[candidate_id] = score
+    if back_to_rank:
+        st.session_state.stage = "vote_input"
+        rerun()
+    if submit_vote:
+        commit_ballot(voter)
+        st.success(f"{voter_name}님의 투표가 성공적으로 제출되었습니다!")
+        # import time; time.sleep(1) # UX를 위해 짧은 지연 후 이동 (선택적)
+        st.session_state.current_voter = None # 현재 투표자 초기화
+        st.session_state.stage = "vote_select"
+        rerun()
 
 # 투표 방식 선택
 elif st.session_state.stage == "method_select":
     st.title("🧠 투표 결과 산출 방식 선택")
     st.subheader(f"투표 주제: {st.session_state.get('title', '')}")
-    method_options = ["보르다 (Colab)", "벤담 (Colab)", "내쉬 (Colab)", "콩도르세 (Colab)"]
+    method_options = [
+        "보르다 (Colab)", "벤담 (Colab)", "내쉬 (Colab)", "콩도르세 (Colab)",
+        "슐체 (Schulze)", "랭크드 페어 (Ranked Pairs)", "즉석 결선 (IRV)", "전체 방식 비교",
+    ]
     
     # 이전에 선택한 방식이 있으면 기본값으로 설정
     current_method_display = st.session_state.get("method_display_name", method_options[0])
@@ -567,8 +688,12 @@ elif st.session_state.stage == "method_select":
     
     if method == "보르다 (Colab)": st.info("보르다 (Colab): 각 후보에게 매긴 순위값(1위=1)의 총합이 가장 '작은' 후보 선택.")
     elif method == "벤담 (Colab)": st.info("벤담 (Colab): 각 후보에게 매긴 선호도 점수(0~10)의 총합이 가장 '큰' 후보 선택.")
-    elif method == "내쉬 (Colab)": st.info("내쉬 (Colab): 각 후보에 대한 모든 투표자의 선호도 점수를 '곱한' 값이 가장 '큰' 후보 선택 (0점은 0.00001로 처리).")
+    elif method == "내쉬 (Colab)": st.info("내쉬 (Colab): 각 후보에 대한 모든 투표자의 선호도 점수를 '곱한' 값이 가장 '큰' 후보 선택 (0점은 0.00001로 처리, 곱이 너무 커지지 않도록 로그값으로 비교).")
     elif method == "콩도르세 (Colab)": st.info("콩도르세 (Colab): 모든 후보쌍 대결 시 '1순위' 투표만 고려, 가장 많은 pairwise 승리를 한 후보 선택.")
+    elif method == "슐체 (Schulze)": st.info("슐체 (Schulze): 전체 순위로 모든 후보쌍을 비교해, 이긴 대결들을 이어 만든 '가장 강한 경로'로 다른 모든 후보를 이기거나 비기는 후보 선택 (순환이 있어도 승자가 정해짐).")
+    elif method == "랭크드 페어 (Ranked Pairs)": st.info("랭크드 페어 (Ranked Pairs): 표 차이가 큰 대결 승리부터 확정하되 앞서 확정한 결과와 순환을 만드는 승리는 버리고, 확정된 대결에서 한 번도 지지 않은 후보 선택.")
+    elif method == "즉석 결선 (IRV)": st.info("즉석 결선 (IRV): 1순위 표로 과반 후보가 없으면 최하위 후보를 탈락시키고, 그 표를 각 투표의 다음 순위 후보에게 옮기기를 과반 후보가 나올 때까지 반복.")
+    elif method == "전체 방식 비교": st.info("전체 방식 비교: 보르다·벤담·내쉬·콩도르세(Colab), 전체 순위 기반 쌍대 비교 콩도르세, 슐체, 랭크드 페어의 점수와 승자를 한 표로 비교.")
 
     if st.button("선택한 방식으로 결과 보기", key="view_results_button"):
         st.session_state.method_display_name = method 
@@ -576,55 +701,113 @@ elif st.session_state.stage == "method_select":
         elif method == "벤담 (Colab)": st.session_state.method_internal = "bentham_colab"
         elif method == "내쉬 (Colab)": st.session_state.method_internal = "nash_colab"
         elif method == "콩도르세 (Colab)": st.session_state.method_internal = "condorcet_colab"
+        elif method == "슐체 (Schulze)": st.session_state.method_internal = "schulze"
+        elif method == "랭크드 페어 (Ranked Pairs)": st.session_state.method_internal = "ranked_pairs"
+        elif method == "즉석 결선 (IRV)": st.session_state.method_internal = "instant_runoff"
+        elif method == "전체 방식 비교": st.session_state.method_internal = "compare_all"
+        st.session_state.election.set_method(st.session_state.method_internal)
         st.session_state.stage = "result"
-        st.rerun()
+        rerun()
     
     if st.button("이전 단계 (투표자 선택)으로 돌아가기", key="back_to_voter_select_from_method"):
         st.session_state.stage = "vote_select"
-        st.rerun()
+        rerun()
 
 # 결과 출력
 elif st.session_state.stage == "result":
+    import pandas as pd # 결과표를 만드는 이 단계에서만 필요
+    from voting_tally import compare_all_methods
     st.title(f"🏆 투표 결과: {st.session_state.get('title', '')}")
     method_display = st.session_state.get("method_display_name", "N/A")
     method_internal = st.session_state.get("method_internal", "N/A")
     st.subheader(f"✔ 선택된 방식: {method_display}")
     
-    # candidates_list 와 votes_data_dict가 존재하는지 먼저 확인
+    # candidates_list 와 votes_data가 존재하는지 먼저 확인
     if 'candidates' not in st.session_state or 'votes' not in st.session_state:
         st.error("후보 또는 투표 정보가 설정되지 않았습니다. 설정 화면으로 돌아가세요.")
         if st.button("설정 화면으로 돌아가기", key="result_to_setup_error"):
             st.session_state.stage = "setup"
-            st.rerun()
-        st.stop() # 더 이상 진행하지 않음
+            rerun()
+        stop() # 더 이상 진행하지 않음
 
     candidates_list = st.session_state.candidates
-    votes_data_dict = st.session_state.votes
-    
+    election = st.session_state.election
+    # 다른 세션이 계속 제출해도 이 결과 계산에는 같은 시점의 집계를 사용
+    # (공유 투표 저장소에는 취소·미제출 투표도 남아 있고 잠금 밖에서 읽으면 안 되므로 항상 누적 집계 복사본으로 계산)
+    election.refresh()
+    # 즉석 결선은 투표별 전체 순위가 필요하므로 같은 투표 묶음도 누적 집계와 같은 시점으로 함께 받음
+    tally, patterns = election.result_snapshot(with_patterns=method_internal == "instant_runoff")
+    votes_data = tally
+    if len(tally) < len(election.voters):
+        st.warning(
+            f"아직 제출되지 않은 투표가 있습니다 ({len(tally)}/{len(election.voters)} 제출). "
+            "다른 투표자가 투표를 수정하는 중일 수 있으며, 아래 결과는 제출된 투표만으로 계산했습니다."
+        )
+        if st.button("투표자 선택으로 돌아가기", key="result_to_vote_select"):
+            st.session_state.stage = "vote_select"
+            rerun()
+
+    if "result_cache" not in st.session_state:
+        st.session_state.result_cache = ResultCache()
+    result_cache = st.session_state.result_cache
+
+    nash_mode = "log"
+    if method_internal == "nash_colab":
+        nash_exact = st.checkbox(
+            "정확한 정수 비교로 동률 판정",
+            key="nash_exact_mode",
+            help="곱을 소인수 지수로 정확히 비교합니다. 로그 비교보다 느리지만 아주 근소한 차이도 구분합니다."
+        )
+        nash_mode = "exact" if nash_exact else "log"
+
     scores_output = {}
     winners_list = []
-    df_column_name = "점수" 
+    result_table = None
 
-    if not votes_data_dict or not candidates_list:
+    if not votes_data or not candidates_list:
         st.error("투표 데이터 또는 후보 정보가 없습니다. 설정을 다시 확인해주세요.")
-    else:
+    elif method_internal == "compare_all":
         try:
-            if method_internal == "borda_colab":
-                scores_output, winners_list = calculate_borda_colab_style(votes_data_dict, candidates_list)
-                df_column_name = "보르다 순위합 (작을수록 좋음)"
-            elif method_internal == "bentham_colab":
-                scores_output, winners_list = calculate_bentham_colab_style(votes_data_dict, candidates_list)
-                df_column_name = "벤담 총점 (클수록 좋음)"
-            elif method_internal == "nash_colab":
-                scores_output, winners_list = calculate_nash_colab_style(votes_data_dict, candidates_list)
-                df_column_name = "내쉬 곱셈점수 (클수록 좋음)"
-            elif method_internal == "condorcet_colab":
-                scores_output, winners_list = calculate_condorcet_colab_style(votes_data_dict, candidates_list)
-                df_column_name = "콩도르세 Pairwise 승수 (1순위 기반)"
+            comparison = result_cache.get((method_internal, None), tally.version)
+            if comparison is None:
+                with METRICS.timer("voting_tally_seconds", method=method_internal):
+                    comparison = compare_all_methods(votes_data, candidates_list)
+                result_cache.put((method_internal, None), tally.version, comparison)
+
+            if comparison.disagreeing:
+                st.warning(f"방식에 따라 승자가 다릅니다: {', '.join(comparison.disagreeing)}")
             else:
-                st.error("선택된 투표 방식이 유효하지 않습니다.") # 혹시 모를 경우
-                scores_output, winners_list = {}, []
-
+                st.success("모든 방식의 승자가 같습니다.")
+
+            with METRICS.timer("voting_dataframe_seconds", method=method_internal):
+                winners_df = pd.DataFrame({
+                    "승자": [", ".join(w) if w else "(승자 없음)" for w in comparison.winners.values()],
+                    "다른 방식과 다름": ["⚠️" if m in comparison.disagreeing else "" for m in comparison.winners],
+                }, index=pd.Index(list(comparison.winners), name="방식"))
+                comparison_table = pd.DataFrame(
+                    {m: [scores.get(c) for c in candidates_list] for m, scores in comparison.scores.items()},
+                    index=pd.Index(candidates_list, name="후보")
+                )
+            st.markdown("#### 🏅 방식별 승자")
+            st.dataframe(winners_df, use_container_width=True)
+            st.markdown("#### 📋 방식별 점수")
+            st.caption("보르다는 순위합(작을수록 좋음), 내쉬는 곱셈점수 로그값, 콩도르세는 pairwise 승수, 슐체·랭크드 페어는 이긴 후보 수입니다.")
+            st.dataframe(comparison_table, use_container_width=True)
+        except Exception as e:
+            st.error(f"결과 계산 중 오류 발생 ({method_display}): {e}")
+            st.exception(e) # 개발 시 상세 오류 확인용
+    elif method_internal not in RESULT_COLUMN_NAMES:
+        st.error("선택된 투표 방식이 유효하지 않습니다.") # 혹시 모를 경우
+    else:
+        try:
+            # 투표가 바뀌지 않았으면 (방식, 투표 버전)으로 캐시된 결과를 그대로 사용 (투표 묶음도 같은 버전의 복사본)
+            result_key = (method_internal, nash_mode)
+            cached = result_cache.get(result_key, tally.version)
+            if cached is None:
+                source = patterns if method_internal == "instant_runoff" else votes_data
+                cached = compute_result(method_internal, source, candidates_list, nash_mode)
+                result_cache.put(result_key, tally.version, cached)
+            scores_output, winners_list, result_table = cached.scores, cached.winners, cached.table
 
             # --- 동률 처리 로직 강화 ---
             if winners_list:
@@ -665,38 +848,51 @@ elif st.session_state.stage == "result":
             else: 
                 st.error("결과를 계산할 수 없습니다. 투표 데이터를 확인해주세요.")
 
-            if isinstance(scores_output, dict) and scores_output:
-                df_data = [{"후보": c, df_column_name: s} for c, s in scores_output.items()]
-                if df_data:
-                    df = pd.DataFrame(df_data)
-                    ascending_sort = (method_internal == "borda_colab")
-                    try:
-                        df_sorted = df.sort_values(by=df_column_name, ascending=ascending_sort)
-                        st.dataframe(df_sorted.set_index("후보"), use_container_width=True)
-                    except KeyError: # df_column_name이 df에 없을 경우 (거의 발생 안 함)
-                        st.error(f"결과 표시 중 오류: '{df_column_name}' 컬럼을 찾을 수 없습니다.")
-                        st.dataframe(df.set_index("후보") if "후보" in df.columns else df, use_container_width=True) # 정렬 없이 표시
-                else:
-                    st.info("결과 데이터가 없습니다.")
+            if result_table is not None:
+                st.dataframe(result_table, use_container_width=True)
             elif not winners_list : # scores_output도 없고 winners_list도 없을때 (위에서 이미 처리되었을 수 있음)
                 st.info("계산된 점수 데이터가 없습니다.")
 
+            if method_internal == "instant_runoff" and cached.details is not None:
+                with st.expander("🔁 라운드별 탈락과 표 이양"):
+                    for k, irv_round in enumerate(cached.details.rounds, 1):
+                        if not irv_round.eliminated:
+                            continue
+                        moved = "; ".join(
+                            f"{loser} → " + (", ".join(f"{c} {n}표" for c, n in transfers.items()) or "없음")
+                            for loser, transfers in irv_round.transfers.items()
+                        )
+                        exhausted = f" (더 옮길 후보가 없는 표 {irv_round.exhausted}표)" if irv_round.exhausted else ""
+                        st.markdown(f"**{k}라운드** 탈락: {', '.join(irv_round.eliminated)} — {moved}{exhausted}")
+
 
         except Exception as e:
             st.error(f"결과 계산 중 오류 발생 ({method_display}): {e}")
             st.exception(e) # 개발 시 상세 오류 확인용
 
     st.markdown("---")
+    # 보관 파일은 버튼을 누를 때 만들어지므로 결과 화면을 그릴 때마다 선거 전체를 직렬화하지 않음
+    st.download_button(
+        "📦 투표 보관 파일 내려받기 (.vote)", st.session_state.election.archive_bytes,
+        file_name=f"{st.session_state.election_id}.vote", mime="application/octet-stream",
+        on_click="ignore", key="download_archive",
+        help="나중에 첫 화면의 '보관한 투표 파일 열기'로 다시 열어 다른 방식으로 집계할 수 있습니다."
+    )
     col1, col2 = st.columns(2)
     with col1:
         if st.button("⬅️ 다른 방식으로 결과 보기", key="back_to_method_select_from_result"):
             st.session_state.stage = "method_select"
-            st.rerun()
+            rerun()
     with col2:
         if st.button("🔄 처음부터 다시하기 (모든 데이터 초기화)", key="reset_all_from_result"):
-            # 세션 상태 초기화 (필요한 최소한의 것만 남기거나, 특정 키들만 삭제)
+            # 세션 상태 초기화 (저장소의 선거는 남아 있으므로 투표 ID로 다시 불러올 수 있음)
+            st.query_params.clear()
             for key in list(st.session_state.keys()):
                 if key not in ['rerun_count']: # Streamlit 내부 키나 유지하고 싶은 키 제외
                     del st.session_state[key]
             st.session_state.stage = "home" # stage는 home으로 재설정
-            st.rerun()
\ No newline at end of file
+            rerun()
+
+if DEBUG_PANEL or st.query_params.get("debug") == "1":
+    show_debug_panel()
+finish_stage()
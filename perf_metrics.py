@@ -0,0 +1,156 @@
+import bisect
+import os
+import threading
+import time
+from collections import deque
+
+# 지연 시간 히스토그램 구간 상한 (초, Prometheus 기본 구간과 비슷하게)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 디버그 패널의 분위수는 최근 이 개수의 측정값으로 계산
+ROLLING_SAMPLES = 512
+
+METRIC_HELP = {
+    "voting_stage_seconds": "Streamlit 한 번 실행(단계별)에 걸린 시간",
+    "voting_tally_seconds": "투표 방식 계산 함수 호출 시간",
+    "voting_dataframe_seconds": "결과표(DataFrame) 생성 시간",
+}
+
+
+class LatencyHistogram:
+    """
+    지연 시간 히스토그램 (스레드 안전):
+    - Prometheus 내보내기용 누적 구간 횟수/합계/개수와,
+      디버그 패널용 최근 ROLLING_SAMPLES개 측정값(분위수 계산)을 함께 보관.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, rolling_samples=ROLLING_SAMPLES):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1) # 마지막 칸은 +Inf
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=rolling_samples)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.recent.append(seconds)
+
+    def summary(self):
+        """최근 측정값의 {"count", "p50", "p95", "max"} (초)와 누적 개수."""
+        with self._lock:
+            recent = sorted(self.recent)
+            count = self.count
+        if not recent:
+            return {"count": count, "p50": None, "p95": None, "max": None}
+        return {
+            "count": count,
+            "p50": recent[(len(recent) - 1) // 2],
+            "p95": recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+            "max": recent[-1],
+        }
+
+
+class _Timer:
+    # with 문 또는 start()/stop()으로 쓰는 측정기 (stop은 여러 번 불러도 한 번만 기록)
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.started = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self.started is not None:
+            self.histogram.observe(time.perf_counter() - self.started)
+            self.started = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PerfMetrics:
+    """
+    (지표 이름, 라벨) → LatencyHistogram 모음:
+    - timer(이름, 라벨=값)으로 구간 시간을 재고, prometheus_text()로 텍스트 형식을 만듦.
+    - 프로세스 전체에서 하나(METRICS)를 공유하므로 모든 세션의 측정값이 모임.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def histogram(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def timer(self, name, **labels):
+        """with METRICS.timer("voting_tally_seconds", method="borda_colab"): ... 형태로 사용."""
+        return _Timer(self.histogram(name, **labels))
+
+    def summaries(self):
+        """[(지표 이름, 라벨 딕셔너리, 요약)]을 이름/라벨 순으로 반환."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+        return [(name, dict(labels), histogram.summary()) for (name, labels), histogram in items]
+
+    def prometheus_text(self):
+        """모든 히스토그램을 Prometheus 텍스트 형식(0.0.4)으로 변환."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+        lines = []
+        current_name = None
+        for (name, labels), histogram in items:
+            if name != current_name:
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                current_name = name
+            label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels)
+            prefix = label_text + "," if label_text else ""
+            with histogram._lock:
+                bucket_counts = list(histogram.bucket_counts)
+                count, total = histogram.count, histogram.total
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{name}_sum{suffix} {total!r}")
+            lines.append(f"{name}_count{suffix} {count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, min_interval=10.0):
+        """
+        Prometheus 텍스트 파일로 저장 (node_exporter textfile 수집기 등에서 읽음):
+        - 임시 파일에 쓴 뒤 이름을 바꾸므로 읽는 쪽이 반쯤 쓴 파일을 보지 않음.
+        - 마지막 저장 후 min_interval초가 지나지 않았으면 건너뜀.
+        """
+        now = time.monotonic()
+        if now - self._last_export < min_interval:
+            return False
+        self._last_export = now
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+        return True
+
+
+# 프로세스 전체에서 공유하는 측정값 (Streamlit은 실행마다 모듈을 다시 불러오지 않음)
+METRICS = PerfMetrics()
@@ -0,0 +1,45 @@
+from collections import OrderedDict, namedtuple
+
+# 결과 화면에 필요한 계산 결과 묶음 (점수 딕셔너리, 승자 목록, 정렬된 결과표, 방식별 추가 정보)
+# details: 즉석 결선의 라운드별 진행(IRVResult)처럼 결과표 아래에 따로 보여줄 내용 (없으면 None)
+CachedResult = namedtuple("CachedResult", ["scores", "winners", "table", "details"], defaults=(None,))
+
+
+class ResultCache:
+    """
+    (방식, 투표 버전) → 계산 결과 LRU 캐시:
+    - 투표 버전은 투표가 실제로 바뀔 때만 올라가므로(RunningTally.version),
+      다른 버전으로 조회/저장하면 이전 버전의 결과를 모두 버림.
+    - 같은 버전 안에서는 최근에 쓴 max_entries개 방식의 결과만 보관.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.version = None
+        self._entries = OrderedDict()
+
+    def _sync(self, version):
+        # 투표가 바뀌었으면 이전 결과를 전부 무효화
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def get(self, method_key, version):
+        """캐시된 CachedResult를 반환 (없으면 None)."""
+        self._sync(version)
+        entry = self._entries.get(method_key)
+        if entry is not None:
+            self._entries.move_to_end(method_key)
+        return entry
+
+    def put(self, method_key, version, result):
+        """계산 결과를 저장하고, 용량을 넘으면 가장 오래 안 쓴 결과부터 버림."""
+        self._sync(version)
+        self._entries[method_key] = result
+        self._entries.move_to_end(method_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def __len__(self):
+        return len(self._entries)
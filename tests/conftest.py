@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 저장소 루트(voting_tally, final.py)와 benchmarks 스크립트를 설치 없이 import 할 수 있게 경로에 추가
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,44 @@
+"""
+보관 파일 청크 집계 테스트: 청크 크기와 관계없이 메모리에 불러온 선거와 같은 집계·즉석 결선 결과가 나오는지 확인.
+"""
+import numpy as np
+import pytest
+
+from voting_tally import BallotStore, RunningTally
+from voting_tally.archive_tally import tally_archive
+from voting_tally.election_archive import write_archive
+from voting_tally.instant_runoff import instant_runoff
+from voting_tally.methods import instant_runoff_rounds
+
+
+@pytest.fixture
+def archive(tmp_path):
+    rng = np.random.default_rng(3)
+    n_voters, candidates = 997, list("ABCD")
+    # 선호 순서가 몇 가지뿐이라 청크마다 같은 순서가 반복됨
+    patterns = np.argsort(rng.random((6, len(candidates))), axis=1).astype(np.uint8) + 1
+    ranks = patterns[rng.integers(0, len(patterns), n_voters)]
+    scores = rng.integers(0, 11, ranks.shape, dtype=np.uint8)
+    store = BallotStore.from_arrays(candidates, [f"v{i}" for i in range(n_voters)], ranks, scores)
+    completed = rng.random(n_voters) < 0.8
+    path = tmp_path / "election.vote"
+    write_archive(path, "t", store, completed)
+    return path, candidates, ranks[completed], scores[completed]
+
+
+@pytest.mark.parametrize("chunk_rows", [None, 8, 64])
+def test_orders_match_loaded_election(archive, chunk_rows):
+    path, candidates, ranks, scores = archive
+    tally, (orders, counts) = tally_archive(path, chunk_rows, orders=True)
+    expected = RunningTally.from_arrays(candidates, ranks, scores)
+    assert (tally.pairwise_matrix() == expected.pairwise_matrix()).all()
+    assert counts.sum() == len(ranks)
+    # 같은 선호 순서는 청크를 넘어 한 줄로 합쳐짐
+    assert len(orders) == len(np.unique(ranks, axis=0))
+    loaded = BallotStore.from_arrays(candidates, [f"v{i}" for i in range(len(ranks))], ranks, scores)
+    assert instant_runoff(candidates, orders, counts) == instant_runoff_rounds(loaded, candidates)
+
+
+def test_orders_are_skipped_unless_requested(archive):
+    path = archive[0]
+    assert tally_archive(path, 64)[1] is None
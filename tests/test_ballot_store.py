@@ -0,0 +1,61 @@
+"""
+투표 저장소(BallotStore)의 지연 기본 투표 테스트: 순위 0은 '기록 전' 표시이고, 한 줄 읽기는 채우지 않으며,
+전체 행렬(ranks/scores)을 읽을 때만 남은 줄을 모두 채움.
+"""
+import numpy as np
+
+from voting_tally import BallotStore
+from voting_tally.ballot_store import DEFAULT_SCORE
+
+CANDIDATES = ["A", "B", "C"]
+DEFAULT_RANKS = [1, 2, 3]
+DEFAULT_SCORES = [DEFAULT_SCORE] * 3
+
+
+def test_new_voters_are_stored_as_rank_zero():
+    store = BallotStore(CANDIDATES, ["a", "b"])
+    ranks, scores = store.stored_arrays()
+    assert ranks.tolist() == [[0, 0, 0], [0, 0, 0]]
+    assert scores.tolist() == [[0, 0, 0], [0, 0, 0]]
+
+
+def test_row_returns_defaults_without_filling():
+    store = BallotStore(CANDIDATES, ["a", "b"])
+    ranks, scores = store.row(0)
+    assert ranks.tolist() == DEFAULT_RANKS and scores.tolist() == DEFAULT_SCORES
+    ranks[0] = 3 # 복사본이라 기본 투표나 저장소에 영향 없음
+    assert store.row(0)[0].tolist() == DEFAULT_RANKS
+    rows_ranks, _ = store.rows([0, 1])
+    assert rows_ranks.tolist() == [DEFAULT_RANKS, DEFAULT_RANKS]
+    assert store.stored_arrays()[0].tolist() == [[0, 0, 0], [0, 0, 0]]
+
+
+def test_set_row_writes_only_that_row():
+    store = BallotStore(CANDIDATES, ["a", "b"])
+    store.set_row(1, [3, 1, 2], [0, 10, 4])
+    assert store.stored_arrays()[0].tolist() == [[0, 0, 0], [3, 1, 2]]
+    assert store.row(1)[0].tolist() == [3, 1, 2]
+    # 일부 후보만 고치면 그 줄만 기본 투표로 먼저 채움
+    store.set_scores("a", {"B": 9})
+    assert store.stored_arrays()[1].tolist() == [[5, 9, 5], [0, 10, 4]]
+
+
+def test_full_matrix_read_fills_pending_rows():
+    ranks = np.array([[0, 0, 0], [2, 1, 3], [0, 0, 0]], dtype=np.uint8)
+    scores = np.array([[0, 0, 0], [7, 8, 9], [0, 0, 0]], dtype=np.uint8)
+    store = BallotStore.from_arrays(CANDIDATES, ["a", "b", "c"], ranks, scores)
+    assert store.stored_arrays()[0][0].tolist() == [0, 0, 0]
+    assert store.ranks.tolist() == [DEFAULT_RANKS, [2, 1, 3], DEFAULT_RANKS]
+    # ranks를 읽는 것만으로 저장소(여기서는 넘겨준 행렬 자체)가 바뀜
+    assert ranks.tolist() == [DEFAULT_RANKS, [2, 1, 3], DEFAULT_RANKS]
+    assert store.scores.tolist() == [DEFAULT_SCORES, [7, 8, 9], DEFAULT_SCORES]
+    assert not store._defaults_pending
+
+
+def test_appended_voters_after_fill_are_pending_again():
+    store = BallotStore(CANDIDATES, ["a"])
+    store.ranks
+    store.add_voters(["b"])
+    assert store.stored_arrays()[0].tolist() == [DEFAULT_RANKS, [0, 0, 0]]
+    assert store.row(1)[0].tolist() == DEFAULT_RANKS
+    assert store.ranks.tolist() == [DEFAULT_RANKS, DEFAULT_RANKS]
@@ -0,0 +1,100 @@
+"""
+슐체 / 랭크드 페어 방식 테스트 (위키백과의 대표 예시와 순환·동률 처리).
+"""
+import numpy as np
+import pytest
+
+from voting_tally import BallotStore, RunningTally, calculate_ranked_pairs, calculate_schulze
+from voting_tally.ballot_store import ranked_pairs_lock, schulze_strengths
+
+
+def profile_store(candidates, profile):
+    """[(표 수, "선호 순서 문자열"), ...]를 BallotStore로 변환 (문자열의 글자 = 후보 이름, 앞이 1순위)."""
+    ranks = []
+    for count, order in profile:
+        ranks += [[order.index(c) + 1 for c in candidates]] * count
+    ranks = np.array(ranks, dtype=np.uint8)
+    voters = [f"v{i}" for i in range(len(ranks))]
+    return BallotStore.from_arrays(candidates, voters, ranks, np.full(ranks.shape, 5, dtype=np.uint8))
+
+
+# 위키백과 "Schulze method" 예시 (투표자 45명, 후보 5명)
+SCHULZE_CANDIDATES = list("ABCDE")
+SCHULZE_PROFILE = [
+    (5, "ACBED"), (5, "ADECB"), (8, "BEDAC"), (3, "CABED"),
+    (7, "CAEBD"), (2, "CBADE"), (7, "DCEBA"), (8, "EBADC"),
+]
+# 위키백과 "Ranked pairs" 예시 (테네시 주도 선정, 유권자 100명 비율)
+TENNESSEE_CANDIDATES = ["M", "N", "C", "K"]
+TENNESSEE_PROFILE = [(42, "MNCK"), (26, "NCKM"), (15, "CKNM"), (17, "KCNM")]
+
+
+def test_schulze_wikipedia_strongest_paths():
+    store = profile_store(SCHULZE_CANDIDATES, SCHULZE_PROFILE)
+    strengths = schulze_strengths(store.pairwise_matrix())
+    assert strengths.tolist() == [
+        [0, 28, 28, 30, 24],
+        [25, 0, 28, 33, 24],
+        [25, 29, 0, 29, 24],
+        [25, 28, 28, 0, 24],
+        [25, 28, 28, 31, 0],
+    ]
+
+
+def test_schulze_wikipedia_winner_and_order():
+    store = profile_store(SCHULZE_CANDIDATES, SCHULZE_PROFILE)
+    wins, winners = calculate_schulze(store, SCHULZE_CANDIDATES)
+    assert winners == ["E"]
+    # 순서 E > A > C > B > D
+    assert wins == {"E": 4, "A": 3, "C": 2, "B": 1, "D": 0}
+
+
+def test_ranked_pairs_wikipedia_tennessee():
+    store = profile_store(TENNESSEE_CANDIDATES, TENNESSEE_PROFILE)
+    wins, winners = calculate_ranked_pairs(store, TENNESSEE_CANDIDATES)
+    assert winners == ["N"]
+    assert wins == {"N": 3, "C": 2, "K": 1, "M": 0}
+    assert calculate_schulze(store, TENNESSEE_CANDIDATES)[1] == ["N"]
+
+
+def test_cycle_is_broken_at_the_weakest_defeat():
+    # A>B (6:3), B>C (7:2), C>A (5:4) 순환: 가장 작은 차이인 C>A를 버림
+    candidates = list("ABC")
+    store = profile_store(candidates, [(4, "ABC"), (3, "BCA"), (2, "CAB")])
+    locked, reach = ranked_pairs_lock(store.pairwise_matrix())
+    assert locked.tolist() == [[False, True, False], [False, False, True], [False, False, False]]
+    assert reach.tolist() == [2, 1, 0]
+    assert calculate_ranked_pairs(store, candidates)[1] == ["A"]
+    assert calculate_schulze(store, candidates)[1] == ["A"]
+
+
+def test_perfect_cycle_ties():
+    # 모든 대결이 2:1인 완전 순환: 슐체는 세 후보 모두 동률, 랭크드 페어는 후보 순서로 간선을 잠가 A가 승리
+    candidates = list("ABC")
+    store = profile_store(candidates, [(1, "ABC"), (1, "BCA"), (1, "CAB")])
+    assert calculate_schulze(store, candidates)[1] == ["A", "B", "C"]
+    assert calculate_ranked_pairs(store, candidates)[1] == ["A"]
+
+
+def test_pairwise_tie_has_no_edges():
+    candidates = ["A", "B"]
+    store = profile_store(candidates, [(1, "AB"), (1, "BA")])
+    assert calculate_schulze(store, candidates) == ({"A": 0, "B": 0}, ["A", "B"])
+    assert calculate_ranked_pairs(store, candidates) == ({"A": 0, "B": 0}, ["A", "B"])
+
+
+@pytest.mark.parametrize("method", [calculate_schulze, calculate_ranked_pairs])
+def test_same_result_for_every_source(method):
+    store = profile_store(SCHULZE_CANDIDATES, SCHULZE_PROFILE)
+    votes = {voter: store.ballot(voter) for voter in store.voters}
+    expected = method(store, SCHULZE_CANDIDATES)
+    assert method(votes, SCHULZE_CANDIDATES) == expected
+    assert method(RunningTally.from_store(store), SCHULZE_CANDIDATES) == expected
+
+
+def test_candidate_order_does_not_change_winner():
+    # 표 차이가 모두 다른 프로필이면 후보 순서를 바꿔 넘겨도 같은 승자 (같으면 후보 순서가 동률 처리 기준)
+    store = profile_store(SCHULZE_CANDIDATES, SCHULZE_PROFILE)
+    assert calculate_schulze(store, SCHULZE_CANDIDATES[::-1])[1] == ["E"]
+    store = profile_store(TENNESSEE_CANDIDATES, TENNESSEE_PROFILE)
+    assert calculate_ranked_pairs(store, TENNESSEE_CANDIDATES[::-1])[1] == ["N"]
@@ -0,0 +1,71 @@
+"""
+선거 저장소 테스트: 파일에서 불러온 선거를 스냅샷 하나로 저장하고, 이후 변경분과 합쳐 그대로 복원하는지 확인.
+"""
+import numpy as np
+import pytest
+
+from voting_tally import BallotStore
+from voting_tally.election_store import ElectionStore
+from voting_tally.shared_election import ElectionHub
+
+
+@pytest.fixture
+def election_store(tmp_path):
+    return ElectionStore(str(tmp_path / "voting.db"))
+
+
+def make_store(n_voters=300, n_candidates=4, seed=0):
+    rng = np.random.default_rng(seed)
+    ranks = np.argsort(rng.random((n_voters, n_candidates)), axis=1).astype(np.uint8) + 1
+    scores = rng.integers(0, 11, (n_voters, n_candidates), dtype=np.uint8)
+    candidates = [f"c{i}" for i in range(n_candidates)]
+    return BallotStore.from_arrays(candidates, [f"v{i}" for i in range(n_voters)], ranks, scores)
+
+
+def voter_rows(election_store, election_id):
+    return election_store._connect().execute(
+        "SELECT COUNT(*) FROM voters WHERE election_id = ?", (election_id,)
+    ).fetchone()[0]
+
+
+def test_save_store_writes_only_the_snapshot(election_store):
+    store = make_store()
+    completed = np.arange(len(store)) % 3 != 0
+    election_id = election_store.create_election("t", store.candidates, store.voters)
+    election_store.save_store(election_id, store, completed)
+    assert voter_rows(election_store, election_id) == 0
+
+    title, _, loaded, loaded_completed, _ = election_store.load_election(election_id)
+    assert title == "t"
+    assert (loaded_completed == completed).all()
+    assert (loaded.ranks[completed] == store.ranks[completed]).all()
+    assert (loaded.scores[completed] == store.scores[completed]).all()
+
+
+def test_changes_after_snapshot_are_restored(election_store):
+    store = make_store()
+    completed = np.ones(len(store), dtype=bool)
+    election = ElectionHub(election_store).create("t", store, completed)
+    # 스냅샷에만 있던 투표자의 취소와 새 투표
+    election.withdraw(5)
+    election.submit(7, np.array([4, 3, 2, 1], dtype=np.uint8), np.array([0, 1, 2, 3], dtype=np.uint8))
+    assert voter_rows(election_store, election.election_id) == 2
+
+    reloaded = ElectionHub(election_store).get(election.election_id)
+    assert (reloaded.roster.completed_mask() == election.roster.completed_mask()).all()
+    assert reloaded.ballot(7)[0].tolist() == [4, 3, 2, 1]
+    assert (reloaded.tally_snapshot().pairwise_matrix() == election.tally_snapshot().pairwise_matrix()).all()
+    assert election_store.load_election(election.election_id)[3].sum() == len(store) - 1
+
+
+def test_patterns_are_built_on_first_use(election_store):
+    store = make_store(n_voters=50)
+    completed = np.ones(len(store), dtype=bool)
+    election = ElectionHub(election_store).create("t", store, completed)
+    assert election.patterns is None
+    election.submit(0, np.array([1, 2, 3, 4], dtype=np.uint8), np.array([5, 5, 5, 5], dtype=np.uint8))
+    assert election.patterns is None
+    patterns = election.patterns_snapshot()
+    assert int(patterns.counts.sum()) == len(store)
+    election.withdraw(0)
+    assert int(election.patterns_snapshot().counts.sum()) == len(store) - 1
@@ -0,0 +1,29 @@
+"""
+시작 시간(import) 예산 회귀 테스트 (benchmarks/import_budget.py 와 같은 측정):
+- 모듈별 누적 import 시간, import 시 따라 올라오면 안 되는 무거운 모듈, final.py 첫 화면 실행을 확인.
+"""
+import pytest
+
+import import_budget
+
+
+@pytest.mark.parametrize("module, budget", sorted(import_budget.IMPORT_BUDGET_MS.items()))
+def test_import_time_within_budget(module, budget):
+    # 디스크 캐시 등의 잡음을 줄이려고 세 번 재서 가장 빠른 값을 사용
+    elapsed = min(import_budget.cumulative_import_ms(module) for _ in range(3))
+    assert elapsed <= budget, f"import {module}: {elapsed:.1f}ms (예산 {budget}ms)"
+
+
+@pytest.mark.parametrize("module, forbidden", sorted(import_budget.FORBIDDEN_ON_IMPORT.items()))
+def test_import_does_not_load_heavy_modules(module, forbidden):
+    leaked = sorted(set(forbidden) & import_budget.loaded_modules(module))
+    assert not leaked, f"import {module} 이 {', '.join(leaked)} 을(를) 불러옵니다."
+
+
+def test_home_screen_is_light():
+    pytest.importorskip("streamlit")
+    home = import_budget.home_screen_probe()
+    assert not home["exception"]
+    leaked = sorted(set(import_budget.FORBIDDEN_ON_HOME) & set(home["modules"]))
+    assert not leaked, f"final.py 첫 화면이 {', '.join(leaked)} 을(를) 불러옵니다."
+    assert home["ms"] <= import_budget.HOME_RUN_BUDGET_MS
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from voting_tally.ingest_server import ElectionInfo, ballot_arrays
+
+INFO = ElectionInfo(["피자", "햄버거"], {"홍길동": 0}, np.uint8)
+RANK = {"피자": 1, "햄버거": 2}
+SCORE = {"피자": 9, "햄버거": 4}
+
+
+def test_valid_ballot():
+    row, ranks, scores = ballot_arrays(INFO, {"voter": "홍길동", "rank": RANK, "score": SCORE})
+    assert row == 0
+    assert ranks.tolist() == [1, 2] and scores.tolist() == [9, 4]
+
+
+@pytest.mark.parametrize("voter", [["홍길동"], {"name": "홍길동"}, None, 3])
+def test_non_string_voter_is_a_validation_error(voter):
+    with pytest.raises(ValueError):
+        ballot_arrays(INFO, {"voter": voter, "rank": RANK, "score": SCORE})
+
+
+@pytest.mark.parametrize("ballot", [
+    {"voter": "김영희", "rank": RANK, "score": SCORE},
+    {"voter": "홍길동", "rank": {"피자": 1, "햄버거": 1}, "score": SCORE},
+    {"voter": "홍길동", "rank": RANK, "score": {"피자": 11, "햄버거": 4}},
+    {"voter": "홍길동", "rank": {"피자": 1}, "score": SCORE},
+    {"voter": "홍길동", "rank": RANK, "score": {"피자": True, "햄버거": 4}},
+])
+def test_invalid_ballots(ballot):
+    with pytest.raises(ValueError):
+        ballot_arrays(INFO, ballot)
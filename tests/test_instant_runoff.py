@@ -0,0 +1,105 @@
+"""
+즉석 결선 투표(IRV) 테스트 (라운드 진행, 최소 득표 동률의 동시 탈락, 소진된 표).
+"""
+import numpy as np
+import pytest
+
+from voting_tally import BallotStore, RunningTally
+from voting_tally.ballot_patterns import BallotPatterns
+from voting_tally.instant_runoff import instant_runoff, last_round_counts
+from voting_tally.methods import calculate_instant_runoff, instant_runoff_rounds
+
+
+def profile_orders(candidates, profile):
+    """[(표 수, "선호 순서 문자열"), ...]를 (선호 순서 행렬, 표 수)로 변환 (문자열 길이가 적은 선호 수)."""
+    orders = np.array([[candidates.index(c) for c in order] for _, order in profile], dtype=np.uint8)
+    return orders, np.array([count for count, _ in profile])
+
+
+def profile_store(candidates, profile):
+    ranks = []
+    for count, order in profile:
+        ranks += [[order.index(c) + 1 for c in candidates]] * count
+    ranks = np.array(ranks, dtype=np.uint8)
+    voters = [f"v{i}" for i in range(len(ranks))]
+    return BallotStore.from_arrays(candidates, voters, ranks, np.full(ranks.shape, 5, dtype=np.uint8))
+
+
+# 위키백과 "Instant-runoff voting" 테네시 예시: 채터누가 → 내슈빌 순으로 탈락, 녹스빌 당선
+TENNESSEE_CANDIDATES = ["M", "N", "C", "K"]
+TENNESSEE_PROFILE = [(42, "MNCK"), (26, "NCKM"), (15, "CKNM"), (17, "KCNM")]
+
+
+def test_first_round_majority():
+    candidates = list("ABC")
+    result = instant_runoff(candidates, *profile_orders(candidates, [(3, "ABC"), (1, "BAC"), (1, "CBA")]))
+    assert result.winners == ["A"]
+    assert len(result.rounds) == 1
+    assert result.rounds[0].counts == {"A": 3, "B": 1, "C": 1}
+
+
+def test_tennessee_rounds():
+    store = profile_store(TENNESSEE_CANDIDATES, TENNESSEE_PROFILE)
+    result = instant_runoff_rounds(store, TENNESSEE_CANDIDATES)
+    assert result.winners == ["K"]
+    assert [r.counts for r in result.rounds] == [
+        {"M": 42, "N": 26, "C": 15, "K": 17},
+        {"M": 42, "N": 26, "K": 32},
+        {"M": 42, "K": 58},
+    ]
+    assert [r.eliminated for r in result.rounds] == [["C"], ["N"], []]
+    # 내슈빌 표는 이미 탈락한 채터누가를 건너뛰고 녹스빌로 이동
+    assert result.rounds[1].transfers == {"N": {"K": 26}}
+    assert calculate_instant_runoff(store, TENNESSEE_CANDIDATES) == (
+        {"M": 42, "N": 26, "C": 15, "K": 58}, ["K"],
+    )
+
+
+def test_tied_lowest_candidates_are_eliminated_together():
+    candidates = list("ABCD")
+    profile = [(6, "ABCD"), (5, "BACD"), (2, "CBAD"), (2, "DABC")]
+    result = instant_runoff(candidates, *profile_orders(candidates, profile))
+    first = result.rounds[0]
+    assert first.eliminated == ["C", "D"]
+    assert first.transfers == {"C": {"B": 2}, "D": {"A": 2}}
+    assert first.exhausted == 0
+    assert result.rounds[1].counts == {"A": 8, "B": 7}
+    assert result.winners == ["A"]
+    assert len(result.rounds) == 2
+
+
+def test_truncated_ballots_are_exhausted():
+    # 선호를 두 명까지만 적은 투표: 적은 후보가 모두 탈락하면 소진되고 과반 기준에서 빠짐
+    candidates = list("ABCD")
+    profile = [(5, "AB"), (4, "BA"), (2, "CD"), (1, "DC")]
+    result = instant_runoff(candidates, *profile_orders(candidates, profile))
+    assert [r.eliminated for r in result.rounds] == [["D"], ["C"], []]
+    assert result.rounds[0].transfers == {"D": {"C": 1}}
+    assert result.rounds[1].transfers == {"C": {}}
+    assert [r.exhausted for r in result.rounds] == [0, 3, 0]
+    # 남은 유효표 9표 중 5표로 과반
+    assert result.rounds[2].counts == {"A": 5, "B": 4}
+    assert result.winners == ["A"]
+
+
+def test_all_remaining_tied_win_together():
+    candidates = list("AB")
+    result = instant_runoff(candidates, *profile_orders(candidates, [(1, "AB"), (1, "BA")]))
+    assert result.winners == ["A", "B"]
+    assert len(result.rounds) == 1
+    assert last_round_counts(result, candidates) == {"A": 1, "B": 1}
+
+
+def test_same_result_for_every_source():
+    store = profile_store(TENNESSEE_CANDIDATES, TENNESSEE_PROFILE)
+    votes = {voter: store.ballot(voter) for voter in store.voters}
+    patterns = BallotPatterns.from_arrays(TENNESSEE_CANDIDATES, *store.stored_arrays())
+    expected = calculate_instant_runoff(store, TENNESSEE_CANDIDATES)
+    assert calculate_instant_runoff(votes, TENNESSEE_CANDIDATES) == expected
+    assert calculate_instant_runoff(patterns, TENNESSEE_CANDIDATES) == expected
+
+
+def test_running_tally_is_rejected():
+    store = profile_store(TENNESSEE_CANDIDATES, TENNESSEE_PROFILE)
+    with pytest.raises(ValueError):
+        instant_runoff_rounds(RunningTally.from_store(store), TENNESSEE_CANDIDATES)
@@ -0,0 +1,41 @@
+"""
+내쉬(Colab) 정확 비교 테스트: 로그 비교의 허용 오차 안에 들어가는 근소한 곱 차이를 exact 모드가 구분하는지 확인.
+"""
+import numpy as np
+import pytest
+
+from voting_tally import RunningTally
+from voting_tally.ballot_store import MAX_SCORE, nash_exact_winners, nash_log_sums, nash_log_winners
+from voting_tally.methods import calculate_nash_colab_style
+
+
+def near_tie_tally(n_common=10 ** 11):
+    # A의 곱 = 10^n × 9 × 9 × 1 = 81 × 10^n, B의 곱 = 10^n × 8 × 2 × 5 = 80 × 10^n
+    # log 차이 log(81/80) ≈ 0.012 는 허용 오차 1e-12 × |log 곱| (≈ 0.23)보다 작아 로그 비교로는 동률
+    ranks = np.array([[1, 2]] * 4, dtype=np.uint8)
+    scores = np.array([[10, 10], [9, 8], [9, 2], [1, 5]], dtype=np.uint8)
+    tally = RunningTally(["A", "B"])
+    tally.add_arrays(ranks, scores, np.array([n_common, 1, 1, 1], dtype=np.int64))
+    return tally
+
+
+def test_exact_mode_separates_log_tie():
+    tally = near_tie_tally()
+    assert calculate_nash_colab_style(tally, ["A", "B"])[1] == ["A", "B"]
+    assert calculate_nash_colab_style(tally, ["A", "B"], mode="exact")[1] == ["A"]
+
+
+def test_exact_winners_on_counts():
+    counts = near_tie_tally().score_counts()
+    assert nash_log_winners(nash_log_sums(counts)) == [0, 1]
+    assert nash_exact_winners(counts) == [0]
+    # 소인수 지수가 같으면 (곱이 정확히 같으면) exact 모드도 동률: 6 × 1 과 2 × 3
+    equal = np.zeros((2, MAX_SCORE + 1), dtype=np.int64)
+    equal[0, [6, 1]] = 1
+    equal[1, [2, 3]] = 1
+    assert nash_exact_winners(equal) == [0, 1]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        calculate_nash_colab_style(near_tie_tally(), ["A", "B"], mode="float")
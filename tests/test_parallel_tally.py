@@ -0,0 +1,24 @@
+"""
+병렬 집계 테스트: 샤드로 나눠 프로세스 풀에서 집계해도 한 번에 집계한 것과 같은지 확인 (입력 dtype과 관계없이).
+"""
+import numpy as np
+import pytest
+
+from voting_tally import RunningTally
+from voting_tally.parallel_tally import parallel_tally
+
+AGGREGATES = ("rank_sums", "score_sums", "score_counts", "first_choice_counts", "pairwise_matrix")
+
+
+@pytest.mark.parametrize("score_dtype", [np.uint8, np.int64])
+@pytest.mark.parametrize("rank_dtype", [np.uint8, np.int32])
+def test_parallel_matches_single_process(rank_dtype, score_dtype):
+    rng = np.random.default_rng(7)
+    candidates = list("ABCDE")
+    ranks = (np.argsort(rng.random((1001, len(candidates))), axis=1) + 1).astype(rank_dtype)
+    scores = rng.integers(0, 11, ranks.shape).astype(score_dtype)
+    expected = RunningTally.from_arrays(candidates, ranks, scores)
+    tally = parallel_tally(candidates, ranks, scores, workers=2, min_rows=1)
+    assert len(tally) == len(expected)
+    for name in AGGREGATES:
+        assert (getattr(tally, name)() == getattr(expected, name)()).all(), name
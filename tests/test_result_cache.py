@@ -0,0 +1,32 @@
+"""
+결과 캐시(ResultCache) 테스트: 같은 투표 버전 안의 LRU 제거와 버전이 바뀔 때의 무효화.
+"""
+from result_cache import CachedResult, ResultCache
+
+
+def result(name):
+    return CachedResult({name: 1}, [name], None)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.put("borda", 1, result("borda"))
+    cache.put("nash", 1, result("nash"))
+    assert cache.get("borda", 1).winners == ["borda"] # borda를 최근 사용으로 갱신
+    cache.put("schulze", 1, result("schulze"))
+    assert len(cache) == 2
+    assert cache.get("nash", 1) is None
+    assert cache.get("borda", 1) is not None
+    assert cache.get("schulze", 1) is not None
+
+
+def test_version_change_clears_entries():
+    cache = ResultCache()
+    cache.put("borda", 1, result("borda"))
+    cache.put("nash", 1, result("nash"))
+    assert cache.get("borda", 2) is None
+    assert len(cache) == 0
+    # 이전 버전으로 다시 조회해도 버린 결과는 돌아오지 않음
+    assert cache.get("nash", 1) is None
+    cache.put("borda", 3, result("borda"))
+    assert cache.get("borda", 3).winners == ["borda"]
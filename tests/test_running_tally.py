@@ -0,0 +1,82 @@
+"""
+누적 집계(RunningTally) 테스트: 더하고 빼기·합치기·복사가 한 번에 집계한 값과 맞고, version은 실제 변경에만 오르는지 확인.
+"""
+import numpy as np
+import pytest
+
+from voting_tally import BallotStore, RunningTally
+from voting_tally.shared_election import ElectionHub
+
+AGGREGATES = ("rank_sums", "score_sums", "score_counts", "first_choice_counts", "pairwise_matrix")
+CANDIDATES = list("ABCD")
+
+
+def random_ballots(n_voters, seed=0):
+    rng = np.random.default_rng(seed)
+    ranks = (np.argsort(rng.random((n_voters, len(CANDIDATES))), axis=1) + 1).astype(np.uint8)
+    scores = rng.integers(0, 11, ranks.shape, dtype=np.uint8)
+    return ranks, scores
+
+
+def snapshot(tally):
+    return len(tally), {name: getattr(tally, name)().tolist() for name in AGGREGATES}
+
+
+def test_add_then_remove_restores_aggregates():
+    ranks, scores = random_ballots(50)
+    tally = RunningTally.from_arrays(CANDIDATES, ranks, scores)
+    before = snapshot(tally)
+    extra_ranks, extra_scores = random_ballots(5, seed=1)
+    for r, s in zip(extra_ranks, extra_scores):
+        tally.add(r, s)
+    assert snapshot(tally) == snapshot(
+        RunningTally.from_arrays(CANDIDATES, np.vstack([ranks, extra_ranks]), np.vstack([scores, extra_scores]))
+    )
+    for r, s in zip(extra_ranks, extra_scores):
+        tally.remove(r, s)
+    assert snapshot(tally) == before
+
+
+def test_merge_equals_single_tally():
+    ranks, scores = random_ballots(100)
+    merged = RunningTally.from_arrays(CANDIDATES, ranks[:30], scores[:30])
+    merged.merge(RunningTally.from_arrays(CANDIDATES, ranks[30:], scores[30:]))
+    assert snapshot(merged) == snapshot(RunningTally.from_arrays(CANDIDATES, ranks, scores))
+    with pytest.raises(ValueError):
+        merged.merge(RunningTally(list("ABCE")))
+
+
+def test_copy_is_independent():
+    ranks, scores = random_ballots(20)
+    tally = RunningTally.from_arrays(CANDIDATES, ranks, scores)
+    copied = tally.copy()
+    assert copied.version == tally.version and snapshot(copied) == snapshot(tally)
+    tally.add(ranks[0], scores[0])
+    assert len(copied) == 20 and snapshot(copied) != snapshot(tally)
+
+
+def test_version_changes_only_on_edits():
+    ranks, scores = random_ballots(10)
+    tally = RunningTally(CANDIDATES)
+    version = tally.version
+    # 읽기와 빈 투표 묶음 반영은 버전을 올리지 않음
+    snapshot(tally)
+    tally.add_arrays(ranks[:0], scores[:0])
+    assert tally.version == version
+    tally.add(ranks[0], scores[0])
+    assert tally.version > version
+    version = tally.version
+    tally.remove(ranks[0], scores[0])
+    assert tally.version > version
+
+
+def test_shared_election_version_ignores_noop_withdraw():
+    ranks, scores = random_ballots(3)
+    store = BallotStore.from_arrays(CANDIDATES, ["a", "b", "c"], ranks, scores)
+    election = ElectionHub().create("t", store, np.array([True, True, False]))
+    version = election.tally_snapshot().version
+    election.withdraw(2) # 제출하지 않은 투표자
+    election.tally_snapshot()
+    assert election.tally_snapshot().version == version
+    election.withdraw(0)
+    assert election.tally_snapshot().version > version
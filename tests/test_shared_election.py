@@ -0,0 +1,31 @@
+"""
+여러 세션이 함께 쓰는 선거 테스트: 결과 계산용 복사본이 제출과 섞이지 않는지 확인.
+"""
+import threading
+
+import numpy as np
+
+from voting_tally import BallotStore
+from voting_tally.shared_election import ElectionHub
+
+
+def test_result_snapshot_is_consistent_during_submissions():
+    n_voters, candidates = 400, list("ABC")
+    store = BallotStore(candidates, [f"v{i}" for i in range(n_voters)])
+    election = ElectionHub().create("t", store, np.zeros(n_voters, dtype=bool))
+    election.patterns_snapshot() # 투표 묶음을 만들어 두고 이후 제출마다 함께 갱신
+
+    def submit_all():
+        rng = np.random.default_rng(0)
+        for row in range(n_voters):
+            election.submit(row, np.argsort(rng.random(3)).astype(np.uint8) + 1, np.full(3, 5, dtype=np.uint8))
+
+    writer = threading.Thread(target=submit_all)
+    writer.start()
+    while writer.is_alive():
+        tally, patterns = election.result_snapshot(with_patterns=True)
+        assert len(tally) == len(patterns)
+    writer.join()
+    tally, patterns = election.result_snapshot(with_patterns=True)
+    assert len(tally) == len(patterns) == n_voters
+    assert election.result_snapshot()[1] is None
@@ -0,0 +1,40 @@
+"""
+투표자 명단 색인(VoterRoster) 테스트: 제출·취소 뒤의 개수와 페이지가 전체를 다시 훑은 결과와 같은지 확인.
+"""
+import numpy as np
+import pytest
+
+from voting_tally.voter_roster import VoterRoster
+
+
+def expected_page(completed, want, page, page_size):
+    return np.flatnonzero(completed == want)[page * page_size:(page + 1) * page_size].tolist()
+
+
+@pytest.mark.parametrize("n_voters", [0, 1, 7, 64, 1000])
+def test_pages_follow_marks(n_voters):
+    rng = np.random.default_rng(n_voters)
+    completed = rng.random(n_voters) < 0.3
+    roster = VoterRoster([f"voter{i}" for i in range(n_voters)], completed)
+    for index in rng.integers(0, max(n_voters, 1), size=200 if n_voters else 0):
+        want = not completed[index]
+        assert roster.mark(int(index), want)
+        assert not roster.mark(int(index), want)
+        completed[index] = want
+        assert roster.n_completed == completed.sum()
+        assert roster.n_remaining == n_voters - completed.sum()
+    for want in (False, True):
+        assert roster.count(want) == np.count_nonzero(completed == want)
+        assert roster.indices(want) == np.flatnonzero(completed == want).tolist()
+        for page_size in (1, 3, 50):
+            for page in range(n_voters // page_size + 2):
+                assert roster.page(want, page=page, page_size=page_size) == expected_page(completed, want, page, page_size)
+    assert (roster.completed_mask() == completed).all()
+
+
+def test_search_pages_by_completion():
+    roster = VoterRoster(["Kim", "Lee", "Park", "kimura", "Akim"], [False, True, False, True, False])
+    assert roster.search("kim") == [0, 3, 4]
+    assert roster.page(False, "kim") == [0, 4]
+    assert roster.page(True, "kim") == [3]
+    assert roster.count(False, "kim") == 2
@@ -1,5 +1,5 @@
 import streamlit as st
-from collections import defaultdict
+from voting_tally import BallotStore, calculate_bentham, calculate_borda, calculate_condorcet, calculate_nash
 
 # CSS 스타일 정의
 page_bg = """
@@ -40,57 +40,6 @@ h1.title {
 # CSS를 모든 페이지에 적용
 st.markdown(page_bg, unsafe_allow_html=True)
 
-# 투표 계산 함수들
-def calculate_borda(votes, candidates):
-    scores = {c: 0 for c in candidates}
-    for vote in votes.values():
-        for c, s in vote['score'].items():
-            scores[c] += s
-    max_score = max(scores.values())
-    winners = [c for c, s in scores.items() if s == max_score]
-    return scores, winners
-
-def calculate_bentham(votes, candidates):
-    scores = {c: 0 for c in candidates}
-    for vote in votes.values():
-        for c, s in vote['score'].items():
-            scores[c] += s
-    total = sum(scores.values())
-    util = {c: round((v / total) * 100, 2) if total > 0 else 0 for c, v in scores.items()}
-    max_util = max(util.values())
-    winners = [c for c, u in util.items() if u == max_util]
-    return util, winners
-
-def calculate_nash(votes, candidates):
-    min_scores = {c: float('inf') for c in candidates}
-    for vote in votes.values():
-        for c, s in vote['score'].items():
-            if s < min_scores[c]:
-                min_scores[c] = s
-    max_min_score = max(min_scores.values())
-    winners = [c for c, s in min_scores.items() if s == max_min_score]
-    return min_scores, winners
-
-def calculate_condorcet(votes, candidates):
-    wins = {c: 0 for c in candidates}
-    for i in range(len(candidates)):
-        for j in range(i + 1, len(candidates)):
-            a, b = candidates[i], candidates[j]
-            a_wins, b_wins = 0, 0
-            for vote in votes.values():
-                rank = vote['rank']
-                if rank[a] < rank[b]:
-                    a_wins += 1
-                elif rank[b] < rank[a]:
-                    b_wins += 1
-            if a_wins > b_wins:
-                wins[a] += 1
-            elif b_wins > a_wins:
-                wins[b] += 1
-    max_wins = max(wins.values())
-    winners = [c for c, w in wins.items() if w == max_wins]
-    return wins, winners
-
 if st.session_state.stage == "home":
     # 스타일 정의
     page_bg = """
@@ -205,7 +154,7 @@ elif st.session_state.stage == "setup":
         else:
             st.session_state.candidates = candidates
             st.session_state.voters = voters
-            st.session_state.votes = {voter: {} for voter in voters}
+            st.session_state.votes = BallotStore(candidates, voters)
             st.session_state.completed = {voter: False for voter in voters}
             st.session_state.stage = "vote_select"
             st.rerun()
@@ -244,7 +193,7 @@ elif st.session_state.stage == "vote_input":
         if len(set(selected_ranks)) != len(selected_ranks):
             st.error("각 후보는 고유한 순위를 가져야 합니다. 중복된 순위를 수정해주세요.")
         else:
-            st.session_state.votes[voter]['rank'] = ranks
+            st.session_state.votes.set_ranks(voter, ranks)
             st.session_state.stage = "score_input"
             st.rerun()
 
@@ -265,12 +214,12 @@ elif st.session_state.stage == "score_input":
         if len(set(selected_scores)) < len(selected_scores):
             st.warning("중복된 점수가 있습니다. 벤담 방식에서는 괜찮지만, 다른 방식에서 결과가 왜곡될 수 있습니다. 계속 진행하시겠습니까?")
             if st.button("계속 진행"):
-                st.session_state.votes[voter]['score'] = scores
+                st.session_state.votes.set_scores(voter, scores)
                 st.session_state.completed[voter] = True
                 st.session_state.stage = "vote_select"
                 st.rerun()
         else:
-            st.session_state.votes[voter]['score'] = scores
+            st.session_state.votes.set_scores(voter, scores)
             st.session_state.completed[voter] = True
             st.session_state.stage = "vote_select"
             st.rerun()
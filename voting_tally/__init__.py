@@ -0,0 +1,59 @@
+"""
+모두의 투표 집계 패키지 (Streamlit 없이 import 가능):
+- BallotStore: V×C 순위/점수 행렬로 보관하는 투표 저장소.
+- BallotPatterns: 같은 투표를 (투표 패턴 → 표 수)로 묶은 표 (비용이 고유 패턴 수에 비례).
+- RunningTally: 제출된 투표의 누적 집계 (투표 추가/취소 시 갱신).
+- calculate_*: 투표 방식별 계산 함수, METHODS: 이름 → 함수.
+- ElectionStore: 선거와 투표를 SQLite(WAL)에 보관하는 영구 저장소.
+- ElectionHub / SharedElection: 여러 세션이 선거 ID로 함께 쓰는 선거 (선거별 잠금).
+- tally_archive: 선거 보관 파일(.vote)을 메모리에 올리지 않고 청크 단위로 집계.
+- 파일 불러오기는 voting_tally.ballot_import, 선거 보관 파일(.vote)은 voting_tally.election_archive,
+  명령줄 실행은 `python -m voting_tally`.
+"""
+import importlib
+
+# 이름 → 정의된 하위 모듈. numpy 등은 이름을 처음 쓸 때 import 하므로
+# `python -m voting_tally --help` 처럼 집계를 하지 않는 실행은 바로 시작됨.
+_EXPORTS = {
+    "BallotPatterns": "ballot_patterns",
+    "BallotStore": "ballot_store",
+    "COMPARED_METHODS": "methods",
+    "ComparisonResult": "methods",
+    "ElectionHub": "shared_election",
+    "ElectionStore": "election_store",
+    "IRVResult": "instant_runoff",
+    "METHODS": "methods",
+    "RunningTally": "running_tally",
+    "SharedElection": "shared_election",
+    "TALLY_SOURCES": "running_tally",
+    "calculate_bentham": "methods",
+    "calculate_bentham_colab_style": "methods",
+    "calculate_borda": "methods",
+    "calculate_borda_colab_style": "methods",
+    "calculate_condorcet": "methods",
+    "calculate_condorcet_colab_style": "methods",
+    "calculate_condorcet_pairwise": "methods",
+    "calculate_instant_runoff": "methods",
+    "calculate_nash": "methods",
+    "calculate_nash_colab_style": "methods",
+    "calculate_ranked_pairs": "methods",
+    "calculate_schulze": "methods",
+    "compare_all_methods": "methods",
+    "instant_runoff_rounds": "methods",
+    "parallel_tally": "parallel_tally",
+    "tally_archive": "archive_tally",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,158 @@
+"""
+보관 파일(.vote)을 메모리에 통째로 올리지 않고 집계 (여러 해 동안 모은 큰 선거 등):
+- 파일을 mmap으로 연결하고 투표자를 고정 크기 청크로 나눠, 청크마다 제출한 투표만 골라 부분 집계(RunningTally)를 만들어 더함.
+- 다 읽은 청크의 페이지는 madvise(MADV_DONTNEED)로 바로 돌려주므로, 상주 메모리는 파일 크기와 관계없이 청크 몇 개 분량.
+- 부분 집계는 모두 정수 합이라 RunningTally.merge로 순서와 관계없이 합쳐짐. workers를 주면 구간을 나눠 여러 프로세스에서
+  각자 파일을 연결해 집계하고, 돌려받는 것은 C×C 크기의 부분 집계뿐.
+- 즉석 결선처럼 투표별 순위가 필요한 방식은 청크마다 선호 순서만 뽑아 같은 순서끼리 (순서, 표 수)로 묶고,
+  묶음을 모아 한 번에 다시 묶어 합침 (점수는 담지 않으므로 메모리는 고유 선호 순서 수에 비례).
+"""
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .ballot_store import group_orders, preference_orders, rank_dtype_for
+from .election_archive import archive_column, read_header, read_names
+from .running_tally import RunningTally
+
+# 청크 하나에서 읽을 순위+점수 바이트 수 (청크 행 수는 후보 수에 맞춰 정함)
+ARCHIVE_CHUNK_BYTES = 32 << 20
+
+
+def archive_chunk_rows(n_candidates, rank_itemsize, chunk_bytes=ARCHIVE_CHUNK_BYTES):
+    """chunk_bytes에 맞는 청크 행 수 (제출 비트맵을 바이트 단위로 자를 수 있게 8의 배수)."""
+    rows = chunk_bytes // max(1, n_candidates * (rank_itemsize + 1))
+    return max(8, rows // 8 * 8)
+
+
+class MappedArchive:
+    """
+    mmap으로 연결한 보관 파일 (with 문으로 사용, 닫을 때 연결을 끊음):
+    - candidates / n_voters / header: 보관 파일의 후보 목록, 투표자 수, 헤더.
+    - chunks(start, stop, chunk_rows)로 [start, stop) 구간 투표자의 제출한 투표를 청크 단위 복사본으로 읽음.
+    """
+
+    def __init__(self, path):
+        if os.path.getsize(path) == 0: # 빈 파일은 mmap으로 연결할 수 없음
+            raise ValueError("투표 보관 파일(.vote)이 아닙니다.")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # 헤더가 잘못되어 실패하면 mmap은 참조가 사라질 때 닫힘 (예외가 버퍼를 잡고 있어 여기서 닫을 수 없음)
+        buffer = np.frombuffer(self._mmap, dtype=np.uint8)
+        self.header = read_header(buffer)
+        self.n_voters, n_candidates = self.header["n_voters"], self.header["n_candidates"]
+        self.candidates = read_names(archive_column(buffer, self.header, "candidates"), n_candidates)
+        self._rank_dtype = np.dtype(self.header["rank_dtype"])
+        self._ranks = archive_column(buffer, self.header, "ranks").view(self._rank_dtype).reshape(
+            self.n_voters, n_candidates
+        )
+        self._scores = archive_column(buffer, self.header, "scores").reshape(self.n_voters, n_candidates)
+        self._completed = archive_column(buffer, self.header, "completed")
+        # 파일 안에서 순위/점수 행렬이 시작하는 위치 (다 읽은 페이지를 돌려줄 때 사용)
+        self._offsets = {
+            name: self.header["data_start"] + self.header["columns"][name][0] for name in ("ranks", "scores")
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # 버퍼를 가리키는 배열을 먼저 놓아야 mmap을 닫을 수 있음
+        self._ranks = self._scores = self._completed = None
+        self._mmap.close()
+
+    def _release(self, name, row_bytes, start, stop):
+        # 다 읽은 행 구간의 페이지를 운영체제에 돌려줌 (파일 페이지라 다시 읽으면 디스크에서 다시 올라옴)
+        if not hasattr(mmap, "MADV_DONTNEED") or not row_bytes or start >= stop:
+            return
+        first = self._offsets[name] + start * row_bytes
+        first -= first % mmap.PAGESIZE
+        self._mmap.madvise(mmap.MADV_DONTNEED, first, self._offsets[name] + stop * row_bytes - first)
+
+    def chunks(self, start=0, stop=None, chunk_rows=None):
+        """
+        [start, stop) 구간(start는 8의 배수) 투표자 중 제출한 투표의 (순위 행렬, 점수 행렬)을 청크마다 반환:
+        - 반환하는 행렬은 복사본이라 다음 청크로 넘어가도 유효함 (읽은 청크의 파일 페이지는 바로 돌려줌).
+        """
+        stop = self.n_voters if stop is None else stop
+        chunk_rows = chunk_rows or archive_chunk_rows(len(self.candidates), self._rank_dtype.itemsize)
+        chunk_rows = max(8, chunk_rows // 8 * 8)
+        for begin in range(start, stop, chunk_rows):
+            end = min(begin + chunk_rows, stop)
+            submitted = np.unpackbits(self._completed[begin // 8:(end + 7) // 8], count=end - begin).view(bool)
+            ranks = self._ranks[begin:end][submitted]
+            scores = self._scores[begin:end][submitted]
+            if not self._rank_dtype.isnative:
+                ranks = ranks.astype(self._rank_dtype.newbyteorder("="))
+            self._release("ranks", self._ranks.strides[0], begin, end)
+            self._release("scores", self._scores.strides[0], begin, end)
+            yield ranks, scores
+
+
+def merge_orders(parts, n_candidates):
+    """group_orders로 묶은 (선호 순서 행렬, 표 수) 여러 개를 같은 순서끼리 다시 묶어 하나로 합침."""
+    if not parts:
+        return np.zeros((0, n_candidates), dtype=rank_dtype_for(n_candidates)), np.zeros(0, dtype=np.int64)
+    if len(parts) == 1:
+        return parts[0]
+    orders = np.concatenate([orders for orders, _ in parts])
+    return group_orders(orders, np.concatenate([counts for _, counts in parts]))
+
+
+def _tally_range(path, start, stop, chunk_rows, with_orders):
+    # [start, stop) 구간을 청크마다 부분 집계해 합친 (RunningTally, (선호 순서, 표 수) 또는 None) (작업 프로세스에서도 실행)
+    with MappedArchive(path) as archive:
+        n_candidates = len(archive.candidates)
+        tally = RunningTally(archive.candidates)
+        parts = []
+        for ranks, scores in archive.chunks(start, stop, chunk_rows):
+            tally.merge(RunningTally.from_arrays(archive.candidates, ranks, scores))
+            if with_orders:
+                parts.append(group_orders(preference_orders(ranks)))
+                # 쌓인 묶음이 합쳐 둔 묶음의 두 배를 넘을 때만 다시 합침 (다시 묶는 비용이 고유 순서 수에 대해 상각 O(1))
+                if sum(len(counts) for _, counts in parts) > 2 * len(parts[0][1]):
+                    parts = [merge_orders(parts, n_candidates)]
+    return tally, merge_orders(parts, n_candidates) if with_orders else None
+
+
+def tally_archive(path, chunk_rows=None, workers=1, orders=False, executor=None):
+    """
+    보관 파일의 제출한 투표를 청크 단위로 집계해 (RunningTally, (선호 순서 행렬, 표 수) 또는 None)을 반환:
+    - chunk_rows: 청크 하나의 투표자 수 (None이면 ARCHIVE_CHUNK_BYTES에 맞춤).
+    - workers가 2 이상(0이면 CPU 수)이면 투표자 구간을 나눠 프로세스 풀에서 집계 (executor를 주면 재사용).
+    - orders=True면 즉석 결선용으로 같은 선호 순서를 묶은 (고유 선호 순서 행렬, 표 수)도 함께 만듦
+      (instant_runoff(candidates, *orders)에 그대로 넘길 수 있음).
+    - 형식이 잘못된 파일이면 ValueError.
+    """
+    with MappedArchive(path) as archive:
+        n_voters = archive.n_voters
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or n_voters < 8 * workers:
+        return _tally_range(path, 0, n_voters, chunk_rows, orders)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        # 제출 비트맵을 바이트 단위로 나누도록 구간 경계는 8의 배수
+        bounds = (np.linspace(0, n_voters, workers + 1) // 8 * 8).astype(int)
+        bounds[-1] = n_voters
+        futures = [
+            executor.submit(_tally_range, os.fspath(path), int(start), int(stop), chunk_rows, orders)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        tally, merged = futures[0].result()
+        parts = [merged]
+        for future in futures[1:]:
+            partial_tally, partial_orders = future.result()
+            tally.merge(partial_tally)
+            parts.append(partial_orders)
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return tally, merge_orders(parts, len(tally.candidates)) if orders else None
@@ -0,0 +1,140 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .ballot_store import BallotStore, MAX_SCORE, MIN_SCORE
+from .running_tally import RunningTally
+
+# 파일 열 이름 규칙: 투표자 열 + 후보마다 "rank_후보", "score_후보"
+VOTER_COLUMN = "voter"
+RANK_PREFIX = "rank_"
+SCORE_PREFIX = "score_"
+# 한 번에 읽어 검증하는 행 수 (파일 크기와 관계없이 읽기 메모리를 이 크기로 제한)
+IMPORT_CHUNK_ROWS = 100_000
+# 보고서에 남길 잘못된 행의 최대 개수 (나머지는 개수만 셈)
+MAX_REPORTED_ERRORS = 1000
+
+# 불러오기 결과 (읽은 행 수, 불러온 투표 수, 잘못된 행 수, [(행 번호, 사유)])
+ImportReport = namedtuple("ImportReport", ["n_rows", "n_loaded", "n_bad", "errors"])
+
+
+def detect_format(name):
+    """파일 이름 확장자로 형식("csv" 또는 "parquet")을 판단."""
+    if str(name).lower().endswith(".parquet"):
+        return "parquet"
+    if str(name).lower().endswith(".csv"):
+        return "csv"
+    raise ValueError(f"CSV 또는 Parquet 파일만 불러올 수 있습니다: {name}")
+
+
+def candidates_from_columns(columns):
+    """
+    열 이름에서 후보 목록을 추출:
+    - "rank_후보" 열의 순서대로 후보를 정하고, 모든 후보에 "score_후보" 열이 있어야 함.
+    """
+    columns = list(columns)
+    if VOTER_COLUMN not in columns:
+        raise ValueError(f"'{VOTER_COLUMN}' 열이 없습니다.")
+    candidates = [c[len(RANK_PREFIX):] for c in columns if c.startswith(RANK_PREFIX)]
+    if len(candidates) < 2:
+        raise ValueError("후보는 최소 2명이어야 합니다. ('rank_후보' 열이 2개 이상 필요)")
+    missing = [c for c in candidates if SCORE_PREFIX + c not in columns]
+    if missing:
+        raise ValueError(f"점수 열이 없는 후보가 있습니다: {', '.join(missing)}")
+    return candidates
+
+
+def iter_chunks(source, file_format, chunk_rows=IMPORT_CHUNK_ROWS):
+    """파일을 chunk_rows 행씩 DataFrame으로 읽음 (Parquet은 pyarrow 필요)."""
+    if file_format == "csv":
+        yield from pd.read_csv(source, chunksize=chunk_rows, dtype={VOTER_COLUMN: str}, keep_default_na=False,
+                               na_values=[""])
+    elif file_format == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ValueError("Parquet 파일을 읽으려면 pyarrow를 설치해야 합니다.") from e
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {file_format}")
+
+
+def _integer_matrix(chunk, columns):
+    # 열들을 float 행렬로 읽고 (숫자가 아니면 NaN), 정수가 아닌 칸을 표시
+    values = np.column_stack([pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float) for c in columns])
+    invalid = ~np.isfinite(values) | (values != np.floor(values))
+    return np.where(invalid, 0, values), invalid
+
+
+def validate_chunk(chunk, candidates):
+    """
+    읽은 행들을 벡터 연산으로 검증:
+    - 순위는 1..C 정수이고 한 행 안에서 중복이 없어야 함 (= 1..C의 순열).
+    - 점수는 0~10 정수여야 함. 투표자 이름은 비어 있으면 안 됨.
+    - 반환: (순위 행렬, 점수 행렬, 잘못된 행 표시, 행별 사유 문자열 배열)
+    """
+    n_candidates = len(candidates)
+    ranks, bad_rank = _integer_matrix(chunk, [RANK_PREFIX + c for c in candidates])
+    scores, bad_score = _integer_matrix(chunk, [SCORE_PREFIX + c for c in candidates])
+
+    bad_rank = (bad_rank | (ranks < 1) | (ranks > n_candidates)).any(axis=1)
+    sorted_ranks = np.sort(ranks, axis=1)
+    bad_rank |= (np.diff(sorted_ranks, axis=1) == 0).any(axis=1)
+    bad_score = (bad_score | (scores < MIN_SCORE) | (scores > MAX_SCORE)).any(axis=1)
+    voters = chunk[VOTER_COLUMN].fillna("").astype(str).str.strip()
+    bad_voter = (voters == "").to_numpy()
+
+    reasons = np.full(len(chunk), "", dtype=object)
+    reasons[bad_voter] += "투표자 이름 없음; "
+    reasons[bad_rank] += f"순위는 1~{n_candidates}의 중복 없는 정수여야 함; "
+    reasons[bad_score] += f"점수는 {MIN_SCORE}~{MAX_SCORE} 정수여야 함; "
+    return ranks, scores, bad_voter | bad_rank | bad_score, voters.to_numpy(), reasons
+
+
+def import_ballots(source, file_format, chunk_rows=IMPORT_CHUNK_ROWS, build_tally=True):
+    """
+    CSV/Parquet 투표 파일을 청크 단위로 읽어 BallotStore와 RunningTally로 불러옴:
+    - 열: "voter", 후보마다 "rank_후보"(1이 가장 선호), "score_후보"(0~10).
+    - 잘못된 행(순위 중복/범위, 점수 범위, 이름 없음/중복)은 건너뛰고 보고서에 남김.
+    - 파일 전체를 메모리에 올리지 않고, 청크마다 검증 → 저장소 추가 → 누적 집계 갱신.
+    - 반환: (store, tally, ImportReport). 파일 구조 자체가 잘못되면 ValueError.
+    - build_tally=False면 누적 집계를 만들지 않고 tally 자리에 None (불러온 뒤 따로 집계할 때).
+    """
+    store = None
+    tally = None
+    n_rows = n_bad = 0
+    errors = []
+
+    for chunk in iter_chunks(source, file_format, chunk_rows):
+        if store is None:
+            candidates = candidates_from_columns(chunk.columns)
+            store = BallotStore(candidates)
+            tally = RunningTally(candidates) if build_tally else None
+        ranks, scores, bad, voters, reasons = validate_chunk(chunk, store.candidates)
+
+        # 이미 불러온 투표자 또는 같은 청크 안에서 앞에 나온 투표자와 이름이 겹치면 잘못된 행
+        # (청크 안 중복은 duplicated, 불러온 이름과의 교집합은 청크 크기만큼만 훑는 집합 연산으로 구함)
+        valid = np.flatnonzero(~bad)
+        names = pd.Series(voters[valid])
+        registered = store.voter_index.keys() & set(names)
+        duplicate = valid[(names.duplicated() | names.isin(registered)).to_numpy()]
+        bad[duplicate] = True
+        reasons[duplicate] += "투표자 이름 중복; "
+
+        for i in np.flatnonzero(bad)[:max(0, MAX_REPORTED_ERRORS - len(errors))]:
+            errors.append((n_rows + int(i) + 1, reasons[i].rstrip("; ")))
+        n_bad += int(bad.sum())
+        n_rows += len(chunk)
+
+        good = ~bad
+        good_ranks = ranks[good].astype(store.ranks.dtype)
+        good_scores = scores[good].astype(np.uint8)
+        store.append_ballots(voters[good].tolist(), good_ranks, good_scores)
+        if build_tally:
+            tally.add_arrays(good_ranks, good_scores)
+
+    if store is None:
+        raise ValueError("파일에 투표 데이터가 없습니다.")
+    return store, tally, ImportReport(n_rows, len(store), n_bad, errors)
@@ -0,0 +1,223 @@
+"""
+같은 투표 묶음 (투표 패턴 → 표 수):
+- 후보가 적은 투표(점심 메뉴, 장소 고르기 등)는 대부분의 투표가 몇 가지 순위/점수 조합의 반복.
+- 투표 하나의 (순위 줄, 점수 줄) 바이트열을 키로 고유 패턴 줄과 줄마다 표 수를 보관하고, 제출/취소 시 O(C)로 갱신.
+- BallotStore와 같은 집계 메서드를 표 수 가중치로 계산하므로 calculate_* 함수의 비용이 투표자 수 대신 고유 패턴 수에 비례.
+"""
+import numpy as np
+
+from .ballot_store import (
+    first_choice_counts, group_orders, nash_log_sums, pairwise_matrix, preference_orders, rank_dtype_for,
+    score_counts,
+)
+
+
+class BallotPatterns:
+    """
+    고유 투표 패턴 표:
+    - ranks/scores: 패턴 줄마다 후보 순서의 순위/점수, counts: 줄마다 표 수 (모두 표 수가 1 이상인 줄만).
+    - 표 수가 0이 된 줄은 지우지 않고 남겨 두었다가 같은 투표가 다시 들어오면 재사용 (집계에서는 제외).
+    - n_ballots: 전체 표 수, version: 투표가 반영/취소될 때마다 올라감.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        self.candidate_index = {c: i for i, c in enumerate(self.candidates)}
+        n_candidates = len(self.candidates)
+        self.pattern_index = {} # (순위 바이트열 + 점수 바이트열) → 패턴 줄 번호
+        self.n_ballots = 0
+        self.version = 0
+        self._ranks = np.zeros((0, n_candidates), dtype=rank_dtype_for(n_candidates))
+        self._scores = np.zeros((0, n_candidates), dtype=np.uint8)
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_arrays(cls, candidates, ranks, scores, weights=None):
+        """
+        V×C 순위/점수 행렬의 투표를 묶은 표를 생성 (두 행렬을 이어 붙인 줄을 바이트열로 보고 한 번 정렬):
+        - weights(줄마다 표 수)를 주면 줄마다 1표 대신 그 표 수를 합침.
+        """
+        patterns = cls(candidates)
+        n_voters, n_candidates = ranks.shape
+        if not n_voters:
+            return patterns
+        ranks = np.ascontiguousarray(ranks, dtype=patterns._ranks.dtype)
+        rows = np.concatenate([ranks.view(np.uint8).reshape(n_voters, -1), scores.astype(np.uint8, copy=False)], axis=1)
+        rows = np.ascontiguousarray(rows).view(np.dtype((np.void, rows.shape[1]))).ravel()
+        if weights is None:
+            unique_rows, first_rows, counts = np.unique(rows, return_index=True, return_counts=True)
+        else:
+            unique_rows, first_rows, inverse = np.unique(rows, return_index=True, return_inverse=True)
+            counts = np.bincount(inverse.ravel(), weights, len(unique_rows))
+        patterns._ranks = ranks[first_rows]
+        patterns._scores = np.ascontiguousarray(scores[first_rows], dtype=np.uint8)
+        patterns._counts = counts.astype(np.int64)
+        patterns.pattern_index = {row.tobytes(): i for i, row in enumerate(unique_rows)}
+        patterns.n_ballots = int(patterns._counts.sum())
+        patterns.version = 1
+        return patterns
+
+    @classmethod
+    def from_store(cls, store, voters=None):
+        """BallotStore의 투표(voters를 주면 해당 투표자만)를 묶은 표를 생성."""
+        if voters is None:
+            return cls.from_arrays(store.candidates, store.ranks, store.scores)
+        return cls.from_arrays(store.candidates, *store.rows([store.voter_index[v] for v in voters]))
+
+    # --- 갱신 ---
+
+    def _reserve(self, n_rows):
+        # 용량이 부족하면 두 배씩 늘려 새 패턴 추가 비용을 상각 O(1)로 유지
+        capacity = self._ranks.shape[0]
+        if n_rows <= capacity:
+            return
+        new_capacity = max(n_rows, capacity * 2, 16)
+        n = len(self.pattern_index)
+        ranks = np.zeros((new_capacity, len(self.candidates)), dtype=self._ranks.dtype)
+        scores = np.zeros((new_capacity, len(self.candidates)), dtype=np.uint8)
+        counts = np.zeros(new_capacity, dtype=np.int64)
+        ranks[:n], scores[:n], counts[:n] = self._ranks[:n], self._scores[:n], self._counts[:n]
+        self._ranks, self._scores, self._counts = ranks, scores, counts
+
+    def add(self, ranks, scores, weight=1):
+        """후보 순서의 순위/점수 한 줄(투표 하나)을 weight 만큼 반영 (같은 패턴이 있으면 표 수만 늘림)."""
+        ranks = np.asarray(ranks, dtype=self._ranks.dtype)
+        scores = np.asarray(scores, dtype=np.uint8)
+        key = ranks.tobytes() + scores.tobytes()
+        row = self.pattern_index.get(key)
+        if row is None:
+            if weight < 0:
+                raise ValueError("반영되지 않은 투표는 뺄 수 없습니다.")
+            row = len(self.pattern_index)
+            self._reserve(row + 1)
+            self._ranks[row], self._scores[row] = ranks, scores
+            self.pattern_index[key] = row
+        elif self._counts[row] + weight < 0:
+            raise ValueError("반영되지 않은 투표는 뺄 수 없습니다.")
+        self._counts[row] += weight
+        self.n_ballots += weight
+        self.version += 1
+
+    def remove(self, ranks, scores):
+        """add 로 반영했던 투표 하나를 되돌림."""
+        self.add(ranks, scores, weight=-1)
+
+    def add_ballot(self, store, voter):
+        """BallotStore에 저장된 투표자의 현재 투표를 반영."""
+        self.add(*store.row(store.voter_index[voter]))
+
+    def remove_ballot(self, store, voter):
+        """BallotStore에 저장된 투표자의 현재 투표를 되돌림."""
+        self.remove(*store.row(store.voter_index[voter]))
+
+    def merge(self, other):
+        """
+        다른 패턴 표(같은 후보 순서)를 더함:
+        - 투표를 나눠 따로 묶은 부분 표를 합칠 때 사용. 두 표의 살아 있는 줄을 이어 붙여 표 수 가중치로 다시 묶음.
+        """
+        if other.candidates != self.candidates:
+            raise ValueError("후보 목록이 같은 표만 합칠 수 있습니다.")
+        if not other.n_ballots:
+            return self
+        merged = BallotPatterns.from_arrays(
+            self.candidates,
+            np.concatenate([self.ranks, other.ranks]),
+            np.concatenate([self.scores, other.scores]),
+            np.concatenate([self.counts, other.counts]),
+        )
+        self.pattern_index = merged.pattern_index
+        self._ranks, self._scores, self._counts = merged._ranks, merged._scores, merged._counts
+        self.n_ballots = merged.n_ballots
+        self.version += 1
+        return self
+
+    def copy(self):
+        """현재 표의 복사본 (표 수가 0인 줄은 빼고 복사)."""
+        patterns = BallotPatterns(self.candidates)
+        ranks, scores, counts = self.ranks, self.scores, self.counts
+        patterns._ranks, patterns._scores, patterns._counts = ranks.copy(), scores.copy(), counts.copy()
+        patterns.pattern_index = {r.tobytes() + s.tobytes(): i for i, (r, s) in enumerate(zip(ranks, scores))}
+        patterns.n_ballots = self.n_ballots
+        patterns.version = self.version
+        return patterns
+
+    def __len__(self):
+        return self.n_ballots
+
+    @property
+    def n_patterns(self):
+        """표 수가 1 이상인 고유 패턴 수."""
+        return int(np.count_nonzero(self._counts[:len(self.pattern_index)]))
+
+    def _live(self):
+        # 표 수가 1 이상인 줄 (모두 살아 있으면 복사 없이 뷰)
+        counts = self._counts[:len(self.pattern_index)]
+        live = counts > 0
+        if live.all():
+            return slice(None, len(counts))
+        return np.flatnonzero(live)
+
+    @property
+    def ranks(self):
+        """패턴별 순위 행렬."""
+        return self._ranks[self._live()]
+
+    @property
+    def scores(self):
+        """패턴별 점수 행렬."""
+        return self._scores[self._live()]
+
+    @property
+    def counts(self):
+        """패턴별 표 수."""
+        return self._counts[self._live()]
+
+    # --- 집계 (BallotStore와 같은 인터페이스, 패턴마다 표 수만큼 가중) ---
+
+    def columns(self, candidates=None):
+        """후보 이름 목록을 열 인덱스 배열로 변환 (None이면 전체 후보 순서)."""
+        if candidates is None:
+            return np.arange(len(self.candidates))
+        return np.array([self.candidate_index[c] for c in candidates], dtype=np.intp)
+
+    def _select(self, matrix, candidates):
+        # 후보 순서가 저장 순서와 같으면 그대로, 아니면 C-연속 배열로 열을 골라냄
+        cols = self.columns(candidates)
+        if np.array_equal(cols, np.arange(len(self.candidates))):
+            return matrix
+        return np.ascontiguousarray(matrix[:, cols])
+
+    def rank_sums(self, candidates=None):
+        """후보별 순위 값 합계."""
+        return self.counts @ self._select(self.ranks, candidates).astype(np.int64)
+
+    def score_sums(self, candidates=None):
+        """후보별 점수 합계."""
+        return self.counts @ self._select(self.scores, candidates).astype(np.int64)
+
+    def min_scores(self, candidates=None):
+        """후보별 최저 점수 (투표가 없으면 inf)."""
+        scores = self._select(self.scores, candidates)
+        if not len(scores):
+            return np.full(len(self.columns(candidates)), np.inf)
+        return scores.min(axis=0)
+
+    def score_counts(self, candidates=None):
+        """후보별 점수(0~10) 등장 횟수 C×11 행렬."""
+        return score_counts(self._select(self.scores, candidates), weights=self.counts)
+
+    def nash_log_sums(self, candidates=None):
+        """후보별 log(점수 곱) (0점은 0.00001로 처리)."""
+        return nash_log_sums(self.score_counts(candidates))
+
+    def first_choice_counts(self, candidates=None):
+        """후보별 단독 1순위 득표 수."""
+        return first_choice_counts(self.ranks, weights=self.counts)[self.columns(candidates)]
+
+    def pairwise_matrix(self, candidates=None):
+        """선택한 후보 순서의 쌍대 선호 행렬 (P[a, b] = a를 b보다 선호한 투표자 수)."""
+        return pairwise_matrix(self._select(self.ranks, candidates), weights=self.counts)
+
+    def weighted_orders(self, candidates=None):
+        """같은 선호 순서의 투표를 묶은 (고유 선호 순서 행렬, 표 수) (점수만 다른 패턴은 한 줄로 합침)."""
+        return group_orders(preference_orders(self._select(self.ranks, candidates)), self.counts)
@@ -0,0 +1,549 @@
+import functools
+
+import numpy as np
+
+# 투표 입력 화면의 기본값과 동일 (순위 1..C, 점수 5점)
+DEFAULT_SCORE = 5
+MIN_SCORE = 0
+MAX_SCORE = 10
+
+# 내쉬 곱에서 0점을 대신하는 값 (0.00001 = 2^-5 · 5^-5)
+NASH_ZERO_SCORE = 0.00001
+NASH_PRIMES = (2, 3, 5, 7)
+# 점수 s(0~10)를 소인수 (2, 3, 5, 7)의 지수 벡터로 표현한 표
+NASH_EXPONENTS = np.array([
+    [-5, 0, -5, 0],  # 0 → 0.00001
+    [0, 0, 0, 0],    # 1
+    [1, 0, 0, 0],    # 2
+    [0, 1, 0, 0],    # 3
+    [2, 0, 0, 0],    # 4
+    [0, 0, 1, 0],    # 5
+    [1, 1, 0, 0],    # 6
+    [0, 0, 0, 1],    # 7
+    [3, 0, 0, 0],    # 8
+    [0, 2, 0, 0],    # 9
+    [1, 0, 1, 0],    # 10
+], dtype=np.int64)
+NASH_LOG_VALUES = NASH_EXPONENTS @ np.log(NASH_PRIMES)
+# 로그 합 비교 시 같은 값으로 볼 상대 오차 / 정확 모드에서 정수 비교 대상으로 남길 상대 폭
+NASH_LOG_TIE_TOLERANCE = 1e-12
+NASH_EXACT_MARGIN = 1e-9
+
+# 쌍대 비교 행렬 계산 시 한 번에 비교할 bool 원소 수 (캐시에 머물 정도로 제한)
+PAIRWISE_CHUNK_ELEMENTS = 1 << 22
+# 점수 등장 횟수 집계 / 선호 순서 변환 시 한 번에 처리할 투표자 수
+SCORE_COUNT_CHUNK_ROWS = 1 << 16
+
+
+def rank_dtype_for(n_candidates):
+    """후보 수에 맞는 가장 작은 순위 정수 타입 (255명 이하면 uint8)."""
+    return np.uint8 if n_candidates <= np.iinfo(np.uint8).max else np.uint16
+
+
+def pairwise_matrix(ranks, chunk_elements=PAIRWISE_CHUNK_ELEMENTS, weights=None):
+    """
+    쌍대 선호 행렬 계산:
+    - P[a, b] = 후보 a를 b보다 높은 순위(더 작은 순위 값)로 둔 투표자 수.
+    - 투표자를 청크로 나눠 (청크×C×C) bool 비교를 한 번에 수행하므로 메모리는 청크 크기로 제한됨.
+    - 청크당 투표자는 최대 255명이라 청크 안의 합계는 uint8로 누적 후 int64에 더함.
+    - weights(줄마다 표 수)를 주면 줄마다 그만큼 더함 (같은 투표를 묶은 BallotPatterns용).
+    """
+    n_voters, n_candidates = ranks.shape
+    pairwise = np.zeros((n_candidates, n_candidates), dtype=np.int64)
+    if not n_voters or not n_candidates:
+        return pairwise
+    chunk = max(1, min(np.iinfo(np.uint8).max, chunk_elements // (n_candidates * n_candidates)))
+    prefers = np.empty((chunk, n_candidates, n_candidates), dtype=bool)
+    for start in range(0, n_voters, chunk):
+        block = ranks[start:start + chunk]
+        out = prefers[:len(block)]
+        np.less(block[:, :, None], block[:, None, :], out=out)
+        if weights is None:
+            pairwise += out.view(np.uint8).sum(axis=0, dtype=np.uint8)
+        else:
+            pairwise += (weights[start:start + chunk] @ out.reshape(len(block), -1)).reshape(pairwise.shape)
+    return pairwise
+
+
+def score_counts(scores, chunk_rows=SCORE_COUNT_CHUNK_ROWS, weights=None):
+    """
+    V×C 점수 행렬에서 후보별 점수(0~10) 등장 횟수 C×11 행렬을 계산:
+    - (후보 열 × 11 + 점수)를 키로 한 bincount 한 번으로 모든 후보를 같이 셈.
+    - 키 배열이 커지지 않도록 투표자를 chunk_rows 단위로 나눠 누적.
+    - weights(줄마다 표 수)를 주면 줄마다 그만큼 셈.
+    """
+    n_levels = MAX_SCORE + 1
+    n_candidates = scores.shape[1]
+    offsets = np.arange(n_candidates, dtype=np.int32) * n_levels
+    counts = np.zeros(n_candidates * n_levels, dtype=np.int64)
+    for start in range(0, scores.shape[0], chunk_rows):
+        keys = scores[start:start + chunk_rows] + offsets
+        if weights is None:
+            counts += np.bincount(keys.ravel(), minlength=n_candidates * n_levels)
+        else:
+            key_weights = np.repeat(weights[start:start + chunk_rows], n_candidates)
+            counts += np.bincount(keys.ravel(), key_weights, n_candidates * n_levels).astype(np.int64)
+    return counts.reshape(n_candidates, n_levels)
+
+
+def nash_log_sums(counts):
+    """점수 등장 횟수(C×11)로 후보별 log(점수 곱)을 계산 (0점은 0.00001로 처리)."""
+    return counts @ NASH_LOG_VALUES
+
+
+def nash_log_winners(log_sums):
+    """로그 합이 최대인 후보 인덱스 (부동소수 오차 범위 안은 동률)."""
+    if not len(log_sums):
+        return []
+    top = log_sums.max()
+    return np.flatnonzero(log_sums >= top - NASH_LOG_TIE_TOLERANCE * max(1.0, abs(top))).tolist()
+
+
+def _compare_nash_products(exponents_a, exponents_b):
+    # 두 지수 벡터가 나타내는 곱을 정수로 비교 (-1, 0, 1)
+    numerator = denominator = 1
+    for prime, diff in zip(NASH_PRIMES, (int(x) - int(y) for x, y in zip(exponents_a, exponents_b))):
+        if diff > 0:
+            numerator *= prime ** diff
+        elif diff < 0:
+            denominator *= prime ** -diff
+    return (numerator > denominator) - (numerator < denominator)
+
+
+def nash_exact_winners(counts):
+    """
+    내쉬 곱이 최대인 후보 인덱스를 정확히 계산:
+    - 각 후보의 곱을 소인수 (2, 3, 5, 7) 지수 벡터로 표현 (소인수분해가 유일하므로 같은 곱 ⇔ 같은 벡터).
+    - 로그 값으로 확실히 뒤지는 후보는 먼저 제외하고, 최댓값 근처 후보만 파이썬 정수로 비교.
+    """
+    if not len(counts):
+        return []
+    exponents = counts @ NASH_EXPONENTS
+    log_products = exponents @ np.log(NASH_PRIMES)
+    top = log_products.max()
+    contenders = np.flatnonzero(log_products >= top - NASH_EXACT_MARGIN * max(1.0, abs(top)))
+    winners = [int(contenders[0])]
+    for idx in contenders[1:]:
+        order = _compare_nash_products(exponents[idx], exponents[winners[0]])
+        if order > 0:
+            winners = [int(idx)]
+        elif order == 0:
+            winners.append(int(idx))
+    return winners
+
+
+def first_choice_counts(ranks, weights=None):
+    """V×C 순위 행렬에서 후보별 단독 1순위(순위 1을 정확히 한 후보에게만 준 투표) 득표 수 (weights: 줄마다 표 수)."""
+    is_first = ranks == 1
+    single = np.count_nonzero(is_first, axis=1) == 1
+    single_weights = None if weights is None else weights[single]
+    return np.bincount(is_first[single].argmax(axis=1), single_weights, ranks.shape[1]).astype(np.int64)
+
+
+def preference_orders(ranks, chunk_rows=SCORE_COUNT_CHUNK_ROWS):
+    """
+    V×C 순위 행렬을 선호 순서 행렬로 변환:
+    - orders[v, k] = 투표자 v가 k+1번째로 선호한 후보 인덱스 (순위가 같으면 후보 순서대로).
+    - 결과는 순위와 같은 소형 정수 타입. 정렬 임시 배열이 커지지 않도록 chunk_rows 단위로 변환.
+    """
+    orders = np.empty(ranks.shape, dtype=rank_dtype_for(ranks.shape[1]))
+    for start in range(0, ranks.shape[0], chunk_rows):
+        orders[start:start + chunk_rows] = np.argsort(ranks[start:start + chunk_rows], axis=1, kind="stable")
+    return orders
+
+
+def group_orders(orders, weights=None):
+    """
+    같은 선호 순서의 투표를 한 줄로 묶어 (고유 순서 행렬, 줄마다 표 수)를 반환 (행을 바이트열로 보고 정렬).
+    - weights를 주면 줄마다 1표 대신 그 표 수를 합침.
+    """
+    n_voters, n_candidates = orders.shape
+    if not n_voters:
+        return orders, np.zeros(0, dtype=np.int64)
+    rows = np.ascontiguousarray(orders).view(np.dtype((np.void, orders.dtype.itemsize * n_candidates))).ravel()
+    if weights is None:
+        unique_rows, counts = np.unique(rows, return_counts=True)
+    else:
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights, len(unique_rows))
+    return unique_rows.view(orders.dtype).reshape(-1, n_candidates), counts.astype(np.int64)
+
+
+def copeland_wins(pairwise):
+    """쌍대 선호 행렬에서 후보별 일대일 승리 수(Copeland 승수)를 계산."""
+    return (pairwise > pairwise.T).sum(axis=1)
+
+
+def schulze_strengths(pairwise):
+    """
+    슐체(Schulze) 가장 강한 경로 세기 행렬:
+    - a가 b를 이긴 대결은 a를 b보다 선호한 표 수를 간선 세기로, 지거나 비긴 대결은 0으로 시작.
+    - Floyd–Warshall을 경유 후보 k마다 C×C 행렬 연산 한 번으로 수행 (O(C³), 파이썬 반복은 C번).
+    """
+    strengths = np.where(pairwise > pairwise.T, pairwise, 0).astype(np.int64)
+    for k in range(len(strengths)):
+        np.maximum(strengths, np.minimum(strengths[:, k:k + 1], strengths[k:k + 1, :]), out=strengths)
+    np.fill_diagonal(strengths, 0)
+    return strengths
+
+
+def _iter_bits(mask):
+    # 파이썬 정수 비트 집합의 원소(비트 위치)를 작은 것부터 차례로 반환
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def ranked_pairs_lock(pairwise):
+    """
+    랭크드 페어(Tideman) 간선 잠금:
+    - 일대일 승리 간선 a→b를 표 차이가 큰 순서로 (같으면 이긴 쪽 표가 많은 순, 그래도 같으면 후보 순서) 살펴보고,
+      이미 잠근 간선과 순환을 만들지 않을 때만 잠금.
+    - 순환 검사는 잠근 그래프의 위상 순서를 유지하며 점진적으로 수행 (Pearce–Kelly):
+      a가 b보다 앞이면 바로 잠그고, 아니면 두 위치 사이의 후보들만 따라가 b에서 a에 닿는지 확인한 뒤 그 구간만 재배치.
+      초기 순서는 쌍대 득표 합 순이라 대부분의 간선이 바로 잠김. 간선 집합은 후보별 파이썬 정수 비트 집합으로 보관.
+    - 반환: (잠근 간선 bool 행렬, 후보별로 잠근 그래프에서 도달하는(이기는) 후보 수)
+    """
+    n_candidates = len(pairwise)
+    winners, losers = np.nonzero(pairwise > pairwise.T)
+    margins = pairwise[winners, losers] - pairwise[losers, winners]
+    order = np.lexsort((losers, winners, -pairwise[winners, losers], -margins))
+
+    by_position = np.argsort(-pairwise.sum(axis=1), kind="stable").tolist()
+    position = [0] * n_candidates
+    # prefix[k]: 위상 순서에서 앞의 k명 비트 집합 (두 위치 사이 후보 = prefix 두 개의 차)
+    prefix = [0] * (n_candidates + 1)
+    for slot, v in enumerate(by_position):
+        position[v] = slot
+        prefix[slot + 1] = prefix[slot] | (1 << v)
+    out_bits = [0] * n_candidates
+    in_bits = [0] * n_candidates
+
+    for a, b in zip(winners[order].tolist(), losers[order].tolist()):
+        upper, lower = position[a], position[b]
+        if upper > lower:
+            window = prefix[upper + 1] & ~prefix[lower]
+            forward = frontier = 1 << b
+            while frontier and not forward >> a & 1:
+                reached = 0
+                for v in _iter_bits(frontier):
+                    reached |= out_bits[v]
+                frontier = reached & window & ~forward
+                forward |= frontier
+            if forward >> a & 1:
+                continue # b에서 a로 가는 잠긴 경로가 있으므로 a→b는 순환
+            backward = frontier = 1 << a
+            while frontier:
+                reached = 0
+                for v in _iter_bits(frontier):
+                    reached |= in_bits[v]
+                frontier = reached & window & ~backward
+                backward |= frontier
+            # a에 닿는 후보들을 b에서 닿는 후보들보다 앞으로, 원래 자리들 안에서만 재배치
+            moved = sorted(_iter_bits(backward), key=position.__getitem__)
+            moved += sorted(_iter_bits(forward), key=position.__getitem__)
+            slots = sorted(position[v] for v in moved)
+            for v, slot in zip(moved, slots):
+                position[v] = slot
+                by_position[slot] = v
+            for slot in range(slots[0], slots[-1] + 1):
+                prefix[slot + 1] = prefix[slot] | (1 << by_position[slot])
+        out_bits[a] |= 1 << b
+        in_bits[b] |= 1 << a
+
+    # 위상 순서의 역순으로 도달 집합을 합쳐 이기는 후보 수를 셈
+    reach = [0] * n_candidates
+    locked = np.zeros((n_candidates, n_candidates), dtype=bool)
+    for v in reversed(by_position):
+        targets = list(_iter_bits(out_bits[v]))
+        locked[v, targets] = True
+        bits = out_bits[v]
+        for w in targets:
+            bits |= reach[w]
+        reach[v] = bits
+    return locked, np.array([bin(bits).count("1") for bits in reach], dtype=np.int64)
+
+
+class BallotStore:
+    """
+    열(column) 기반 투표 저장소:
+    - ranks: V×C 소형 정수 행렬 (후보 255명 이하 uint8, 그 이상 uint16).
+    - scores: V×C uint8 행렬 (0~10점).
+    - 후보/투표자 이름 ↔ 인덱스 매핑을 함께 보관.
+    - store[voter] 로 기존 {'rank': {후보: 순위}, 'score': {후보: 점수}} 형태를 읽을 수 있음.
+      쓰기는 set_ranks / set_scores / set_row 를 사용.
+    - 투표자를 추가해도 기본 투표를 바로 채우지 않음: 0으로 할당된(운영체제가 실제로 쓰기 전까지 메모리를 잡지 않는)
+      줄은 순위 0으로 '아직 기록 안 됨'을 나타내고, 한 줄을 읽을 때는 공유 기본 투표(default_ballot)를 돌려줌.
+      전체 행렬(ranks/scores)을 처음 읽을 때만 남은 줄에 기본 투표를 채움.
+    - 주의: ranks/scores 속성은 읽기처럼 보여도 저장소를 고침 (기록 전인 줄에 기본 투표를 씀).
+      여러 스레드가 함께 쓰는 저장소(SharedElection.store)는 쓰기와 같은 잠금 안에서만 읽고,
+      잠금 밖에서는 row/rows/stored_arrays처럼 고치지 않는 메서드나 누적 집계 복사본을 사용.
+    """
+
+    def __init__(self, candidates, voters=()):
+        self.candidates = list(candidates)
+        if len(set(self.candidates)) != len(self.candidates):
+            raise ValueError("후보 이름은 중복될 수 없습니다.")
+        self.candidate_index = {c: i for i, c in enumerate(self.candidates)}
+        self.voters = []
+        self.voter_index = {} # from_arrays로 만든 저장소는 처음 쓸 때 만듦 (voter_index 속성)
+        n_candidates = len(self.candidates)
+        self._ranks = np.zeros((0, n_candidates), dtype=rank_dtype_for(n_candidates))
+        self._scores = np.zeros((0, n_candidates), dtype=np.uint8)
+        self._defaults_pending = False # 기본 투표를 아직 채우지 않은 줄이 있을 수 있으면 True
+        self.add_voters(voters)
+
+    @classmethod
+    def from_votes(cls, votes, candidates):
+        """기존 votes 딕셔너리({voter: {'rank': ..., 'score': ...}})를 저장소로 변환."""
+        store = cls(candidates, votes.keys())
+        store._fill_defaults() # 딕셔너리 투표는 대부분 일부 후보만 고치므로 기본 투표를 한 번에 채워 둠
+        for voter, voter_data in votes.items():
+            if voter_data.get('rank'):
+                store.set_ranks(voter, voter_data['rank'])
+            if voter_data.get('score'):
+                store.set_scores(voter, voter_data['score'])
+        return store
+
+    @classmethod
+    def from_arrays(cls, candidates, voters, ranks, scores):
+        """
+        후보/투표자 목록과 V×C 순위/점수 행렬로 저장소를 만듦 (행렬을 복사하지 않고 그대로 사용):
+        - 보관 파일을 np.memmap(mode="c")으로 연 행렬을 넘기면 읽은 부분만 메모리에 올라오고, 쓴 줄만 사본이 생김.
+        - 순위 0인 줄은 기록 전인 투표(기본 투표)로 봄.
+        - 투표자 이름은 이미 중복 없이 정리된 목록이어야 함 (보관 파일 등). 이름 → 인덱스 색인은 처음 이름으로 찾을 때 만듦.
+        """
+        store = cls(candidates)
+        voters = list(voters)
+        n_candidates = len(store.candidates)
+        if ranks.shape != (len(voters), n_candidates) or scores.shape != ranks.shape:
+            raise ValueError("순위/점수 행렬의 크기가 투표자 수 × 후보 수와 맞지 않습니다.")
+        del store.voter_index
+        store.voters = voters
+        store._ranks = ranks if ranks.dtype == store._ranks.dtype else ranks.astype(store._ranks.dtype)
+        store._scores = scores if scores.dtype == np.uint8 else scores.astype(np.uint8)
+        store._defaults_pending = bool(voters)
+        return store
+
+    # --- 투표자/투표 관리 ---
+
+    def _reserve(self, n_rows):
+        # 용량이 부족하면 두 배씩 늘려 append 비용을 상각 O(1)로 유지
+        capacity = self._ranks.shape[0]
+        if n_rows <= capacity:
+            return
+        new_capacity = max(n_rows, capacity * 2, 16)
+        n = len(self.voters)
+        ranks = np.zeros((new_capacity, len(self.candidates)), dtype=self._ranks.dtype)
+        scores = np.zeros((new_capacity, len(self.candidates)), dtype=np.uint8)
+        ranks[:n] = self._ranks[:n]
+        scores[:n] = self._scores[:n]
+        self._ranks, self._scores = ranks, scores
+
+    def add_voters(self, voters):
+        """투표자를 추가 (투표는 기본 투표(순위 1..C, 점수 5)로 보지만 실제로 채우지는 않음)."""
+        voters = list(voters)
+        start = len(self.voters)
+        new_index = dict(zip(voters, range(start, start + len(voters))))
+        if len(new_index) != len(voters) or not self.voter_index.keys().isdisjoint(new_index):
+            duplicate = next(
+                v for offset, v in enumerate(voters) if v in self.voter_index or new_index[v] != start + offset
+            )
+            raise ValueError(f"투표자 이름은 중복될 수 없습니다: {duplicate}")
+        self._reserve(start + len(voters))
+        self.voter_index.update(new_index)
+        self.voters.extend(voters)
+        self._defaults_pending = self._defaults_pending or bool(voters)
+
+    def append_ballots(self, voters, ranks, scores):
+        """투표자 목록과 그 투표(후보 순서의 V×C 순위/점수 행렬)를 한 번에 추가."""
+        start = len(self.voters)
+        pending = self._defaults_pending
+        self.add_voters(voters)
+        self._ranks[start:len(self.voters)] = ranks
+        self._scores[start:len(self.voters)] = scores
+        self._defaults_pending = pending # 새 줄은 모두 기록됨
+
+    @functools.cached_property
+    def voter_index(self):
+        """투표자 이름 → 인덱스 (from_arrays로 만든 저장소에서 처음 이름으로 찾을 때 한 번 만듦)."""
+        return dict(zip(self.voters, range(len(self.voters))))
+
+    @functools.cached_property
+    def default_ballot(self):
+        """기본 투표 (후보 순서의 순위 1..C, 점수 5 배열, 읽기 전용). 처음 필요할 때 한 번만 만듦."""
+        ranks = np.arange(1, len(self.candidates) + 1, dtype=self._ranks.dtype)
+        scores = np.full(len(self.candidates), DEFAULT_SCORE, dtype=np.uint8)
+        ranks.flags.writeable = scores.flags.writeable = False
+        return ranks, scores
+
+    def _fill_defaults(self):
+        # 아직 기록되지 않은 줄(첫 후보 순위가 0)을 모두 기본 투표로 채움 (전체 행렬을 읽기 전에 한 번)
+        if not self._defaults_pending:
+            return
+        self._defaults_pending = False
+        n = len(self.voters)
+        if not self.candidates or not n:
+            return
+        unset = np.flatnonzero(self._ranks[:n, 0] == 0)
+        if len(unset):
+            self._ranks[unset], self._scores[unset] = self.default_ballot
+
+    def row(self, row):
+        """투표자 인덱스의 (순위, 점수) 배열 복사본 (기록 전이면 기본 투표, 다른 줄은 채우지 않음)."""
+        ranks = self._ranks[row]
+        if self.candidates and ranks[0] == 0:
+            return tuple(values.copy() for values in self.default_ballot)
+        return ranks.copy(), self._scores[row].copy()
+
+    def rows(self, rows):
+        """여러 투표자 인덱스의 (순위 행렬, 점수 행렬) 복사본 (기록 전인 줄은 기본 투표)."""
+        rows = np.asarray(rows, dtype=np.intp)
+        ranks, scores = self._ranks[rows], self._scores[rows]
+        if self.candidates and self._defaults_pending:
+            unset = ranks[:, 0] == 0
+            if unset.any():
+                ranks[unset], scores[unset] = self.default_ballot
+        return ranks, scores
+
+    def _row_values(self, values, low, high, label):
+        # {후보: 값} 딕셔너리를 후보 순서의 정수 배열로 변환 (없는 후보는 None)
+        row = [None] * len(self.candidates)
+        for candidate, value in values.items():
+            idx = self.candidate_index.get(candidate)
+            if idx is None:
+                raise KeyError(f"알 수 없는 후보입니다: {candidate}")
+            value = int(value)
+            if not low <= value <= high:
+                raise ValueError(f"{candidate}의 {label}({value})가 {low}~{high} 범위를 벗어났습니다.")
+            row[idx] = value
+        return row
+
+    def set_ranks(self, voter, ranks):
+        """투표자의 순위를 {후보: 순위} 형태로 기록 (주어지지 않은 후보는 기존 값 유지)."""
+        row = self._row_values(ranks, 1, len(self.candidates), "순위")
+        target = self._written_row(self._ranks, self.voter_index[voter])
+        for idx, value in enumerate(row):
+            if value is not None:
+                target[idx] = value
+
+    def set_scores(self, voter, scores):
+        """투표자의 점수를 {후보: 점수} 형태로 기록 (주어지지 않은 후보는 기존 값 유지)."""
+        row = self._row_values(scores, MIN_SCORE, MAX_SCORE, "점수")
+        target = self._written_row(self._scores, self.voter_index[voter])
+        for idx, value in enumerate(row):
+            if value is not None:
+                target[idx] = value
+
+    def set_rows(self, rows, ranks, scores):
+        """여러 투표자 인덱스(rows)의 순위/점수 행렬을 그대로 기록 (저장소에서 불러올 때 사용, 값 검사 없음)."""
+        self._ranks[rows] = ranks
+        self._scores[rows] = scores
+
+    def stored_arrays(self):
+        """기본 투표를 채우지 않은 V×C 순위/점수 행렬 (뷰, 기록 전인 줄은 0). 저장소 스냅샷용."""
+        n = len(self.voters)
+        return self._ranks[:n], self._scores[:n]
+
+    def _written_row(self, matrix, row):
+        # 일부 후보만 고치기 전에, 기록 전인 줄이면 기본 투표를 먼저 채워 두고 그 줄(뷰)을 반환
+        if self._defaults_pending and self.candidates and self._ranks[row, 0] == 0:
+            self._ranks[row], self._scores[row] = self.default_ballot
+        return matrix[row]
+
+    def set_row(self, row, ranks, scores):
+        """
+        투표자 인덱스(row)의 순위/점수를 후보 순서의 정수 배열로 한 번에 기록 (이름 조회 없이):
+        - 길이가 후보 수와 다르거나 값이 범위를 벗어나면 ValueError (저장된 값은 바뀌지 않음).
+        """
+        n_candidates = len(self.candidates)
+        ranks = np.asarray(ranks, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.int64)
+        if ranks.shape != (n_candidates,) or scores.shape != (n_candidates,):
+            raise ValueError(f"순위와 점수는 후보 수({n_candidates})만큼 있어야 합니다.")
+        if n_candidates and (ranks.min() < 1 or ranks.max() > n_candidates):
+            raise ValueError(f"순위가 1~{n_candidates} 범위를 벗어났습니다.")
+        if n_candidates and (scores.min() < MIN_SCORE or scores.max() > MAX_SCORE):
+            raise ValueError(f"점수가 {MIN_SCORE}~{MAX_SCORE} 범위를 벗어났습니다.")
+        if not 0 <= row < len(self.voters):
+            raise IndexError(f"투표자 인덱스가 범위를 벗어났습니다: {row}")
+        self._ranks[row] = ranks
+        self._scores[row] = scores
+
+    def ballot(self, voter):
+        """투표자의 투표를 기존 딕셔너리 형태로 반환."""
+        ranks, scores = self.row(self.voter_index[voter])
+        return {
+            'rank': dict(zip(self.candidates, ranks.tolist())),
+            'score': dict(zip(self.candidates, scores.tolist())),
+        }
+
+    def __getitem__(self, voter):
+        return self.ballot(voter)
+
+    def __contains__(self, voter):
+        return voter in self.voter_index
+
+    def __len__(self):
+        return len(self.voters)
+
+    @property
+    def ranks(self):
+        """V×C 순위 행렬 (뷰). 기록 전인 줄을 이때 기본 투표로 채우므로 저장소를 고침 (쓰기와 같은 잠금 필요)."""
+        self._fill_defaults()
+        return self._ranks[:len(self.voters)]
+
+    @property
+    def scores(self):
+        """V×C 점수 행렬 (뷰). 기록 전인 줄을 이때 기본 투표로 채우므로 저장소를 고침 (쓰기와 같은 잠금 필요)."""
+        self._fill_defaults()
+        return self._scores[:len(self.voters)]
+
+    # --- 집계 ---
+
+    def columns(self, candidates=None):
+        """후보 이름 목록을 열 인덱스 배열로 변환 (None이면 전체 후보 순서)."""
+        if candidates is None:
+            return np.arange(len(self.candidates))
+        return np.array([self.candidate_index[c] for c in candidates], dtype=np.intp)
+
+    def _select(self, matrix, candidates):
+        # 후보 순서가 저장 순서와 같으면 복사 없이 그대로, 아니면 C-연속 배열로 열을 골라냄
+        cols = self.columns(candidates)
+        if np.array_equal(cols, np.arange(len(self.candidates))):
+            return matrix
+        return np.ascontiguousarray(matrix[:, cols])
+
+    def rank_sums(self, candidates=None):
+        """후보별 순위 값 합계."""
+        return self._select(self.ranks, candidates).sum(axis=0, dtype=np.int64)
+
+    def score_sums(self, candidates=None):
+        """후보별 점수 합계."""
+        return self._select(self.scores, candidates).sum(axis=0, dtype=np.int64)
+
+    def min_scores(self, candidates=None):
+        """후보별 최저 점수 (투표가 없으면 inf)."""
+        if not len(self.voters):
+            return np.full(len(self.columns(candidates)), np.inf)
+        return self._select(self.scores, candidates).min(axis=0)
+
+    def score_counts(self, candidates=None):
+        """후보별 점수(0~10) 등장 횟수 C×11 행렬."""
+        return score_counts(self._select(self.scores, candidates))
+
+    def pairwise_matrix(self, candidates=None):
+        """선택한 후보 순서의 쌍대 선호 행렬 (P[a, b] = a를 b보다 선호한 투표자 수)."""
+        return pairwise_matrix(self._select(self.ranks, candidates))
+
+    def weighted_orders(self, candidates=None):
+        """같은 선호 순서의 투표를 묶은 (고유 선호 순서 행렬, 표 수). 후보 인덱스는 candidates 순서 기준."""
+        return group_orders(preference_orders(self._select(self.ranks, candidates)))
+
+    def first_choice_counts(self, candidates=None):
+        """
+        후보별 '단독 1순위' 득표 수:
+        - 순위 1을 정확히 한 후보에게만 준 투표만 집계 (Colab 콩도르세 방식과 동일).
+        """
+        return first_choice_counts(self.ranks)[self.columns(candidates)]
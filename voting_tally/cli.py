@@ -0,0 +1,127 @@
+"""
+투표 파일 집계 명령줄 도구:
+
+    python -m voting_tally ballots.parquet --method all --json
+
+- 파일 형식은 voting_tally.ballot_import 와 같음 ("voter", "rank_후보", "score_후보" 열).
+  앱에서 내려받은 .vote 보관 파일(voting_tally.election_archive)도 제출한 투표만 청크 단위로 집계
+  (파일 크기와 관계없이 상주 메모리가 청크 몇 개 분량).
+- numpy/pandas 는 인자 처리가 끝난 뒤에만 import 하므로 --help 등은 바로 응답.
+"""
+import argparse
+import json
+import sys
+
+# --method 로 고를 수 있는 이름 (methods.METHODS 키와 같음, 불러오지 않고 쓰려고 따로 둠)
+METHOD_NAMES = [
+    "borda_colab", "bentham_colab", "nash_colab", "condorcet_colab", "condorcet_pairwise",
+    "schulze", "ranked_pairs", "instant_runoff",
+    "borda", "bentham", "nash", "condorcet",
+]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="voting-tally",
+        description="CSV/Parquet 투표 파일이나 .vote 보관 파일을 Streamlit 없이 집계합니다.",
+    )
+    parser.add_argument("path", help="투표 파일 경로 (.csv, .parquet 또는 .vote 보관 파일)")
+    parser.add_argument(
+        "--method", default="all", choices=["all"] + METHOD_NAMES,
+        help="집계 방식 (all: 전체 방식 비교, 기본값)",
+    )
+    parser.add_argument("--nash-mode", default="log", choices=["log", "exact"], help="내쉬(Colab) 계산 모드")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="파일을 읽을 때 한 번에 처리할 행(보관 파일은 투표자) 수")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="집계에 쓸 프로세스 수 (2 이상이면 불러온 뒤 샤드로 나눠 병렬 집계, 0이면 CPU 수)",
+    )
+    return parser
+
+
+def tally_file(path, method="all", nash_mode="log", chunk_rows=None, workers=1):
+    """
+    파일(투표 파일 또는 .vote 보관 파일)을 읽어 집계한 결과를 JSON으로 바꿀 수 있는 딕셔너리로 반환:
+    - {"candidates", "n_rows", "n_ballots", "n_bad", "errors", "methods": {방식: {"scores", "winners"}}}
+    - method="all"이면 COMPARED_METHODS 전체와 "disagreeing"(다수와 승자가 다른 방식)을 포함.
+    - workers가 1이 아니면 불러오는 동안 집계하지 않고, 불러온 뒤 parallel_tally로 나눠 집계.
+    - .vote 보관 파일은 메모리에 불러오지 않고 archive_tally로 청크마다 집계 (workers도 그대로 적용).
+    """
+    from .election_archive import ARCHIVE_SUFFIX
+    from .methods import METHODS, compare_all_methods
+
+    parallel = workers != 1
+    if str(path).lower().endswith(ARCHIVE_SUFFIX):
+        # 보관 파일은 불러오지 않고 mmap 위에서 청크 단위로 집계 (즉석 결선은 같은 선호 순서 묶음도 함께 만듦)
+        from .archive_tally import MappedArchive, tally_archive
+        with MappedArchive(path) as archive:
+            n_rows = archive.n_voters
+        tally, orders = tally_archive(path, chunk_rows, workers, orders=method == "instant_runoff")
+        candidates, n_bad, errors = tally.candidates, 0, []
+    else:
+        from .ballot_import import IMPORT_CHUNK_ROWS, detect_format, import_ballots
+        ballots, tally, report = import_ballots(
+            path, detect_format(path), chunk_rows or IMPORT_CHUNK_ROWS, build_tally=not parallel
+        )
+        candidates, n_rows, n_bad, errors = ballots.candidates, report.n_rows, report.n_bad, report.errors
+        orders = None
+        if parallel:
+            from .parallel_tally import parallel_tally
+            tally = parallel_tally(candidates, ballots.ranks, ballots.scores, workers=workers or None)
+    result = {
+        "candidates": candidates,
+        "n_rows": n_rows,
+        "n_ballots": len(tally),
+        "n_bad": n_bad,
+        "errors": [{"row": row, "reason": reason} for row, reason in errors],
+    }
+    if method == "all":
+        comparison = compare_all_methods(tally, candidates)
+        result["methods"] = {
+            m: {"scores": comparison.scores[m], "winners": comparison.winners[m]} for m in comparison.scores
+        }
+        result["disagreeing"] = comparison.disagreeing
+    else:
+        if method == "nash_colab":
+            scores, winners = METHODS[method](tally, candidates, mode=nash_mode)
+        elif method == "instant_runoff" and orders is not None:
+            # 보관 파일: 청크마다 묶어 합친 선호 순서로 바로 진행 (투표를 메모리에 올리지 않음)
+            from .instant_runoff import instant_runoff, last_round_counts
+            scores, winners = {}, []
+            if len(tally):
+                irv = instant_runoff(candidates, *orders)
+                scores, winners = last_round_counts(irv, candidates), irv.winners
+        elif method == "instant_runoff":
+            scores, winners = METHODS[method](ballots, candidates) # 투표별 전체 순위가 필요
+        else:
+            scores, winners = METHODS[method](tally, candidates)
+        result["methods"] = {method: {"scores": scores, "winners": winners}}
+    return result
+
+
+def _print_text(result, out):
+    print(f"후보 {len(result['candidates'])}명, 투표 {result['n_ballots']}건 (잘못된 행 {result['n_bad']}개)", file=out)
+    for method, outcome in result["methods"].items():
+        winners = ", ".join(outcome["winners"]) or "(승자 없음)"
+        print(f"\n[{method}] 승자: {winners}", file=out)
+        for candidate, score in outcome["scores"].items():
+            print(f"  {candidate}\t{score}", file=out)
+    if result.get("disagreeing"):
+        print(f"\n방식에 따라 승자가 다릅니다: {', '.join(result['disagreeing'])}", file=out)
+
+
+def main(argv=None, out=None):
+    out = out or sys.stdout
+    args = build_parser().parse_args(argv)
+    try:
+        result = tally_file(args.path, args.method, args.nash_mode, args.chunk_rows, args.workers)
+    except (OSError, ValueError) as e:
+        print(f"voting-tally: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        json.dump(result, out, ensure_ascii=False, indent=2, default=float)
+        out.write("\n")
+    else:
+        _print_text(result, out)
+    return 0
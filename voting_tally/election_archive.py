@@ -0,0 +1,182 @@
+"""
+선거 보관 파일 (.vote):
+- 끝난 선거 전체(주제, 선택한 방식, 후보/투표자 이름, 순위/점수 행렬, 제출 여부)를 파일 하나에 담아 두었다가
+  나중에 다시 열어 다른 방식으로 집계.
+- 열(column) 단위 바이너리 형식: 매직 8바이트 + 헤더 길이(uint64) + JSON 헤더, 이어서 열마다 64바이트 경계에서 시작하는 원시 바이트.
+  · candidates / voters: 이름을 한 번씩만 담은 UTF-8 이름 표 ("\\0"으로 구분, 투표는 이름 대신 행/열 번호로 가리킴).
+  · completed: 제출 여부 비트맵 (투표자 8명당 1바이트).
+  · ranks / scores: BallotStore와 같은 dtype의 V×C 행렬 (리틀 엔디언, 기록 전인 줄은 0 그대로).
+- 경로로 열면 행렬을 np.memmap(copy-on-write)으로 연결만 하므로 투표 수와 관계없이 곧바로 열리고,
+  투표별 파이썬 객체를 만들지 않음 (집계할 때 읽은 부분만 메모리에 올라옴).
+"""
+import io
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from .ballot_store import BallotStore, rank_dtype_for
+
+ARCHIVE_SUFFIX = ".vote"
+ARCHIVE_MAGIC = b"VOTEARC\x01"
+ARCHIVE_VERSION = 1
+# 열 시작 위치 정렬 단위 (memmap으로 연 행렬이 캐시 줄 경계에서 시작하도록)
+ARCHIVE_ALIGN = 64
+# 이름 표의 구분 문자 (이름에 들어 있으면 내보낼 수 없음)
+NAME_SEPARATOR = "\0"
+
+_PREAMBLE_SIZE = len(ARCHIVE_MAGIC) + 8
+
+# 보관 파일에서 불러온 선거 (주제, 선택한 방식, BallotStore, 제출 여부 bool 배열)
+ElectionArchive = namedtuple("ElectionArchive", ["title", "method", "store", "completed"])
+
+
+def _aligned(offset):
+    return -(-offset // ARCHIVE_ALIGN) * ARCHIVE_ALIGN
+
+
+def _name_table(names, label):
+    # 이름 목록을 구분 문자로 이은 UTF-8 바이트열로 변환
+    for name in names:
+        if NAME_SEPARATOR in name:
+            raise ValueError(f"{label} 이름에 사용할 수 없는 문자가 있습니다: {name!r}")
+    return NAME_SEPARATOR.join(names).encode("utf-8")
+
+
+def read_names(data, count):
+    """이름 표 열의 바이트를 이름 목록으로 변환 (개수가 count와 다르면 ValueError)."""
+    if not count:
+        return []
+    names = bytes(data).decode("utf-8").split(NAME_SEPARATOR)
+    if len(names) != count:
+        raise ValueError("보관 파일의 이름 표가 손상되었습니다.")
+    return names
+
+
+def write_archive(target, title, store, completed, method=None):
+    """
+    선거를 보관 파일로 저장:
+    - target: 파일 경로(임시 파일에 쓴 뒤 바꿔치기) 또는 쓰기 가능한 바이너리 파일 객체.
+    - completed: 제출 여부 bool 배열, method: 마지막으로 선택한 결과 산출 방식 (없으면 None).
+    """
+    if not isinstance(target, (str, os.PathLike)):
+        _write_columns(target, title, store, completed, method)
+        return
+    tmp_path = f"{os.fspath(target)}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            _write_columns(f, title, store, completed, method)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_columns(f, title, store, completed, method):
+    n_candidates = len(store.candidates)
+    rank_dtype = np.dtype(rank_dtype_for(n_candidates)).newbyteorder("<")
+    ranks, scores = store.stored_arrays()
+    completed = np.asarray(completed, dtype=bool)
+    if len(completed) != len(store):
+        raise ValueError("제출 여부 배열의 길이가 투표자 수와 맞지 않습니다.")
+    columns = {
+        "candidates": _name_table(store.candidates, "후보"),
+        "voters": _name_table(store.voters, "투표자"),
+        "completed": np.packbits(completed),
+        "ranks": np.ascontiguousarray(ranks, dtype=rank_dtype),
+        "scores": np.ascontiguousarray(scores, dtype=np.uint8),
+    }
+    # 헤더 길이가 열 위치에 따라 바뀌지 않도록 위치는 데이터 영역 시작 기준으로 기록
+    layout, position = {}, 0
+    for name, data in columns.items():
+        layout[name] = [position, memoryview(data).nbytes]
+        position = _aligned(position + layout[name][1])
+    header = json.dumps({
+        "version": ARCHIVE_VERSION,
+        "title": title,
+        "method": method,
+        "n_candidates": n_candidates,
+        "n_voters": len(store),
+        "rank_dtype": rank_dtype.str,
+        "columns": layout,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(_PREAMBLE_SIZE + len(header))
+    f.write(ARCHIVE_MAGIC)
+    f.write(len(header).to_bytes(8, "little"))
+    f.write(header)
+    written = _PREAMBLE_SIZE + len(header)
+    for name, data in columns.items():
+        start = data_start + layout[name][0]
+        f.write(b"\0" * (start - written))
+        f.write(memoryview(data).cast("B"))
+        written = start + layout[name][1]
+
+
+def archive_bytes(title, store, completed, method=None):
+    """선거를 보관 파일 형식의 bytes로 반환 (내려받기용)."""
+    buffer = io.BytesIO()
+    _write_columns(buffer, title, store, completed, method)
+    return buffer.getvalue()
+
+
+def read_archive(source, mmap=True):
+    """
+    보관 파일을 ElectionArchive로 불러옴 (형식이 다르거나 잘렸으면 ValueError):
+    - source가 경로이고 mmap=True면 순위/점수 행렬을 복사 없이 np.memmap(mode="c")으로 연결
+      (고쳐 쓴 줄만 메모리에 사본이 생기고 파일은 바뀌지 않음).
+    - 파일 객체나 bytes면 한 번 읽어 들인 버퍼 위에 행렬을 만듦 (복사 한 번, 투표별 변환 없음).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if mmap and os.path.getsize(source) >= _PREAMBLE_SIZE: # 빈 파일은 memmap으로 열 수 없음
+            buffer = np.memmap(source, dtype=np.uint8, mode="c")
+        else:
+            with open(source, "rb") as f:
+                buffer = np.frombuffer(bytearray(f.read()), dtype=np.uint8)
+    else:
+        data = source if isinstance(source, (bytes, bytearray, memoryview)) else source.read()
+        buffer = np.frombuffer(bytearray(data), dtype=np.uint8)
+    header = read_header(buffer)
+    n_voters, n_candidates = header["n_voters"], header["n_candidates"]
+    rank_dtype = np.dtype(header["rank_dtype"])
+    ranks = archive_column(buffer, header, "ranks").view(rank_dtype).reshape(n_voters, n_candidates)
+    if not rank_dtype.isnative:
+        ranks = ranks.astype(rank_dtype.newbyteorder("="))
+    scores = archive_column(buffer, header, "scores").reshape(n_voters, n_candidates)
+    store = BallotStore.from_arrays(
+        read_names(archive_column(buffer, header, "candidates"), n_candidates),
+        read_names(archive_column(buffer, header, "voters"), n_voters),
+        ranks, scores,
+    )
+    completed = np.unpackbits(archive_column(buffer, header, "completed"), count=n_voters).view(bool)
+    return ElectionArchive(header["title"], header["method"], store, completed)
+
+
+def read_header(buffer):
+    """
+    보관 파일 버퍼(uint8 배열)의 헤더를 읽어 검사한 딕셔너리로 반환 (형식이 다르면 ValueError):
+    - "data_start": 열 데이터 영역의 시작 위치를 덧붙임 (열 위치는 이 위치 기준).
+    """
+    if len(buffer) < _PREAMBLE_SIZE or bytes(buffer[:len(ARCHIVE_MAGIC)]) != ARCHIVE_MAGIC:
+        raise ValueError("투표 보관 파일(.vote)이 아닙니다.")
+    header_size = int.from_bytes(bytes(buffer[len(ARCHIVE_MAGIC):_PREAMBLE_SIZE]), "little")
+    try:
+        header = json.loads(bytes(buffer[_PREAMBLE_SIZE:_PREAMBLE_SIZE + header_size]).decode("utf-8"))
+    except ValueError as e:
+        raise ValueError("보관 파일의 헤더가 손상되었습니다.") from e
+    if header.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"지원하지 않는 보관 파일 버전입니다: {header.get('version')}")
+    if np.dtype(header["rank_dtype"]).itemsize != np.dtype(rank_dtype_for(header["n_candidates"])).itemsize:
+        raise ValueError("보관 파일의 순위 형식이 후보 수와 맞지 않습니다.")
+    header["data_start"] = _aligned(_PREAMBLE_SIZE + header_size)
+    return header
+
+
+def archive_column(buffer, header, name):
+    """헤더가 가리키는 열의 원시 바이트 (버퍼의 uint8 뷰, 파일이 잘렸으면 ValueError)."""
+    offset, nbytes = header["columns"][name]
+    start = header["data_start"] + offset
+    if start + nbytes > len(buffer):
+        raise ValueError("보관 파일이 잘렸습니다.")
+    return buffer[start:start + nbytes]
@@ -0,0 +1,258 @@
+"""
+SQLite(WAL) 기반 선거 저장소:
+- 선거(주제, 후보, 투표자, 선택한 방식)와 투표자별 투표를 디스크에 보관해 새로고침·서버 재시작 후에도 이어서 진행.
+- 선거 행에 투표자 이름과 전체 V×C 행렬·완료 표시 스냅샷을 두고, 투표자 행은 스냅샷 이후 바뀐 투표자만 기록하는 변경분.
+  투표자 행은 처음 쓸 때 만들어지며 순위/점수를 후보 순서의 바이트(BLOB)로 저장하고, 쓰기마다 증가하는 seq로 골라 읽음.
+- 불러올 때 변경분이 많으면 스냅샷을 새로 써서, 큰 선거도 BLOB 몇 개만 읽어 복원.
+  파일에서 불러온 선거는 투표자 행 없이 스냅샷 하나로 저장.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from .ballot_store import BallotStore, rank_dtype_for
+
+# 데이터베이스 파일 경로 (환경 변수 VOTING_DB_PATH 로 변경 가능)
+DEFAULT_DB_PATH = os.environ.get("VOTING_DB_PATH", "voting.db")
+# 불러올 때 스냅샷 이후 변경된 투표자가 이 수 이상이면 스냅샷을 새로 씀
+SNAPSHOT_MIN_CHANGES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS elections (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    candidates TEXT NOT NULL,
+    voters TEXT NOT NULL,
+    method TEXT,
+    created_at REAL NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0,
+    snapshot_seq INTEGER NOT NULL DEFAULT 0,
+    snapshot_completed BLOB,
+    snapshot_ranks BLOB,
+    snapshot_scores BLOB
+);
+CREATE TABLE IF NOT EXISTS voters (
+    election_id TEXT NOT NULL REFERENCES elections(id) ON DELETE CASCADE,
+    voter_idx INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    ranks BLOB,
+    scores BLOB,
+    seq INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (election_id, voter_idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS voters_by_seq ON voters (election_id, seq);
+"""
+
+
+class ElectionStore:
+    """
+    선거/투표 영구 저장소:
+    - 스레드마다 별도 연결을 사용하므로 여러 Streamlit 세션(스레드)에서 같은 객체를 공유해도 됨.
+    - WAL 모드라 쓰는 동안에도 다른 연결의 읽기가 막히지 않음. 쓰기는 모두 트랜잭션 하나로 묶어 처리.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # 스레드별 연결을 재사용 (sqlite3 연결은 스레드 간 공유하지 않음)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """현재 스레드의 연결을 닫음."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- 쓰기 ---
+
+    @staticmethod
+    def _next_seq(conn, election_id):
+        # 트랜잭션 안에서 선거의 쓰기 번호를 하나 올려 반환 (없는 선거면 KeyError)
+        conn.execute("UPDATE elections SET seq = seq + 1 WHERE id = ?", (election_id,))
+        row = conn.execute("SELECT seq FROM elections WHERE id = ?", (election_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"선거를 찾을 수 없습니다: {election_id}")
+        return row[0]
+
+    def create_election(self, title, candidates, voters, election_id=None):
+        """선거와 투표자 목록을 저장하고 선거 ID를 반환 (투표는 아직 없으므로 투표자 행도 만들지 않음)."""
+        election_id = election_id or uuid.uuid4().hex[:12]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO elections (id, title, candidates, voters, created_at) VALUES (?, ?, ?, ?, ?)",
+                (election_id, title, json.dumps(list(candidates), ensure_ascii=False),
+                 json.dumps(list(voters), ensure_ascii=False), time.time()),
+            )
+        return election_id
+
+    def submit_ballots(self, election_id, ballots):
+        """
+        제출된 투표를 한 트랜잭션으로 저장:
+        - ballots: (투표자 인덱스, 후보 순서의 순위 배열, 점수 배열) 묶음.
+        - 순위 배열은 BallotStore와 같은 dtype이어야 함 (store.ranks의 행을 그대로 넘기면 됨).
+        - 이번 쓰기의 seq를 반환.
+        """
+        with self._connect() as conn:
+            seq = self._next_seq(conn, election_id)
+            conn.executemany(
+                "INSERT INTO voters (election_id, voter_idx, completed, ranks, scores, seq) VALUES (?, ?, 1, ?, ?, ?) "
+                "ON CONFLICT (election_id, voter_idx) DO UPDATE SET "
+                "completed = 1, ranks = excluded.ranks, scores = excluded.scores, seq = excluded.seq",
+                (
+                    (election_id, int(voter_idx), np.ascontiguousarray(ranks).tobytes(),
+                     np.asarray(scores, dtype=np.uint8).tobytes(), seq)
+                    for voter_idx, ranks, scores in ballots
+                ),
+            )
+        return seq
+
+    def withdraw_ballot(self, election_id, voter_idx):
+        """
+        제출한 투표를 미완료로 되돌림 (다시 입력할 때). 이번 쓰기의 seq를 반환.
+        - 스냅샷에만 있던 투표자는 순위/점수 없이 미완료 표시만 담은 행을 만듦 (불러올 때 스냅샷의 투표는 그대로 둠).
+        """
+        with self._connect() as conn:
+            seq = self._next_seq(conn, election_id)
+            conn.execute(
+                "INSERT INTO voters (election_id, voter_idx, completed, seq) VALUES (?, ?, 0, ?) "
+                "ON CONFLICT (election_id, voter_idx) DO UPDATE SET completed = 0, seq = excluded.seq",
+                (election_id, int(voter_idx), seq),
+            )
+        return seq
+
+    def save_store(self, election_id, store, completed):
+        """
+        BallotStore 전체와 완료 표시(bool 배열)를 한 트랜잭션으로 저장 (파일 불러오기 등):
+        - 투표자 행 없이 V×C 행렬과 완료 표시를 스냅샷 BLOB으로만 기록 (투표 수와 관계없이 쓰기 몇 번).
+        - 이번 쓰기의 seq를 반환.
+        """
+        completed = np.asarray(completed, dtype=bool)
+        with self._connect() as conn:
+            seq = self._next_seq(conn, election_id)
+            self._write_snapshot(conn, election_id, seq, store, completed)
+        return seq
+
+    @staticmethod
+    def _write_snapshot(conn, election_id, seq, store, completed):
+        # 더 새로운 스냅샷이 이미 있으면 덮어쓰지 않음 (기록 전인 투표는 0으로 저장되어 불러와도 기본 투표를 채우지 않음)
+        ranks, scores = store.stored_arrays()
+        conn.execute(
+            "UPDATE elections SET snapshot_seq = ?, snapshot_completed = ?, snapshot_ranks = ?, snapshot_scores = ? "
+            "WHERE id = ? AND snapshot_seq < ?",
+            (seq, completed.tobytes(), np.ascontiguousarray(ranks).tobytes(),
+             np.ascontiguousarray(scores).tobytes(), election_id, seq),
+        )
+
+    def set_method(self, election_id, method):
+        """마지막으로 선택한 결과 산출 방식을 저장."""
+        with self._connect() as conn:
+            conn.execute("UPDATE elections SET method = ? WHERE id = ?", (method, election_id))
+
+    def delete_election(self, election_id):
+        """선거와 모든 투표를 삭제."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM elections WHERE id = ?", (election_id,))
+
+    # --- 읽기 ---
+
+    def election_info(self, election_id):
+        """(주제, 후보 목록, 선택한 방식)을 반환 (없으면 None)."""
+        row = self._connect().execute(
+            "SELECT title, candidates, method FROM elections WHERE id = ?", (election_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def voters(self, election_id):
+        """투표자 이름 목록 (없는 선거면 None)."""
+        row = self._connect().execute("SELECT voters FROM elections WHERE id = ?", (election_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def changes_since(self, election_id, seq):
+        """
+        seq 이후 바뀐 투표자 행을 반환 (다른 프로세스의 쓰기를 메모리의 선거에 반영할 때):
+        - 반환: (현재 seq, [(투표자 인덱스, 완료 여부, 순위 BLOB, 점수 BLOB), ...]). 바뀐 게 없으면 행 목록은 빔.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute("SELECT seq FROM elections WHERE id = ?", (election_id,)).fetchone()
+            if row is None or row[0] <= seq:
+                return seq, []
+            changed = conn.execute(
+                "SELECT voter_idx, completed, ranks, scores FROM voters WHERE election_id = ? AND seq > ?",
+                (election_id, seq),
+            ).fetchall()
+        finally:
+            conn.commit()
+        return row[0], changed
+
+    def load_election(self, election_id):
+        """
+        선거 전체를 불러옴:
+        - 반환: (주제, 선택한 방식, BallotStore, 완료 표시 bool 배열, 불러온 시점의 seq). 선거가 없으면 None.
+        - 스냅샷 BLOB을 행렬로 바로 변환한 뒤 스냅샷 이후 바뀐 투표자 행만 덮어씀.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN") # 스냅샷과 변경분을 같은 시점으로 읽음
+        try:
+            row = conn.execute(
+                "SELECT title, candidates, voters, method, seq, snapshot_seq, "
+                "snapshot_completed, snapshot_ranks, snapshot_scores FROM elections WHERE id = ?",
+                (election_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            title, candidates, voters, method, seq, snapshot_seq = row[:6]
+            changed = conn.execute(
+                "SELECT voter_idx, completed, ranks, scores FROM voters WHERE election_id = ? AND seq > ?",
+                (election_id, snapshot_seq),
+            ).fetchall()
+        finally:
+            conn.commit()
+
+        store = BallotStore(json.loads(candidates), json.loads(voters))
+        n_candidates = len(store.candidates)
+        rank_dtype = rank_dtype_for(n_candidates)
+        if row[7] is not None:
+            completed = np.frombuffer(row[6], dtype=bool).copy()
+            store.set_rows(
+                slice(None, len(store)),
+                np.frombuffer(row[7], dtype=rank_dtype).reshape(-1, n_candidates),
+                np.frombuffer(row[8], dtype=np.uint8).reshape(-1, n_candidates),
+            )
+        else:
+            completed = np.zeros(len(store), dtype=bool)
+
+        if changed:
+            rows = np.array([r[0] for r in changed], dtype=np.intp)
+            completed[rows] = [bool(r[1]) for r in changed]
+            stored = [i for i, r in enumerate(changed) if r[2] is not None]
+            if stored:
+                store.set_rows(
+                    rows[stored],
+                    np.frombuffer(b"".join(changed[i][2] for i in stored), dtype=rank_dtype).reshape(-1, n_candidates),
+                    np.frombuffer(b"".join(changed[i][3] for i in stored), dtype=np.uint8).reshape(-1, n_candidates),
+                )
+            if len(changed) >= SNAPSHOT_MIN_CHANGES:
+                with conn:
+                    self._write_snapshot(conn, election_id, seq, store, completed)
+        return title, method, store, completed, seq
@@ -0,0 +1,286 @@
+"""
+투표 수집 API (asyncio HTTP 서버, 표준 라이브러리만 사용):
+- 키오스크나 외부 연동이 Streamlit 화면 없이 투표를 제출하는 로컬 서버. Streamlit 앱과 같은 SQLite 저장소를 사용.
+- POST /elections/<투표 ID>/ballots 로 {'voter': 이름, 'rank': {...}, 'score': {...}} 하나,
+  그 목록, 또는 {'ballots': [...]}를 받아 검증한 뒤 큐에 넣음 (요청 안에 잘못된 투표가 있으면 전체를 거절).
+- 쓰기 작업이 큐에 쌓인 요청을 모아 선거별로 한 트랜잭션씩 기록하고, 기록이 끝나면 응답.
+- 큐가 가득 차면 ENQUEUE_TIMEOUT 동안 기다렸다가 그래도 자리가 없으면 503(Retry-After)으로 응답.
+- 실행: python -m voting_tally.ingest_server --port 8502 [--db voting.db]
+"""
+import argparse
+import asyncio
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from .ballot_store import MAX_SCORE, MIN_SCORE, rank_dtype_for
+from .election_store import DEFAULT_DB_PATH, ElectionStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+# 큐에 쌓일 수 있는 요청 수 / 요청 하나의 최대 투표 수 (합쳐서 메모리에 대기하는 투표 수의 상한)
+QUEUE_MAX_REQUESTS = 1024
+MAX_BALLOTS_PER_REQUEST = 1000
+# 쓰기 한 번에 모으는 최대 투표 수
+BATCH_MAX_BALLOTS = 5000
+# 큐에 자리가 날 때까지 기다리는 최대 시간(초)
+ENQUEUE_TIMEOUT = 1.0
+MAX_BODY_BYTES = 8 << 20
+
+# 검증에 필요한 선거 정보 (처음 요청 때 한 번 읽어 재사용)
+ElectionInfo = namedtuple("ElectionInfo", ["candidates", "voter_index", "rank_dtype"])
+# 큐에 넣는 요청 하나: (선거 ID, [(투표자 인덱스, 순위 배열, 점수 배열)], 기록 완료 future)
+PendingBallots = namedtuple("PendingBallots", ["election_id", "ballots", "future"])
+
+
+class RequestError(Exception):
+    """HTTP 오류 응답으로 돌려줄 요청 오류 (status, 내용)."""
+
+    def __init__(self, status, payload, headers=None):
+        super().__init__(payload)
+        self.status = status
+        self.payload = payload
+        self.headers = headers or {}
+
+
+def _int_values(values, candidates, label):
+    # {후보: 정수} 딕셔너리를 후보 순서의 리스트로 (모든 후보가 있어야 하고, 다른 이름은 안 됨)
+    if not isinstance(values, dict) or values.keys() != set(candidates):
+        raise ValueError(f"{label}에는 모든 후보({', '.join(candidates)})의 값이 있어야 합니다.")
+    row = [values[c] for c in candidates]
+    if not all(type(v) is int for v in row):
+        raise ValueError(f"{label} 값은 정수여야 합니다.")
+    return row
+
+
+def ballot_arrays(info, ballot):
+    """
+    기존 {'rank': ..., 'score': ...} 모양의 투표 하나를 검증해 (투표자 인덱스, 순위 배열, 점수 배열)로 변환:
+    - 순위는 1..후보 수를 한 번씩, 점수는 MIN_SCORE..MAX_SCORE 정수. 잘못되면 ValueError.
+    """
+    if not isinstance(ballot, dict):
+        raise ValueError("투표는 JSON 객체여야 합니다.")
+    voter = ballot.get("voter")
+    if not isinstance(voter, str):
+        raise ValueError("voter는 투표자 이름(문자열)이어야 합니다.")
+    row = info.voter_index.get(voter)
+    if row is None:
+        raise ValueError(f"등록되지 않은 투표자입니다: {ballot.get('voter')}")
+    ranks = _int_values(ballot.get("rank"), info.candidates, "rank")
+    if sorted(ranks) != list(range(1, len(info.candidates) + 1)):
+        raise ValueError("각 후보는 1부터 후보 수까지의 고유한 순위를 가져야 합니다.")
+    scores = _int_values(ballot.get("score"), info.candidates, "score")
+    if not all(MIN_SCORE <= v <= MAX_SCORE for v in scores):
+        raise ValueError(f"점수는 {MIN_SCORE}~{MAX_SCORE} 사이여야 합니다.")
+    return row, np.array(ranks, dtype=info.rank_dtype), np.array(scores, dtype=np.uint8)
+
+
+class IngestServer:
+    """
+    투표 수집 서버:
+    - 요청 처리(파싱·검증)는 이벤트 루프에서, SQLite 쓰기는 전용 스레드 하나에서 진행.
+    - 쓰기가 진행되는 동안 들어온 요청은 큐에 쌓였다가 다음 쓰기에 한꺼번에 기록되므로 요청이 몰릴수록 배치가 커짐.
+    """
+
+    def __init__(self, election_store):
+        self.election_store = election_store
+        self.queue = asyncio.Queue(QUEUE_MAX_REQUESTS)
+        self._elections = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ballot-writer")
+
+    async def _run_blocking(self, func, *args):
+        # 저장소 호출은 모두 쓰기 스레드에서 (스레드별 SQLite 연결 하나만 사용)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _election(self, election_id):
+        info = self._elections.get(election_id)
+        if info is None:
+            election = await self._run_blocking(self.election_store.election_info, election_id)
+            if election is None:
+                return None
+            voters = await self._run_blocking(self.election_store.voters, election_id)
+            candidates = election[1]
+            info = ElectionInfo(candidates, {v: i for i, v in enumerate(voters)}, rank_dtype_for(len(candidates)))
+            self._elections[election_id] = info
+        return info
+
+    # --- 쓰기 ---
+
+    def _write_batch(self, ballots_by_election):
+        # 쓰기 스레드에서 실행: 선거별로 한 트랜잭션씩 기록하고 선거 ID → seq(또는 예외)를 반환
+        results = {}
+        for election_id, ballots in ballots_by_election.items():
+            try:
+                results[election_id] = self.election_store.submit_ballots(election_id, ballots)
+            except Exception as e:
+                results[election_id] = e
+        return results
+
+    async def writer(self):
+        """큐에서 요청을 모아 (최대 BATCH_MAX_BALLOTS 투표) 기록하고 각 요청에 결과를 알림."""
+        while True:
+            batch = [await self.queue.get()]
+            n_ballots = len(batch[0].ballots)
+            while n_ballots < BATCH_MAX_BALLOTS and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                n_ballots += len(batch[-1].ballots)
+
+            ballots_by_election = {}
+            for pending in batch:
+                ballots_by_election.setdefault(pending.election_id, []).extend(pending.ballots)
+            try:
+                results = await self._run_blocking(self._write_batch, ballots_by_election)
+            except Exception as e:
+                results = dict.fromkeys(ballots_by_election, e)
+
+            for pending in batch:
+                result = results[pending.election_id]
+                if not pending.future.done(): # 연결이 끊긴 요청은 건너뜀
+                    if isinstance(result, Exception):
+                        pending.future.set_exception(result)
+                    else:
+                        pending.future.set_result(result)
+                self.queue.task_done()
+
+    # --- 요청 처리 ---
+
+    async def submit(self, election_id, body):
+        """POST /elections/<id>/ballots: 검증 → 큐 → 기록 완료 후 {'accepted': 투표 수, 'seq': 쓰기 번호}."""
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, {"error": "본문이 올바른 JSON이 아닙니다."})
+        if isinstance(data, dict):
+            ballots = data["ballots"] if "ballots" in data else [data]
+        else:
+            ballots = data
+        if not isinstance(ballots, list) or not ballots:
+            raise RequestError(HTTPStatus.BAD_REQUEST, {"error": "투표가 없습니다."})
+        if len(ballots) > MAX_BALLOTS_PER_REQUEST:
+            raise RequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {"error": f"한 요청에 최대 {MAX_BALLOTS_PER_REQUEST}개의 투표만 보낼 수 있습니다."},
+            )
+
+        info = await self._election(election_id)
+        if info is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, {"error": f"투표를 찾을 수 없습니다: {election_id}"})
+        rows, errors = [], []
+        for index, ballot in enumerate(ballots):
+            try:
+                rows.append(ballot_arrays(info, ballot))
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+        if errors:
+            raise RequestError(HTTPStatus.BAD_REQUEST, {"errors": errors})
+
+        pending = PendingBallots(election_id, rows, asyncio.get_running_loop().create_future())
+        try:
+            await asyncio.wait_for(self.queue.put(pending), ENQUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE, {"error": "요청이 많아 잠시 후 다시 시도해주세요."},
+                {"Retry-After": "1"},
+            )
+        seq = await pending.future
+        return {"accepted": len(rows), "seq": seq}
+
+    async def route(self, method, path, body):
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if method == "GET" and parts == ["health"]:
+            return {"queued_requests": self.queue.qsize()}
+        if len(parts) == 3 and parts[0] == "elections" and parts[2] == "ballots":
+            if method != "POST":
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "POST만 지원합니다."}, {"Allow": "POST"})
+            return await self.submit(parts[1], body)
+        raise RequestError(HTTPStatus.NOT_FOUND, {"error": "없는 경로입니다."})
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Connection: " + ("keep-alive" if keep_alive else "close"),
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def handle_connection(self, reader, writer):
+        """HTTP/1.1 연결 하나 (keep-alive로 여러 요청을 이어서 처리)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    self._write_response(writer, HTTPStatus.BAD_REQUEST, {"error": "잘못된 요청입니다."}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    self._write_response(
+                        writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "본문이 너무 큽니다."}, False
+                    )
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                try:
+                    status, payload, extra_headers = HTTPStatus.OK, await self.route(method, path, body), None
+                except RequestError as e:
+                    status, payload, extra_headers = e.status, e.payload, e.headers
+                except Exception as e:
+                    status, payload, extra_headers = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}, None
+                self._write_response(writer, status, payload, keep_alive, extra_headers)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """서버를 열고 쓰기 작업과 함께 계속 실행."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        writer_task = asyncio.create_task(self.writer())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+            self._executor.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="voting-tally-ingest",
+        description="투표를 HTTP(POST /elections/<투표 ID>/ballots)로 받아 선거 저장소에 기록합니다.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"기본값: {DEFAULT_HOST}")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"기본값: {DEFAULT_PORT}")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"SQLite 파일 (기본값: {DEFAULT_DB_PATH})")
+    args = parser.parse_args(argv)
+    print(f"투표 수집 API: http://{args.host}:{args.port}/elections/<투표 ID>/ballots")
+    try:
+        asyncio.run(IngestServer(ElectionStore(args.db)).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""
+즉석 결선 투표(IRV, 선호 투표):
+- 투표를 선호 순서(1순위 후보, 2순위 후보, ...)의 정수 배열로 보고, 같은 순서의 투표는 한 줄로 묶어 표 수(가중치)로 셈.
+- 묶은 줄마다 '현재 지지 후보'의 위치를 가리키는 포인터를 두고, 후보가 탈락하면 그 후보를 가리키던 줄의 포인터만
+  다음 생존 후보로 옮김. 라운드마다 모든 투표의 순위를 다시 훑지 않으므로 라운드 비용은 고유 순서 수에 비례.
+- 라운드별 득표와 탈락 후보의 표가 어느 후보로 옮겨갔는지(이양표)를 함께 기록.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# 한 라운드 ({후보: 득표}, 탈락 후보 목록, {탈락 후보: {받은 후보: 표 수}}, 이번에 소진된 표 수)
+# 소진된 표: 남은 선호 후보가 모두 탈락해 더 옮겨갈 곳이 없는 표
+IRVRound = namedtuple("IRVRound", ["counts", "eliminated", "transfers", "exhausted"])
+# 즉석 결선 결과 (라운드 목록, 당선 후보 목록)
+IRVResult = namedtuple("IRVResult", ["rounds", "winners"])
+
+
+def instant_runoff(candidates, orders, weights=None):
+    """
+    선호 순서 행렬(줄마다 후보 인덱스, 1순위부터)과 줄별 표 수로 즉석 결선 투표를 진행:
+    - 열이 후보 수보다 적으면 앞쪽 선호만 적은 투표로 보고, 적은 후보가 모두 탈락한 표는 소진됨.
+    - 남은 유효표의 과반을 얻은 후보가 있으면 당선.
+    - 없으면 최소 득표 후보를 탈락시키고 (최소 득표가 같은 후보는 함께 탈락) 그 표를 다음 선호 후보로 옮김.
+    - 남은 후보가 모두 최소 득표로 같거나 유효표가 없으면 남은 후보 모두가 동률 당선.
+    - weights가 None이면 줄마다 1표. 반환: IRVResult.
+    """
+    n_candidates = len(candidates)
+    orders = np.asarray(orders)
+    n_rows = len(orders)
+    depth = orders.shape[1] if orders.ndim == 2 else n_candidates # 줄마다 적은 선호 수
+    weights = np.ones(n_rows, dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+    if not n_candidates:
+        return IRVResult([], [])
+
+    flat_orders = np.ascontiguousarray(orders).ravel()
+    position = np.zeros(n_rows, dtype=np.intp) # 줄마다 현재 지지 후보의 선호 순위 위치
+    current = orders[:, 0].astype(np.intp) if n_rows else np.zeros(0, dtype=np.intp)
+    exhausted = np.zeros(n_rows, dtype=bool)
+    active = np.ones(n_candidates, dtype=bool)
+    counts = np.bincount(current, weights=weights, minlength=n_candidates).astype(np.int64)
+    # 후보별로 그 후보를 지지 중인 줄 번호 배열 목록 (탈락 시 이 줄들만 옮김)
+    supporters = _group_rows(np.arange(n_rows, dtype=np.intp), current, n_candidates)
+    rounds = []
+
+    while True:
+        round_counts = {candidates[i]: int(counts[i]) for i in np.flatnonzero(active)}
+        total = int(counts[active].sum())
+        leader = counts[active].max()
+        lowest = counts[active].min()
+        if total == 0 or leader * 2 > total or lowest == leader:
+            # 과반 당선, 또는 남은 후보가 모두 같은 득표 (유효표가 없는 경우 포함)
+            winners = [candidates[i] for i in np.flatnonzero(active & (counts == leader))]
+            rounds.append(IRVRound(round_counts, [], {}, 0))
+            return IRVResult(rounds, winners)
+
+        losers = active & (counts == lowest)
+        active &= ~losers
+        counts[losers] = 0
+
+        # 탈락 후보를 지지하던 줄만 다음 생존 후보로 포인터를 옮김
+        moving = [rows for i in np.flatnonzero(losers) for rows in supporters[i]]
+        moving = np.concatenate(moving) if moving else np.zeros(0, dtype=np.intp)
+        from_candidates = current[moving]
+        pending = moving
+        while len(pending):
+            next_position = position[pending] + 1
+            done = next_position >= depth
+            if done.any():
+                exhausted[pending[done]] = True
+                pending, next_position = pending[~done], next_position[~done]
+            position[pending] = next_position
+            next_candidates = flat_orders[pending * depth + next_position]
+            current[pending] = next_candidates
+            pending = pending[~active[next_candidates]]
+
+        # 이양표: (탈락 후보, 받은 후보) 쌍별 표 수. 소진된 표는 받은 후보 자리를 n_candidates로 둠
+        to_candidates = np.where(exhausted[moving], n_candidates, current[moving])
+        moved_votes = np.bincount(
+            from_candidates * (n_candidates + 1) + to_candidates, weights=weights[moving],
+            minlength=n_candidates * (n_candidates + 1),
+        ).astype(np.int64).reshape(n_candidates, n_candidates + 1)
+        counts += moved_votes[:, :-1].sum(axis=0)
+        transferred = moving[~exhausted[moving]]
+        for i, rows in enumerate(_group_rows(transferred, current[transferred], n_candidates)):
+            supporters[i].extend(rows)
+        for i in np.flatnonzero(losers):
+            supporters[i] = []
+
+        transfers = {
+            candidates[f]: {candidates[t]: int(moved_votes[f, t]) for t in np.flatnonzero(moved_votes[f, :-1])}
+            for f in np.flatnonzero(losers)
+        }
+        rounds.append(IRVRound(
+            round_counts, [candidates[i] for i in np.flatnonzero(losers)], transfers, int(moved_votes[:, -1].sum())
+        ))
+
+
+def _group_rows(rows, targets, n_candidates):
+    # 줄 번호를 지지 후보별로 나눠 [[후보 0의 줄 배열], [후보 1의 줄 배열], ...] 로 반환
+    order = np.argsort(targets, kind="stable")
+    bounds = np.cumsum(np.bincount(targets, minlength=n_candidates))[:-1]
+    return [[part] if len(part) else [] for part in np.split(rows[order], bounds)]
+
+
+def last_round_counts(result, candidates):
+    """후보별로 마지막으로 남아 있던 라운드의 득표 ({후보: 표 수}, 후보 순서)."""
+    counts = {}
+    for irv_round in result.rounds:
+        counts.update(irv_round.counts)
+    return {c: counts.get(c, 0) for c in candidates}
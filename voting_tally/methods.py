@@ -0,0 +1,433 @@
+"""
+투표 방식별 계산 함수 (Streamlit 없이 import 가능):
+- *_colab_style: final.py 앱의 Colab 방식 (보르다 순위합, 벤담 총점, 내쉬 곱, 1순위 기반 콩도르세).
+- calculate_borda / bentham / nash / condorcet: voting_app.py 앱의 방식 (점수합, 효용 비율, 최저점 최대화, 쌍대 비교).
+- calculate_schulze / ranked_pairs: 쌍대 선호 행렬로 순환·동률도 가리는 콩도르세 계열 방식.
+- calculate_instant_runoff: 최소 득표 후보를 탈락시키며 표를 옮기는 즉석 결선 투표 (투표별 전체 순위 필요).
+- 모든 함수는 votes 자리에 기존 딕셔너리, BallotStore, BallotPatterns(같은 투표 묶음), RunningTally 중 무엇이든 받음.
+"""
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from .ballot_patterns import BallotPatterns
+from .ballot_store import (
+    BallotStore, MAX_SCORE, copeland_wins, nash_exact_winners, nash_log_sums, nash_log_winners, ranked_pairs_lock,
+    schulze_strengths,
+)
+from .instant_runoff import instant_runoff, last_round_counts
+from .running_tally import RunningTally, TALLY_SOURCES
+
+# --- Colab 방식 투표 계산 함수들 (final.py) ---
+
+def calculate_borda_colab_style(votes, candidates):
+    """
+    Colab 방식 보르다 계산:
+    - 각 투표자의 순위 값을 그대로 사용 (1순위=1점, 2순위=2점...).
+    - 각 후보의 순위 값 합계가 가장 *작은* 후보가 승자.
+    - Streamlit의 votes 구조: votes[voter]['rank'] = {후보명: 순위값}
+    - votes 자리에 BallotStore/RunningTally를 넘기면 순위 합계를 바로 사용.
+    """
+    option_ranking_sum = {c: 0 for c in candidates}
+
+    if not votes or not candidates:
+        return {}, []
+
+    if isinstance(votes, TALLY_SOURCES):
+        option_ranking_sum = dict(zip(candidates, votes.rank_sums(candidates).tolist()))
+        min_sum_rank = min(option_ranking_sum.values())
+        return option_ranking_sum, [c for c, s in option_ranking_sum.items() if s == min_sum_rank]
+
+    for voter_data in votes.values():
+        # voter_data['rank']는 {후보: 순위} 형태
+        for candidate_name, rank_value in voter_data['rank'].items():
+            if candidate_name in option_ranking_sum:
+                try: # rank_value가 숫자인지 확인
+                    option_ranking_sum[candidate_name] += int(rank_value) # 순위 값 자체를 더함
+                except (ValueError, TypeError):
+                    # 숫자가 아닌 경우 오류를 로깅하거나 기본값 처리 (예: 건너뛰기)
+                    # st.warning(f"경고: {voter_data}의 {candidate_name} 순위({rank_value})가 숫자가 아닙니다.")
+                    pass # 또는 특정 값으로 처리
+
+
+    if not option_ranking_sum:
+        return {}, []
+
+    valid_scores = [s for s in option_ranking_sum.values() if isinstance(s, (int, float))]
+    if not valid_scores: # 모든 점수가 유효하지 않으면
+         # 모든 후보의 점수가 0이거나 유효하지 않은 경우, 동점 처리 또는 빈 결과 반환
+        if all(s == 0 for s in option_ranking_sum.values()):
+            return option_ranking_sum, list(candidates) # 모든 후보를 동점자로 반환
+        return {}, []
+
+
+    try:
+        min_sum_rank = min(valid_scores) # 유효한 점수 중에서 최소값 찾기
+        winners = [c for c, s in option_ranking_sum.items() if s == min_sum_rank and isinstance(s, (int, float))]
+    except ValueError: # valid_scores가 비어있을 때 발생 가능
+        return {}, []
+
+    return option_ranking_sum, winners
+
+
+def calculate_bentham_colab_style(votes, candidates):
+    """
+    Colab 방식 벤담 계산 (Streamlit의 기존 벤담과 유사):
+    - 각 투표자가 후보에게 부여한 'score' (선호도 점수)를 합산.
+    - 총점이 가장 *높은* 후보가 승자.
+    - Streamlit의 votes 구조: votes[voter]['score'] = {후보명: 점수값}
+    - votes 자리에 BallotStore/RunningTally를 넘기면 점수 합계를 바로 사용.
+    """
+    option_scores = {c: 0 for c in candidates}
+
+    if not votes or not candidates:
+        return {}, []
+
+    if isinstance(votes, TALLY_SOURCES):
+        option_scores = dict(zip(candidates, votes.score_sums(candidates).astype(float).tolist()))
+        max_total_score = max(option_scores.values())
+        return option_scores, [c for c, s in option_scores.items() if s == max_total_score]
+
+    for voter_data in votes.values():
+        for candidate_name, score_value in voter_data['score'].items():
+            if candidate_name in option_scores:
+                try:
+                    option_scores[candidate_name] += float(score_value)
+                except (ValueError, TypeError):
+                    # st.warning(f"경고: {voter_data}의 {candidate_name} 점수({score_value})가 숫자가 아닙니다.")
+                    pass
+
+
+    if not option_scores:
+        return {}, []
+    
+    valid_scores = [s for s in option_scores.values() if isinstance(s, (int, float))]
+    if not valid_scores:
+        if all(s == 0 for s in option_scores.values()):
+            return option_scores, list(candidates)
+        return {}, []
+
+
+    try:
+        max_total_score = max(valid_scores)
+        winners = [c for c, s in option_scores.items() if s == max_total_score and isinstance(s, (int, float))]
+    except ValueError: # valid_scores가 비어있을 때
+        return {}, []
+        
+    return option_scores, winners
+
+
+def count_scores_colab_style(votes, candidates):
+    """
+    내쉬 계산용 점수 등장 횟수:
+    - 후보별로 0~10점이 각각 몇 번 나왔는지 C×11 행렬로 반환 (투표 집합당 한 번만 순회).
+    - 숫자가 아닌 점수는 건너뛰고, 0~10 정수가 아닌 점수는 ValueError.
+    - votes 자리에 BallotStore/RunningTally를 넘기면 저장된 집계를 바로 사용.
+    """
+    if isinstance(votes, TALLY_SOURCES):
+        return votes.score_counts(candidates)
+
+    column_of = {c: i for i, c in enumerate(candidates)}
+    counts = np.zeros((len(candidates), MAX_SCORE + 1), dtype=np.int64)
+    for voter_data in votes.values():
+        for candidate_name, score_value in voter_data['score'].items():
+            if candidate_name not in column_of:
+                continue
+            try:
+                current_score = float(score_value) # 명시적 float 변환
+            except (ValueError, TypeError):
+                continue # 곱셈에 영향을 주지 않도록 해당 투표자의 이 후보 점수는 무시
+            if not current_score.is_integer() or not 0 <= current_score <= MAX_SCORE:
+                raise ValueError(f"{candidate_name}의 점수({score_value})는 0~{MAX_SCORE} 사이 정수여야 합니다.")
+            counts[column_of[candidate_name], int(current_score)] += 1
+    return counts
+
+
+def calculate_nash_colab_style(votes, candidates, mode="log"):
+    """
+    Colab 방식 내쉬 계산:
+    - 각 후보에 대해, 모든 투표자가 부여한 'score'를 *곱함*.
+    - 곱한 값이 가장 *높은* 후보가 승자.
+    - 주의: 점수 중 0이 있으면 전체 곱이 0이 됨. Colab 코드에는 이 처리 없음.
+           여기서는 0점일 경우 매우 작은 값(0.00001)으로 대체.
+    - 곱을 그대로 계산하면 투표자가 수백 명만 돼도 overflow/underflow 되므로,
+      점수별 등장 횟수를 센 뒤 곱 대신 log(곱)을 후보 전체에 대해 벡터로 계산.
+      반환 점수는 log(곱) 값.
+    - mode="log"(기본): log(곱)으로 승자 비교 (부동소수 오차 범위 안은 동률).
+      mode="exact": 곱을 소인수 지수 벡터로 정확히 비교해 동률을 판정.
+    """
+    if mode not in ("log", "exact"):
+        raise ValueError(f"알 수 없는 내쉬 계산 모드입니다: {mode}")
+
+    if not votes or not candidates:
+        return {}, []
+
+    counts = count_scores_colab_style(votes, candidates)
+    log_sums = nash_log_sums(counts)
+    option_log_score = dict(zip(candidates, log_sums.tolist()))
+
+    if mode == "exact":
+        winner_indices = nash_exact_winners(counts)
+    else:
+        winner_indices = nash_log_winners(log_sums)
+
+    return option_log_score, [candidates[i] for i in winner_indices]
+
+
+def count_first_choices_colab_style(votes, candidates):
+    """
+    Colab 방식 콩도르세용 1순위 득표 히스토그램:
+    - 투표자마다 한 번만 유효 순위(숫자)의 최소값을 구하고, 순위 1인 후보가 *단 한 명*일 때만 그 후보에 1표.
+    - 후보 목록에 없는 후보의 1순위 표는 버림.
+    - votes 자리에 BallotStore/RunningTally를 넘기면 저장된 집계를 바로 사용.
+    """
+    if isinstance(votes, TALLY_SOURCES):
+        return dict(zip(candidates, votes.first_choice_counts(candidates).tolist()))
+
+    first_choice_counts = {c: 0 for c in candidates}
+    for voter_data in votes.values():
+        ranks = voter_data.get('rank', {})
+        if not ranks: continue
+
+        # rank 값이 숫자인지 확인 후 처리
+        valid_ranks = {cand: r_val for cand, r_val in ranks.items() if isinstance(r_val, (int, float))}
+        if not valid_ranks: continue
+
+        min_rank_val = min(valid_ranks.values()) # 유효한 순위 중 최소값
+        current_voter_first_choices = [
+            candidate for candidate, rank_val in valid_ranks.items()
+            if rank_val == min_rank_val and rank_val == 1 # 1순위인 후보들
+        ]
+        if len(current_voter_first_choices) == 1 and current_voter_first_choices[0] in first_choice_counts:
+            first_choice_counts[current_voter_first_choices[0]] += 1
+    return first_choice_counts
+
+
+def calculate_condorcet_colab_style(votes, candidates):
+    """
+    Colab 방식 콩도르세 계산:
+    - 모든 후보 쌍에 대해 (A, B) 대결.
+    - 각 대결에서 투표자의 *1순위 선택*만을 기준으로 승자 결정.
+      (A를 1순위로 뽑은 사람 수 vs B를 1순위로 뽑은 사람 수)
+    - 각 pairwise 대결의 승자들을 모아, 가장 많이 등장한(이긴) 후보가 최종 승자.
+    - 1순위 득표는 count_first_choices_colab_style로 투표 집합당 한 번만 세고,
+      대결은 길이 C의 히스토그램끼리 비교 (O(C²)). 동률 대결은 승자 없음.
+    - Streamlit의 votes 구조: votes[voter]['rank'] = {후보명: 순위값}
+    """
+    if len(candidates) < 2 or not votes:
+        return {c: 0 for c in candidates}, []
+
+    first_choice_counts = count_first_choices_colab_style(votes, candidates)
+
+    colab_style_pairwise_winners_list = []
+    for i in range(len(candidates)):
+        for j in range(len(candidates)):
+            if i == j:
+                continue
+            c1, c2 = candidates[i], candidates[j]
+            if first_choice_counts[c1] > first_choice_counts[c2]:
+                colab_style_pairwise_winners_list.append(c1)
+            elif first_choice_counts[c2] > first_choice_counts[c1]:
+                colab_style_pairwise_winners_list.append(c2)
+
+    if not colab_style_pairwise_winners_list:
+        return {c: 0 for c in candidates}, []
+
+    winner_counts = Counter(colab_style_pairwise_winners_list)
+    max_wins = winner_counts.most_common(1)[0][1]
+
+    final_winners = [cand for cand, count in winner_counts.items() if count == max_wins]
+    
+    display_scores = {c: winner_counts.get(c, 0) for c in candidates}
+    
+    return display_scores, final_winners
+
+
+def calculate_condorcet_pairwise(votes, candidates):
+    """
+    쌍대 비교 콩도르세 계산 (1순위만 보는 Colab 방식과 달리 전체 순위를 사용):
+    - 모든 후보 쌍 (A, B)에 대해 A를 B보다 높은 순위로 둔 투표자 수와 그 반대를 비교.
+    - 일대일 대결에서 가장 많이 이긴 후보가 승자 (Copeland 방식).
+    - votes 자리에 BallotStore/RunningTally를 넘기면 저장된 쌍대 선호 행렬을 바로 사용.
+    """
+    if not votes or not candidates:
+        return {}, []
+
+    if not isinstance(votes, TALLY_SOURCES):
+        votes = BallotStore.from_votes(votes, candidates)
+    wins = dict(zip(candidates, copeland_wins(votes.pairwise_matrix(candidates)).tolist()))
+    max_wins = max(wins.values())
+    return wins, [c for c, w in wins.items() if w == max_wins]
+
+
+def _pairwise_source(votes, candidates):
+    # 쌍대 선호 행렬을 가진 집계 원본 (딕셔너리면 BallotStore로 변환, RunningTally면 누적된 행렬을 그대로 씀)
+    if isinstance(votes, TALLY_SOURCES):
+        return votes
+    return BallotStore.from_votes(votes, candidates)
+
+
+def calculate_schulze(votes, candidates):
+    """
+    슐체(Schulze) 방식:
+    - a가 b를 이긴 대결의 표 수를 간선 세기로 보고, 모든 쌍의 가장 강한 경로(가장 넓은 경로) 세기를 비교.
+    - a→b 경로가 b→a 경로보다 강하면 a가 b를 이김. 이 관계는 순환이 없으므로 항상 승자가 있음.
+    - 점수는 경로 세기로 이긴 후보 수, 아무에게도 지지 않는 후보가 승자.
+    """
+    if not votes or not candidates:
+        return {}, []
+
+    strengths = schulze_strengths(_pairwise_source(votes, candidates).pairwise_matrix(candidates))
+    beats = strengths > strengths.T
+    wins = dict(zip(candidates, beats.sum(axis=1).tolist()))
+    return wins, [c for c, beaten in zip(candidates, beats.any(axis=0).tolist()) if not beaten]
+
+
+def calculate_ranked_pairs(votes, candidates):
+    """
+    랭크드 페어(Tideman) 방식:
+    - 일대일 대결 승리를 표 차이가 큰 것부터 잠그되, 이미 잠근 승리들과 순환을 만드는 대결은 건너뜀.
+    - 점수는 잠근 대결을 따라 이기는 후보 수, 잠근 대결에서 한 번도 지지 않은 후보가 승자.
+    """
+    if not votes or not candidates:
+        return {}, []
+
+    locked, reach_counts = ranked_pairs_lock(_pairwise_source(votes, candidates).pairwise_matrix(candidates))
+    wins = dict(zip(candidates, reach_counts.tolist()))
+    return wins, [c for c, beaten in zip(candidates, locked.any(axis=0).tolist()) if not beaten]
+
+
+def instant_runoff_rounds(votes, candidates):
+    """
+    즉석 결선 투표의 라운드별 진행 (IRVResult: 라운드마다 득표, 탈락 후보, 이양표, 소진된 표):
+    - 같은 선호 순서의 투표를 묶은 weighted_orders로 계산하므로 비용은 고유 순서 수에 비례.
+    - 누적 집계(RunningTally)에는 투표별 순서가 없으므로 BallotStore, BallotPatterns나 딕셔너리를 넘겨야 함.
+    """
+    if isinstance(votes, RunningTally):
+        raise ValueError("즉석 결선 투표는 투표별 전체 순위가 필요합니다. BallotStore를 넘겨주세요.")
+    if not isinstance(votes, (BallotStore, BallotPatterns)):
+        votes = BallotStore.from_votes(votes, candidates)
+    return instant_runoff(candidates, *votes.weighted_orders(candidates))
+
+
+def calculate_instant_runoff(votes, candidates):
+    """
+    즉석 결선 투표(IRV):
+    - 1순위 표를 세어 과반 후보가 없으면 최소 득표 후보를 탈락시키고, 그 표를 다음 선호 후보로 옮기기를 반복.
+    - 점수는 후보가 마지막으로 남아 있던 라운드의 득표.
+    """
+    if not votes or not candidates:
+        return {}, []
+
+    result = instant_runoff_rounds(votes, candidates)
+    return last_round_counts(result, candidates), result.winners
+
+
+# --- 점수/쌍대 비교 방식 투표 계산 함수들 (voting_app.py) ---
+
+def calculate_borda(votes, candidates):
+    if isinstance(votes, TALLY_SOURCES):
+        scores = dict(zip(candidates, votes.score_sums(candidates).tolist()))
+        max_score = max(scores.values())
+        return scores, [c for c, s in scores.items() if s == max_score]
+    scores = {c: 0 for c in candidates}
+    for vote in votes.values():
+        for c, s in vote['score'].items():
+            scores[c] += s
+    max_score = max(scores.values())
+    winners = [c for c, s in scores.items() if s == max_score]
+    return scores, winners
+
+def calculate_bentham(votes, candidates):
+    if isinstance(votes, TALLY_SOURCES):
+        scores = dict(zip(candidates, votes.score_sums(candidates).tolist()))
+    else:
+        scores = {c: 0 for c in candidates}
+        for vote in votes.values():
+            for c, s in vote['score'].items():
+                scores[c] += s
+    total = sum(scores.values())
+    util = {c: round((v / total) * 100, 2) if total > 0 else 0 for c, v in scores.items()}
+    max_util = max(util.values())
+    winners = [c for c, u in util.items() if u == max_util]
+    return util, winners
+
+def calculate_nash(votes, candidates):
+    if isinstance(votes, TALLY_SOURCES):
+        min_scores = dict(zip(candidates, votes.min_scores(candidates).tolist()))
+    else:
+        min_scores = {c: float('inf') for c in candidates}
+        for vote in votes.values():
+            for c, s in vote['score'].items():
+                if s < min_scores[c]:
+                    min_scores[c] = s
+    max_min_score = max(min_scores.values())
+    winners = [c for c, s in min_scores.items() if s == max_min_score]
+    return min_scores, winners
+
+def calculate_condorcet(votes, candidates):
+    # 모든 후보 쌍의 "a를 b보다 선호한 투표자 수" 행렬을 한 번에 만들고 일대일 승수를 계산
+    if not isinstance(votes, TALLY_SOURCES):
+        votes = BallotStore.from_votes(votes, candidates)
+    wins = dict(zip(candidates, copeland_wins(votes.pairwise_matrix(candidates)).tolist()))
+    max_wins = max(wins.values())
+    winners = [c for c, w in wins.items() if w == max_wins]
+    return wins, winners
+
+
+# 전체 방식 비교에 쓰는 (표시명, 계산 함수) 목록
+COMPARED_METHODS = [
+    ("보르다 (Colab)", calculate_borda_colab_style),
+    ("벤담 (Colab)", calculate_bentham_colab_style),
+    ("내쉬 (Colab)", calculate_nash_colab_style),
+    ("콩도르세 (Colab)", calculate_condorcet_colab_style),
+    ("콩도르세 (쌍대 비교)", calculate_condorcet_pairwise),
+    ("슐체", calculate_schulze),
+    ("랭크드 페어", calculate_ranked_pairs),
+]
+
+# 전체 방식 비교 결과 ({방식: {후보: 점수}}, {방식: 승자 목록}, 다수 결과와 승자가 다른 방식 목록)
+ComparisonResult = namedtuple("ComparisonResult", ["scores", "winners", "disagreeing"])
+
+
+def compare_all_methods(votes_data, candidates_list):
+    """
+    모든 방식의 결과를 한 번에 계산해 비교:
+    - 투표 저장소(BallotStore)는 RunningTally.from_store로 한 번만 훑어 모든 방식의 집계를 함께 만들고,
+      각 방식은 그 집계에서 O(C)~O(C²)로 계산. 이미 누적 집계(RunningTally)면 그대로 사용.
+    - 같은 투표 묶음(BallotPatterns)은 RunningTally.from_patterns로 고유 패턴만 훑음.
+    - 가장 많은 방식이 낸 승자 집합과 다른 승자를 낸 방식을 disagreeing으로 표시.
+    """
+    if isinstance(votes_data, BallotStore):
+        votes_data = RunningTally.from_store(votes_data)
+    elif isinstance(votes_data, BallotPatterns):
+        votes_data = RunningTally.from_patterns(votes_data)
+    elif not isinstance(votes_data, RunningTally):
+        votes_data = RunningTally.from_store(BallotStore.from_votes(votes_data, candidates_list))
+
+    scores_by_method = {}
+    winners_by_method = {}
+    for method_display, calculate in COMPARED_METHODS:
+        scores_by_method[method_display], winners_by_method[method_display] = calculate(votes_data, candidates_list)
+
+    winner_sets = Counter(frozenset(w) for w in winners_by_method.values())
+    majority = winner_sets.most_common(1)[0][0]
+    disagreeing = [m for m, w in winners_by_method.items() if frozenset(w) != majority]
+    return ComparisonResult(scores_by_method, winners_by_method, disagreeing)
+
+
+# 이름으로 고를 수 있는 모든 방식 (CLI 등에서 사용)
+METHODS = {
+    "borda_colab": calculate_borda_colab_style,
+    "bentham_colab": calculate_bentham_colab_style,
+    "nash_colab": calculate_nash_colab_style,
+    "condorcet_colab": calculate_condorcet_colab_style,
+    "condorcet_pairwise": calculate_condorcet_pairwise,
+    "schulze": calculate_schulze,
+    "ranked_pairs": calculate_ranked_pairs,
+    "instant_runoff": calculate_instant_runoff,
+    "borda": calculate_borda,
+    "bentham": calculate_bentham,
+    "nash": calculate_nash,
+    "condorcet": calculate_condorcet,
+}
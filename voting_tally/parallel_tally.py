@@ -0,0 +1,79 @@
+"""
+여러 프로세스로 나눠 집계 (아주 큰 선거를 다시 집계할 때):
+- 순위/점수 행렬을 공유 메모리에 한 번 복사하고, 작업 프로세스는 이름으로 붙어 자기 구간(샤드)만 RunningTally로 집계.
+  샤드마다 투표를 pickle로 넘기지 않으며, 돌려받는 것은 C×C 크기의 부분 집계뿐.
+- 부분 집계(순위합, 점수합, 점수별 등장 횟수, 단독 1순위, 쌍대 행렬)는 모두 정수 합이라 RunningTally.merge로 그대로 더함.
+  내쉬 로그합은 합쳐진 점수별 등장 횟수에서 유도하므로 샤드 수와 관계없이 한 번에 집계한 것과 같은 값.
+- 반환값은 RunningTally이므로 calculate_*_colab_style 등에 그대로 넘기면 기존과 같은 결과.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .running_tally import RunningTally
+
+# 이보다 적은 투표는 프로세스를 띄우는 비용이 더 크므로 현재 프로세스에서 집계
+PARALLEL_MIN_ROWS = 200_000
+
+
+def _tally_shard(candidates, shape, rank_dtype, score_dtype, ranks_name, scores_name, start, stop):
+    # 작업 프로세스: 공유 메모리의 [start, stop) 구간만 집계 (행렬은 복사하지 않고 공유 메모리를 그대로 읽음)
+    ranks_shm = shared_memory.SharedMemory(name=ranks_name)
+    scores_shm = shared_memory.SharedMemory(name=scores_name)
+    try:
+        ranks = np.ndarray(shape, dtype=rank_dtype, buffer=ranks_shm.buf)
+        scores = np.ndarray(shape, dtype=score_dtype, buffer=scores_shm.buf)
+        tally = RunningTally.from_arrays(candidates, ranks[start:stop], scores[start:stop])
+        del ranks, scores # 공유 메모리를 닫기 전에 버퍼 참조를 놓음
+    finally:
+        ranks_shm.close()
+        scores_shm.close()
+    return tally
+
+
+def _shared_copy(matrix):
+    # 행렬을 새 공유 메모리 블록에 복사해 (블록, 블록 위의 배열)을 반환
+    shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    shared = np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)
+    shared[:] = matrix
+    return shm, shared
+
+
+def parallel_tally(candidates, ranks, scores, workers=None, executor=None, min_rows=PARALLEL_MIN_ROWS):
+    """
+    V×C 순위/점수 행렬을 workers개 샤드로 나눠 프로세스 풀에서 집계한 RunningTally를 반환:
+    - executor를 주면 그 ProcessPoolExecutor를 재사용 (여러 번 집계할 때 프로세스 시작 비용을 아낌).
+    - 투표가 min_rows보다 적거나 workers가 1이면 현재 프로세스에서 RunningTally.from_arrays로 집계.
+    """
+    n_rows = ranks.shape[0]
+    workers = workers or os.cpu_count() or 1
+    if n_rows < min_rows or workers <= 1:
+        return RunningTally.from_arrays(candidates, ranks, scores)
+
+    ranks_shm, shared_ranks = _shared_copy(ranks)
+    scores_shm, shared_scores = _shared_copy(scores)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        bounds = np.linspace(0, n_rows, workers + 1).astype(int)
+        futures = [
+            executor.submit(
+                _tally_shard, list(candidates), ranks.shape, shared_ranks.dtype, shared_scores.dtype,
+                ranks_shm.name, scores_shm.name, int(start), int(stop),
+            )
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        tally = RunningTally(candidates)
+        for future in futures:
+            tally.merge(future.result())
+    finally:
+        if own_executor:
+            executor.shutdown()
+        del shared_ranks, shared_scores
+        for shm in (ranks_shm, scores_shm):
+            shm.close()
+            shm.unlink()
+    return tally
@@ -0,0 +1,178 @@
+import numpy as np
+
+from .ballot_patterns import BallotPatterns
+from .ballot_store import (
+    BallotStore, MAX_SCORE, first_choice_counts, nash_log_sums, pairwise_matrix, score_counts,
+)
+
+# 여러 투표를 한꺼번에 집계할 때 한 번에 훑는 투표자 수 (청크가 캐시에 머무는 동안 모든 집계를 갱신)
+FUSED_CHUNK_ROWS = 4096
+
+
+class RunningTally:
+    """
+    제출된 투표의 누적 집계:
+    - 보르다 순위합, 벤담 점수합, 점수별 등장 횟수(C×11), 단독 1순위 득표, 쌍대 선호 행렬(C×C)을 보관.
+    - 투표 제출 시 add, 제출한 투표를 다시 고칠 때 remove 로 O(C²)에 갱신.
+    - 내쉬 로그합·최저점은 정수인 점수별 등장 횟수에서 O(C)로 유도하므로 add/remove를 반복해도 오차가 쌓이지 않음.
+    - version은 투표가 반영/취소될 때마다 올라가므로 결과 캐시의 키로 사용.
+    - BallotStore와 같은 집계 메서드(rank_sums, score_sums, ...)를 제공하므로 calculate_* 함수에 그대로 넘길 수 있음.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        self.candidate_index = {c: i for i, c in enumerate(self.candidates)}
+        n_candidates = len(self.candidates)
+        self.n_ballots = 0
+        self.version = 0
+        self._rank_sums = np.zeros(n_candidates, dtype=np.int64)
+        self._score_sums = np.zeros(n_candidates, dtype=np.int64)
+        self._score_counts = np.zeros((n_candidates, MAX_SCORE + 1), dtype=np.int64)
+        self._first_choice_counts = np.zeros(n_candidates, dtype=np.int64)
+        self._pairwise = np.zeros((n_candidates, n_candidates), dtype=np.int64)
+
+    @classmethod
+    def from_arrays(cls, candidates, ranks, scores, chunk_rows=FUSED_CHUNK_ROWS):
+        """
+        V×C 순위/점수 행렬 전체를 집계한 누적 집계를 생성:
+        - 투표자를 chunk_rows 단위로 한 번만 훑으면서 청크마다 모든 집계를 함께 갱신 (방식별로 따로 훑지 않음).
+        """
+        tally = cls(candidates)
+        for start in range(0, ranks.shape[0], chunk_rows):
+            tally.add_arrays(ranks[start:start + chunk_rows], scores[start:start + chunk_rows])
+        return tally
+
+    @classmethod
+    def from_store(cls, store, voters=None):
+        """BallotStore의 투표(voters를 주면 해당 투표자만)를 집계한 누적 집계를 생성."""
+        if voters is None:
+            return cls.from_arrays(store.candidates, store.ranks, store.scores)
+        return cls.from_arrays(store.candidates, *store.rows([store.voter_index[v] for v in voters]))
+
+    @classmethod
+    def from_patterns(cls, patterns):
+        """같은 투표를 묶은 BallotPatterns로 누적 집계를 생성 (비용은 고유 패턴 수에 비례)."""
+        tally = cls(patterns.candidates)
+        tally.add_arrays(patterns.ranks, patterns.scores, patterns.counts)
+        return tally
+
+    # --- 갱신 ---
+
+    def add(self, ranks, scores, weight=1):
+        """후보 순서의 순위/점수 한 줄(투표 하나)을 weight 만큼 반영."""
+        ranks = np.asarray(ranks)
+        scores = np.asarray(scores)
+        self.n_ballots += weight
+        self.version += 1
+        self._rank_sums += weight * ranks.astype(np.int64)
+        self._score_sums += weight * scores.astype(np.int64)
+        self._score_counts[np.arange(len(self.candidates)), scores] += weight
+        first = np.flatnonzero(ranks == 1)
+        if len(first) == 1:
+            self._first_choice_counts[first[0]] += weight
+        self._pairwise += weight * (ranks[:, None] < ranks[None, :])
+
+    def add_arrays(self, ranks, scores, weights=None):
+        """여러 투표(후보 순서의 V×C 순위/점수 행렬)를 한 번에 반영 (weights: 줄마다 표 수, None이면 1표씩)."""
+        if not ranks.shape[0]:
+            return
+        self.version += 1
+        if weights is None:
+            self.n_ballots += ranks.shape[0]
+            self._rank_sums += ranks.sum(axis=0, dtype=np.int64)
+            self._score_sums += scores.sum(axis=0, dtype=np.int64)
+        else:
+            self.n_ballots += int(weights.sum())
+            self._rank_sums += weights @ ranks.astype(np.int64)
+            self._score_sums += weights @ scores.astype(np.int64)
+        self._score_counts += score_counts(scores, weights=weights)
+        self._first_choice_counts += first_choice_counts(ranks, weights)
+        self._pairwise += pairwise_matrix(ranks, weights=weights)
+
+    def remove(self, ranks, scores):
+        """add 로 반영했던 투표 하나를 되돌림."""
+        self.add(ranks, scores, weight=-1)
+
+    def add_ballot(self, store, voter):
+        """BallotStore에 저장된 투표자의 현재 투표를 반영."""
+        self.add(*store.row(store.voter_index[voter]))
+
+    def remove_ballot(self, store, voter):
+        """BallotStore에 저장된 투표자의 현재 투표를 되돌림."""
+        self.remove(*store.row(store.voter_index[voter]))
+
+    def merge(self, other):
+        """
+        다른 누적 집계(같은 후보 순서)를 더함:
+        - 투표를 나눠 따로 집계한 부분 집계를 합칠 때 사용 (모든 집계가 정수 합이라 순서와 관계없이 같은 결과).
+        """
+        if other.candidates != self.candidates:
+            raise ValueError("후보 목록이 같은 집계만 합칠 수 있습니다.")
+        self.n_ballots += other.n_ballots
+        self.version += 1
+        self._rank_sums += other._rank_sums
+        self._score_sums += other._score_sums
+        self._score_counts += other._score_counts
+        self._first_choice_counts += other._first_choice_counts
+        self._pairwise += other._pairwise
+        return self
+
+    def copy(self):
+        """현재 집계의 복사본 (다른 스레드가 계속 갱신하는 집계를 읽을 때 사용)."""
+        tally = RunningTally(self.candidates)
+        tally.n_ballots = self.n_ballots
+        tally.version = self.version
+        tally._rank_sums = self._rank_sums.copy()
+        tally._score_sums = self._score_sums.copy()
+        tally._score_counts = self._score_counts.copy()
+        tally._first_choice_counts = self._first_choice_counts.copy()
+        tally._pairwise = self._pairwise.copy()
+        return tally
+
+    def __len__(self):
+        return self.n_ballots
+
+    # --- 집계 (BallotStore와 같은 인터페이스) ---
+
+    def columns(self, candidates=None):
+        """후보 이름 목록을 열 인덱스 배열로 변환 (None이면 전체 후보 순서)."""
+        if candidates is None:
+            return np.arange(len(self.candidates))
+        return np.array([self.candidate_index[c] for c in candidates], dtype=np.intp)
+
+    def rank_sums(self, candidates=None):
+        """후보별 순위 값 합계."""
+        return self._rank_sums[self.columns(candidates)]
+
+    def score_sums(self, candidates=None):
+        """후보별 점수 합계."""
+        return self._score_sums[self.columns(candidates)]
+
+    def score_counts(self, candidates=None):
+        """후보별 점수(0~10) 등장 횟수 C×11 행렬."""
+        return self._score_counts[self.columns(candidates)]
+
+    def nash_log_sums(self, candidates=None):
+        """후보별 log(점수 곱) (0점은 0.00001로 처리)."""
+        return nash_log_sums(self.score_counts(candidates))
+
+    def min_scores(self, candidates=None):
+        """후보별 최저 점수 (투표가 없으면 inf)."""
+        counts = self.score_counts(candidates)
+        present = counts > 0
+        if present.any(axis=1).all():
+            return present.argmax(axis=1)
+        return np.where(present.any(axis=1), present.argmax(axis=1), np.inf)
+
+    def first_choice_counts(self, candidates=None):
+        """후보별 단독 1순위 득표 수."""
+        return self._first_choice_counts[self.columns(candidates)]
+
+    def pairwise_matrix(self, candidates=None):
+        """선택한 후보 순서의 쌍대 선호 행렬 (P[a, b] = a를 b보다 선호한 투표자 수)."""
+        cols = self.columns(candidates)
+        return self._pairwise[np.ix_(cols, cols)]
+
+
+# calculate_* 함수가 딕셔너리 대신 바로 집계할 수 있는 투표 소스
+TALLY_SOURCES = (BallotStore, BallotPatterns, RunningTally)
@@ -0,0 +1,250 @@
+"""
+여러 세션이 함께 쓰는 선거:
+- 같은 선거 ID로 접속한 모든 Streamlit 세션이 프로세스 안의 SharedElection 하나를 공유.
+- 투표자와 후보는 명단 순서의 정수 ID(BallotStore의 행/열 인덱스)로 가리키고, 이름은 화면에 보여줄 때만 찾음.
+- 쓰기(제출/취소)는 선거별 잠금 안에서 투표 저장소·누적 집계·같은 투표 묶음·SQLite를 함께 갱신하므로 갱신이 유실되지 않음.
+- 읽기는 잠금 없이 진행 상황을 보거나, 잠금을 잠깐 잡고 누적 집계 복사본을 받아 계산 (다른 선거와는 잠금을 공유하지 않음).
+- 다른 프로세스(투표 수집 API 등)가 저장소에 쓴 투표는 refresh로 seq 이후 변경분만 읽어 반영.
+"""
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from .ballot_patterns import BallotPatterns
+from .ballot_store import rank_dtype_for
+from .election_archive import archive_bytes
+from .running_tally import RunningTally
+from .voter_roster import VoterRoster
+
+# 이 시간(초) 동안 찾는 세션이 없던 선거는 메모리에서 내림 (저장소가 있으면 다음 get에서 다시 불러옴)
+ELECTION_IDLE_SECONDS = 30 * 60
+# 메모리에 올려 둘 최대 선거 수 (넘으면 가장 오래 쓰지 않은 선거부터 내림)
+MAX_LOADED_ELECTIONS = 32
+
+
+class SharedElection:
+    """
+    한 선거의 공유 상태:
+    - store: BallotStore (제출된 투표만 기록됨, 작성 중인 투표는 각 세션이 따로 보관).
+    - roster: 투표자 ID별 제출 여부 색인 (VoterRoster, 진행 상황·투표자 검색·페이지 목록), n_completed: 제출한 투표자 수.
+    - tally: 제출된 투표의 누적 집계.
+    - patterns: 제출된 투표를 (투표 패턴 → 표 수)로 묶은 BallotPatterns (즉석 결선처럼 투표별 순위가 필요한 방식용).
+      처음 patterns_snapshot/result_snapshot으로 요청할 때 만들고, 그 전까지는 None이라 제출·취소 때 갱신하지 않음.
+    - election_store가 있으면 모든 쓰기를 같은 잠금 안에서 SQLite에도 기록.
+    - seq: 메모리에 반영된 마지막 저장소 쓰기 번호.
+    """
+
+    def __init__(self, election_id, title, store, completed, tally=None, method=None, election_store=None, seq=0):
+        completed = np.asarray(completed, dtype=bool)
+        self.election_id = election_id
+        self.title = title
+        self.store = store
+        self.method = method
+        self.roster = VoterRoster(store.voters, completed)
+        self.patterns = None
+        if tally is None:
+            tally = RunningTally.from_arrays(store.candidates, *store.rows(np.flatnonzero(completed)))
+        self.tally = tally
+        self.seq = seq
+        self._election_store = election_store
+        self._lock = threading.Lock()
+        self.last_used = time.monotonic() # ElectionHub가 찾을 때마다 갱신 (오래 쓰지 않은 선거를 내릴 때 사용)
+
+    def _advance(self, seq):
+        # 자기 쓰기 바로 앞까지 반영되어 있으면 seq만 올림 (사이에 다른 프로세스의 쓰기가 있으면 refresh가 가져감)
+        if seq == self.seq + 1:
+            self.seq = seq
+
+    @property
+    def n_completed(self):
+        return self.roster.n_completed
+
+    @property
+    def candidates(self):
+        return self.store.candidates
+
+    @property
+    def voters(self):
+        return self.store.voters
+
+    # --- 쓰기 (선거별 잠금) ---
+
+    def submit(self, row, ranks, scores):
+        """
+        투표자 ID(row)의 투표를 제출 (후보 순서의 순위/점수 정수 배열):
+        - 이미 제출한 투표자면 기존 투표를 누적 집계에서 빼고 새 투표로 바꿈.
+        - 값이 잘못되었거나 저장에 실패하면 ValueError/sqlite3.Error를 그대로 올리고 상태는 바뀌지 않음.
+        """
+        store = self.store
+        with self._lock:
+            old_ranks, old_scores = store.row(row)
+            try:
+                store.set_row(row, ranks, scores)
+                new_ranks, new_scores = store.row(row)
+                if self._election_store is not None:
+                    self._advance(self._election_store.submit_ballots(self.election_id, [(row, new_ranks, new_scores)]))
+            except Exception:
+                store.set_row(row, old_ranks, old_scores)
+                raise
+            if self.roster.is_completed(row):
+                self._remove(old_ranks, old_scores)
+            else:
+                self.roster.mark(row, True)
+            self._add(new_ranks, new_scores)
+
+    def withdraw(self, row):
+        """투표자 ID(row)의 제출한 투표를 누적 집계에서 빼고 미완료로 되돌림 (다시 입력할 때)."""
+        store = self.store
+        with self._lock:
+            if not self.roster.is_completed(row):
+                return
+            if self._election_store is not None:
+                self._advance(self._election_store.withdraw_ballot(self.election_id, row))
+            self._remove(*store.row(row))
+            self.roster.mark(row, False)
+
+    def _add(self, ranks, scores):
+        # 잠금 안에서 호출: 누적 집계와 (만들어 두었으면) 투표 묶음에 투표 하나를 더함
+        self.tally.add(ranks, scores)
+        if self.patterns is not None:
+            self.patterns.add(ranks, scores)
+
+    def _remove(self, ranks, scores):
+        self.tally.remove(ranks, scores)
+        if self.patterns is not None:
+            self.patterns.remove(ranks, scores)
+
+    def set_method(self, method):
+        """마지막으로 선택한 결과 산출 방식을 저장."""
+        with self._lock:
+            if self._election_store is not None:
+                self._election_store.set_method(self.election_id, method)
+            self.method = method
+
+    def refresh(self):
+        """
+        다른 프로세스가 저장소에 쓴 투표를 반영 (바뀐 게 없으면 인덱스 조회 한 번):
+        - 바뀐 투표자마다 기존 제출 투표를 누적 집계·투표 묶음에서 빼고 저장소의 값으로 바꾼 뒤 다시 더함.
+        """
+        if self._election_store is None:
+            return
+        with self._lock:
+            seq, changed = self._election_store.changes_since(self.election_id, self.seq)
+            store = self.store
+            rank_dtype = rank_dtype_for(len(store.candidates))
+            for row, completed, ranks, scores in changed:
+                if self.roster.is_completed(row):
+                    self._remove(*store.row(row))
+                if ranks is not None:
+                    store.set_row(row, np.frombuffer(ranks, dtype=rank_dtype), np.frombuffer(scores, dtype=np.uint8))
+                self.roster.mark(row, bool(completed))
+                if completed:
+                    self._add(*store.row(row))
+            self.seq = seq
+
+    # --- 읽기 ---
+
+    def tally_snapshot(self):
+        """누적 집계의 복사본 (O(C²) 복사만 잠금 안에서 하고, 결과 계산은 잠금 밖에서)."""
+        return self.result_snapshot()[0]
+
+    def patterns_snapshot(self):
+        """같은 투표 묶음의 복사본 (고유 패턴 수에 비례하는 복사만 잠금 안에서)."""
+        return self.result_snapshot(with_patterns=True)[1]
+
+    def result_snapshot(self, with_patterns=False):
+        """
+        (누적 집계 복사본, 같은 투표 묶음 복사본 또는 None)을 잠금 한 번으로 반환 (두 복사본이 같은 시점의 투표):
+        - with_patterns=True면 투표 묶음도 복사 (처음 부를 때만 제출된 투표 전체를 묶어 만들고, 그 뒤로는 제출·취소 때마다 갱신).
+        - 결과 캐시는 누적 집계의 version을 키로 쓰면 두 복사본 모두에 맞음.
+        """
+        with self._lock:
+            patterns = None
+            if with_patterns:
+                if self.patterns is None:
+                    self.patterns = BallotPatterns.from_arrays(
+                        self.store.candidates, *self.store.rows(np.flatnonzero(self.roster.completed_mask()))
+                    )
+                patterns = self.patterns.copy()
+            return self.tally.copy(), patterns
+
+    def ballot(self, row):
+        """투표자 ID(row)의 마지막 제출 투표 (후보 순서의 순위, 점수 배열 복사본, 미제출이면 기본 투표)."""
+        with self._lock:
+            return self.store.row(row)
+
+    def archive_bytes(self):
+        """선거 전체를 보관 파일(.vote) 형식의 bytes로 반환 (잠금 안에서 써서 제출 도중의 투표가 섞이지 않음)."""
+        with self._lock:
+            return archive_bytes(self.title, self.store, self.roster.completed_mask(), self.method)
+
+
+class ElectionHub:
+    """
+    프로세스 안의 선거 목록 (선거 ID → SharedElection):
+    - 이미 올라온 선거는 잠금 없이 찾고, 처음 접근할 때만 목록 잠금을 잡고 저장소에서 불러옴.
+    - 저장소가 있으면 선거를 올릴 때마다 idle_seconds 동안 찾지 않은 선거와, max_elections를 넘는 만큼
+      가장 오래 쓰지 않은 선거를 목록에서 내림 (V×C 행렬·집계를 놓아 주고, 다시 찾으면 저장소에서 불러옴).
+    """
+
+    def __init__(self, election_store=None, max_elections=MAX_LOADED_ELECTIONS, idle_seconds=ELECTION_IDLE_SECONDS):
+        self.election_store = election_store
+        self.max_elections = max_elections
+        self.idle_seconds = idle_seconds
+        self._elections = {}
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        # 목록 잠금 안에서 호출. 저장소가 없으면 내린 선거를 되살릴 수 없으므로 내리지 않음
+        if self.election_store is None:
+            return
+        now = time.monotonic()
+        by_use = sorted(self._elections.items(), key=lambda item: item[1].last_used)
+        n_over = len(by_use) - self.max_elections
+        for i, (election_id, election) in enumerate(by_use):
+            if i < n_over or now - election.last_used > self.idle_seconds:
+                del self._elections[election_id]
+
+    def create(self, title, store, completed, tally=None):
+        """새 선거를 저장소에 만들고 공유 목록에 올림 (completed: 이미 제출된 투표 표시 bool 배열)."""
+        completed = np.asarray(completed, dtype=bool)
+        seq = 0
+        if self.election_store is not None:
+            election_id = self.election_store.create_election(title, store.candidates, store.voters)
+            if completed.any():
+                seq = self.election_store.save_store(election_id, store, completed)
+        else:
+            election_id = uuid.uuid4().hex[:12]
+        election = SharedElection(
+            election_id, title, store, completed, tally, election_store=self.election_store, seq=seq
+        )
+        with self._lock:
+            self._elections[election_id] = election
+            self._evict()
+        return election
+
+    def get(self, election_id):
+        """선거 ID의 SharedElection (메모리에 없으면 저장소에서 불러옴, 없는 선거면 None). 찾을 때마다 사용 시각 갱신."""
+        election = self._elections.get(election_id)
+        if election is None and self.election_store is not None:
+            with self._lock:
+                election = self._elections.get(election_id)
+                if election is None:
+                    loaded = self.election_store.load_election(election_id)
+                    if loaded is None:
+                        return None
+                    title, method, store, completed, seq = loaded
+                    election = SharedElection(
+                        election_id, title, store, completed, method=method, election_store=self.election_store,
+                        seq=seq,
+                    )
+                    self._elections[election_id] = election
+                    self._evict()
+        if election is not None:
+            election.last_used = time.monotonic()
+        return election
+
+    def __contains__(self, election_id):
+        return election_id in self._elections
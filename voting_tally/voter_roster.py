@@ -0,0 +1,134 @@
+"""
+투표자 명단 색인:
+- 제출 여부는 bool 배열과 명단 순서의 펜윅 트리(Fenwick tree, 구간별 제출 수)로 보관해, 제출·취소는 O(log V) 갱신.
+  제출 수는 카운터로 유지하므로 진행 상황은 바로 얻고, 한 페이지 분량의 목록은 트리에서 k번째 제출/미제출 투표자를
+  O(log V)로 찾아 꺼내므로 명단 크기와 관계없이 page_size에 비례.
+- 이름 검색: 대소문자를 무시하고, 앞부분이 일치하는 이름(이름 순)을 먼저, 중간에 포함하는 이름(명단 순)을 그 다음에 반환.
+  앞부분 일치는 정렬된 이름에서 이분 탐색, 포함 검색은 전체 이름을 이은 문자열 하나에서 str.find로 찾음.
+"""
+import bisect
+
+import numpy as np
+
+# 투표자 선택 화면에서 한 페이지에 보여줄 투표자 수
+ROSTER_PAGE_SIZE = 50
+
+
+class VoterRoster:
+    """
+    투표자 명단과 제출 여부 색인:
+    - voters: 투표자 이름 목록 (BallotStore.voters와 같은 순서, 인덱스로 가리킴).
+    - n_completed / n_remaining: 제출한 / 아직 제출하지 않은 투표자 수.
+    - mark(인덱스, 제출 여부)로 갱신 (O(log V), 명단 크기만큼 옮기는 목록 없음).
+    """
+
+    def __init__(self, voters, completed):
+        self.voters = voters
+        self._completed = np.asarray(completed, dtype=bool).copy()
+        self._n_completed = int(np.count_nonzero(self._completed))
+        # 펜윅 트리 (1부터): _tree[i] = 명단 (i - lowbit(i), i] 구간의 제출 수. 누적합의 차로 한 번에 만듦
+        n = len(self._completed)
+        prefix = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self._completed, out=prefix[1:])
+        nodes = np.arange(n + 1)
+        self._tree = prefix - prefix[nodes - (nodes & -nodes)]
+        self._top_step = 1 << (n.bit_length() - 1) if n else 0
+        names = [v.casefold() for v in voters]
+        # 앞부분 검색용 (소문자 이름, 인덱스) 정렬 목록
+        by_name = sorted(zip(names, range(len(names))))
+        self._sorted_names = [name for name, _ in by_name]
+        self._sorted_index = [idx for _, idx in by_name]
+        # 포함 검색용: 줄바꿈으로 이은 이름 문자열과 줄마다 시작 위치
+        self._joined = "\n".join(names)
+        self._line_starts = np.cumsum([0] + [len(name) + 1 for name in names[:-1]]).tolist() if names else []
+        self._last_search = (None, [])
+
+    def __len__(self):
+        return len(self.voters)
+
+    @property
+    def n_completed(self):
+        return self._n_completed
+
+    @property
+    def n_remaining(self):
+        return len(self._completed) - self._n_completed
+
+    def is_completed(self, index):
+        return bool(self._completed[index])
+
+    def completed_mask(self):
+        """투표자 ID 순서의 제출 여부 bool 배열 (복사본)."""
+        return self._completed.copy()
+
+    def mark(self, index, completed):
+        """투표자(인덱스)의 제출 여부를 바꾸고 제출/미제출 목록을 갱신. 바뀌었으면 True."""
+        if self._completed[index] == completed:
+            return False
+        self._completed[index] = completed
+        delta = 1 if completed else -1
+        self._n_completed += delta
+        tree, node = self._tree, index + 1
+        while node < len(tree):
+            tree[node] += delta
+            node += node & -node
+        return True
+
+    def _select(self, completed, k):
+        # 명단 순서에서 k번째(0부터) 제출(또는 미제출) 투표자의 인덱스 (펜윅 트리를 위에서부터 내려가며 탐색)
+        tree, node, step = self._tree, 0, self._top_step
+        while step:
+            child = node + step
+            if child < len(tree):
+                # 내려가는 경로의 노드는 항상 길이 step인 구간을 덮음
+                found = int(tree[child]) if completed else step - int(tree[child])
+                if found <= k:
+                    node, k = child, k - found
+            step >>= 1
+        return node
+
+    def indices(self, completed=False):
+        """제출 여부에 맞는 투표자 ID(명단 인덱스) 전체 목록 (명단 순)."""
+        return np.flatnonzero(self._completed == completed).tolist()
+
+    def search(self, query):
+        """이름에 query가 들어간 투표자 인덱스 (앞부분 일치를 이름 순으로 먼저, 나머지는 명단 순)."""
+        query = query.strip().casefold()
+        if query == self._last_search[0]:
+            return self._last_search[1]
+        lo = bisect.bisect_left(self._sorted_names, query)
+        hi = bisect.bisect_left(self._sorted_names, query + "\U0010ffff")
+        matches = self._sorted_index[lo:hi]
+        prefix = set(matches)
+        joined, line_starts = self._joined, self._line_starts
+        pos = joined.find(query)
+        while pos >= 0:
+            line = bisect.bisect_right(line_starts, pos) - 1
+            if line not in prefix:
+                matches.append(line)
+            # 같은 이름 안의 다음 일치는 건너뛰고 다음 이름부터 찾음
+            next_start = line_starts[line + 1] if line + 1 < len(line_starts) else len(joined)
+            pos = joined.find(query, next_start)
+        self._last_search = (query, matches)
+        return matches
+
+    def count(self, completed=False, query=""):
+        """제출 여부(와 검색어)에 맞는 투표자 수 (검색어가 없으면 O(1))."""
+        if not query.strip():
+            return self.n_completed if completed else self.n_remaining
+        matches = np.array(self.search(query), dtype=np.intp)
+        return int(np.count_nonzero(self._completed[matches] == completed))
+
+    def page(self, completed=False, query="", page=0, page_size=ROSTER_PAGE_SIZE):
+        """
+        제출 여부(와 검색어)에 맞는 투표자 ID(명단 인덱스) 중 page번째(0부터) 페이지:
+        - 검색어가 없으면 펜윅 트리에서 한 명씩 찾으므로 명단 크기와 관계없이 page_size × O(log V).
+        """
+        start = page * page_size
+        if not query.strip():
+            stop = min(start + page_size, self.count(completed))
+            indices = [self._select(completed, k) for k in range(start, stop)]
+        else:
+            matches = self.search(query)
+            indices = [i for i in matches if self._completed[i] == completed][start:start + page_size]
+        return indices